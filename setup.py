@@ -4,7 +4,7 @@
 
 import re
 
-from setuptools import setup
+from setuptools import find_packages, setup
 
 with open("README.md", "r", encoding="utf-8") as f:
     long_description: str = f.read()
@@ -35,11 +35,11 @@ setup(
     python_requires=">=3.11",
     install_requires=requirements,
     tests_require=requirements_dev,
-    extras_require={"dev": requirements_dev},
-    packages=["skillet"],
-    # entry_points={
-    #     "console_scripts": [
-    #         "skillet.cli:main",
-    #     ],
-    # },
+    extras_require={"dev": requirements_dev, "agent": ["langgraph", "langchain", "langchain-openai"]},
+    packages=find_packages(include=["skillet", "skillet.*"]),
+    entry_points={
+        "console_scripts": [
+            "skillet=skillet.cli:main",
+        ],
+    },
 )
@@ -0,0 +1,191 @@
+"""LLM agent that drives the robot through a set of skill tools.
+
+Requires the agent extras: `pip install -e '.[agent]'`.
+"""
+
+# Standard library imports
+import logging
+import traceback
+from dataclasses import dataclass
+from typing import Any, Iterable, List
+
+# Third-party imports
+import colorlogging
+from langchain_core.tools import BaseTool, tool
+from langchain_openai import ChatOpenAI
+from langgraph.prebuilt import create_react_agent
+
+# Local imports
+from skillet.connection import DEFAULT_IP, Robot, connect
+from skillet.examples.squat import SQUAT_DEPTH, PlaybackOptions, play_retimed, play_squat
+from skillet.examples.walk import walk_forward as walk
+from skillet.motion.gripper import GraspResult, Gripper
+from skillet.motion.kinematics import LEG_PITCH_JOINTS
+from skillet.motion.pose_index import PoseIndex
+from skillet.watchdog import SafeStop
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK = "Pick up the item in front of you and deliver it 3 steps forward"
+
+
+@dataclass
+class RobotController:
+    """Class to manage robot state and control."""
+
+    robot: Robot
+    failed_joints: List[str]
+    library: PoseIndex
+
+    @classmethod
+    def initialize(
+        cls,
+        ip: str = DEFAULT_IP,
+        safe_stop: SafeStop | str | None = SafeStop.HOLD,
+        robot_id: str | None = None,
+        library: str | None = None,
+    ) -> "RobotController":
+        """Initialize robot connection and controller, guarded by a watchdog unless `safe_stop` is None.
+
+        The motion library is compiled and indexed once here, so every skill can start from the current pose.
+        """
+        robot = connect(ip, robot_id, safe_stop=safe_stop)
+        return cls(robot=robot, failed_joints=[], library=PoseIndex.from_library(library, robot.profile))
+
+    def play(self, motion: str) -> None:
+        """Play a library motion, entering it at the keyframe closest to the current pose."""
+        options = PlaybackOptions(interval=None, from_nearest=True, index=self.library)
+        if not play_retimed(self.robot, motion, options):
+            self.failed_joints.extend(self.library.motions[motion].joint_names)
+            raise RuntimeError(f"Playing {motion} failed")
+
+    def execute_squat(self, depth: float = SQUAT_DEPTH) -> None:
+        """Squat down to `depth` meters and stand back up."""
+        if not play_squat(self.robot, depth):
+            self.failed_joints.extend(LEG_PITCH_JOINTS)
+            raise RuntimeError(f"Squat to {depth:.3f} m failed")
+
+    def grip(self) -> GraspResult:
+        """Close the gripper until it touches an item or is fully closed."""
+        gripper = Gripper(self.robot.kos, self.robot.profile, watchdog=self.robot.watchdog)
+        if not gripper.configure():
+            raise RuntimeError("Failed to configure the gripper")
+        return gripper.close()
+
+    def ungrip(self) -> GraspResult:
+        """Open the gripper fully."""
+        gripper = Gripper(self.robot.kos, self.robot.profile, watchdog=self.robot.watchdog)
+        if not gripper.configure():
+            raise RuntimeError("Failed to configure the gripper")
+        return gripper.open()
+
+
+def build_tools(controller: RobotController) -> list[BaseTool]:
+    """Define the robot action tools available to the agent."""
+
+    @tool
+    def squat() -> str:
+        """Makes the robot squat down to prepare for picking up an item."""
+        try:
+            controller.execute_squat()
+            return "Robot has squatted down"
+        except Exception as e:
+            logger.error("Squat failed: %s", str(e))
+            traceback.print_exc()
+            return f"Failed to squat: {str(e)}"
+
+    @tool
+    def walk_forward(steps: int = 3) -> str:
+        """Makes the robot walk forward the given number of steps."""
+        if walk(controller.robot, steps):
+            return f"Robot walked forward {steps} steps"
+        return "Failed to walk forward"
+
+    @tool
+    def stand_up() -> str:
+        """Makes the robot stand up from squatting position (mock implementation)."""
+        logger.info("Mock: Robot standing up")
+        return "Robot has stood up"
+
+    @tool
+    def play_motion(name: str) -> str:
+        """Plays a motion from the library, starting from the keyframe closest to the robot's current pose."""
+        if name not in controller.library.motions:
+            return f"Unknown motion {name}, choose one of: {', '.join(controller.library.names)}"
+        try:
+            controller.play(name)
+        except Exception as e:
+            logger.error("Playing %s failed: %s", name, str(e))
+            return f"Failed to play {name}: {str(e)}"
+        return f"Robot has played {name}"
+
+    @tool
+    def grip_item() -> str:
+        """Makes the robot grip an item in front of it and reports whether an item was grasped."""
+        try:
+            result = controller.grip()
+        except Exception as e:
+            logger.error("Grip failed: %s", str(e))
+            return f"Failed to grip: {str(e)}"
+        if result.grasped:
+            return f"Robot has gripped the item ({result})"
+        return f"Gripper closed without touching an item ({result})"
+
+    @tool
+    def ungrip_item() -> str:
+        """Makes the robot release its grip on the currently held item."""
+        try:
+            controller.ungrip()
+        except Exception as e:
+            logger.error("Release failed: %s", str(e))
+            return f"Failed to release: {str(e)}"
+        return "Robot has released the item"
+
+    return [squat, walk_forward, stand_up, play_motion, grip_item, ungrip_item]
+
+
+def print_stream(stream: Iterable[dict[str, Any]]) -> None:
+    """Helper function to print the stream of actions."""
+    for s in stream:
+        message = s["messages"][-1]
+        if isinstance(message, tuple):
+            print(message)
+        else:
+            message.pretty_print()
+
+
+def execute_task(controller: RobotController, task: str = DEFAULT_TASK, model: str = "gpt-4") -> None:
+    """Let the agent carry out a task with the robot.
+
+    Args:
+        controller (RobotController): Controller of the connected robot.
+        task (str): Instruction for the agent.
+        model (str): OpenAI chat model driving the agent.
+    """
+    graph = create_react_agent(ChatOpenAI(model=model, temperature=0), tools=build_tools(controller))
+    inputs = {"messages": [("user", task)]}
+    print_stream(graph.stream(inputs, stream_mode="values"))
+
+    # Log summary of any failed joints
+    if controller.failed_joints:
+        logger.error("=== Failed Joints ===")
+        logger.error("Failed to move %d joints: %s", len(controller.failed_joints), ", ".join(controller.failed_joints))
+    else:
+        logger.info("All joints moved successfully")
+
+
+def main(
+    ip: str = DEFAULT_IP,
+    task: str = DEFAULT_TASK,
+    safe_stop: SafeStop | str | None = SafeStop.HOLD,
+    robot_id: str | None = None,
+    library: str | None = None,
+) -> None:
+    """Execute the pickup and delivery task."""
+    logging.basicConfig(level=logging.INFO)
+    colorlogging.configure()
+    execute_task(RobotController.initialize(ip, safe_stop, robot_id, library), task)
+
+
+if __name__ == "__main__":
+    main()
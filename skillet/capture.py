@@ -0,0 +1,337 @@
+"""Captures KOS calls to a compact binary log and replays them without a robot.
+
+`CapturingKOS` wraps a client and appends every call, with its arguments, its
+response or error, its start time and its duration, to a gzip-compressed log.
+`ReplayKOS` is a client that answers each method from the log in the recorded
+order, either taking as long as the original call did or returning immediately.
+
+The log starts with a magic string and a format version. Each record is a fixed
+header followed by a pickle payload of a declared protocol, which only ever holds
+plain dicts, lists and scalars and is read back without resolving any classes.
+Method names are written once, the first time they occur, and referenced by index
+afterwards. Responses are stored as plain dicts and lists, and replayed as
+namespaces, so code reading `response.states[0].position` works the same on both
+clients. Streams, such as the audio chunks sent to or recorded by the sound
+service, are stored as the list of their items and replayed as iterators.
+"""
+
+# Standard library imports
+import gzip
+import io
+import logging
+import pickle
+import struct
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Constants
+MAGIC = b"SKCAP\n"
+FORMAT_VERSION = 2
+PICKLE_PROTOCOL = 4  # Readable by every supported Python version
+CAPTURE_FILE_ENV = "SKILLET_CAPTURE_FILE"
+REPLAY_FILE_ENV = "SKILLET_REPLAY_FILE"
+REPLAY_REALTIME_ENV = "SKILLET_REPLAY_REALTIME"
+CAPTURED_SERVICES = ("actuator", "imu", "led_matrix", "sound")
+
+VERSION = struct.Struct("<H")
+# Record kind, method index, start offset, duration and payload length.
+RECORD = struct.Struct("<BHddI")
+# A stream record is a call whose response was an iterator, stored as the list of its items.
+METHOD_RECORD, CALL_RECORD, STREAM_RECORD = 0, 1, 2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CallRecord:
+    """A single captured call."""
+
+    method: str
+    start: float  # Seconds since the capture started
+    duration: float  # Seconds
+    args: tuple
+    kwargs: dict[str, Any]
+    response: Any
+    error: str | None
+    stream: bool = False  # Whether `response` lists the items of a returned iterator
+
+
+class ReplayExhaustedError(LookupError):
+    """Raised when a replayed method is called more often than it was captured."""
+
+
+class RecordedStream(Iterator):
+    """Passes the items of an iterator through, keeping each one as it goes by."""
+
+    def __init__(self, items: Iterator) -> None:
+        self._items = items
+        self.items: list = []
+
+    def __next__(self) -> Any:  # noqa: ANN401
+        item = next(self._items)
+        self.items.append(item)
+        return item
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Refuses to load anything but plain data, so a capture log cannot run code."""
+
+    def find_class(self, module: str, name: str) -> Any:  # noqa: ANN401
+        raise pickle.UnpicklingError(f"Capture logs only hold plain data, found {module}.{name}")
+
+
+def to_plain(value: Any) -> Any:  # noqa: ANN401
+    """Convert a request or response into dicts, lists and scalars that a capture log can store."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, RecordedStream):
+        return to_plain(value.items)
+    if isinstance(value, Mapping):
+        return {str(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, Sequence):
+        # Also covers protobuf repeated fields.
+        return [to_plain(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    descriptor = getattr(value, "DESCRIPTOR", None)
+    if descriptor is not None:
+        # Protobuf message: read every field so that defaults are kept too.
+        return {field.name: to_plain(getattr(value, field.name)) for field in descriptor.fields}
+    if hasattr(value, "__dict__"):
+        return {key: to_plain(item) for key, item in vars(value).items() if not key.startswith("_")}
+    return repr(value)
+
+
+def to_namespace(value: Any) -> Any:  # noqa: ANN401
+    """Turn a stored response back into objects with attribute access."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(item) for item in value]
+    return value
+
+
+class CaptureWriter:
+    """Appends call records to a capture log; safe to use from several threads."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = gzip.GzipFile(self.path, "wb")  # noqa: SIM115
+        self._file.write(MAGIC + VERSION.pack(FORMAT_VERSION))
+        self._methods: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.count = 0
+
+    def write(self, record: CallRecord) -> None:
+        payload = pickle.dumps(
+            (to_plain(record.args), to_plain(record.kwargs), to_plain(record.response), record.error),
+            protocol=PICKLE_PROTOCOL,
+        )
+        kind = STREAM_RECORD if record.stream else CALL_RECORD
+        with self._lock:
+            if self._file.closed:
+                return
+            index = self._methods.get(record.method)
+            if index is None:
+                index = self._methods[record.method] = len(self._methods)
+                name = record.method.encode()
+                self._file.write(RECORD.pack(METHOD_RECORD, index, 0.0, 0.0, len(name)) + name)
+            self._file.write(RECORD.pack(kind, index, record.start, record.duration, len(payload)) + payload)
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info("Captured %d calls to %s", self.count, self.path)
+
+
+def read_capture(path: str | Path) -> Iterator[CallRecord]:
+    """Read the calls of a capture log in the order they completed.
+
+    Raises:
+        ValueError: If the file is not a capture log, or was written in another format version.
+    """
+    methods: dict[int, str] = {}
+    with gzip.open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a skillet capture log")
+        (version,) = VERSION.unpack(f.read(VERSION.size))
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} is in capture format {version}, expected {FORMAT_VERSION}")
+        while header := f.read(RECORD.size):
+            kind, index, start, duration, length = RECORD.unpack(header)
+            payload = f.read(length)
+            if kind == METHOD_RECORD:
+                methods[index] = payload.decode()
+                continue
+            args, kwargs, response, error = _PlainUnpickler(io.BytesIO(payload)).load()
+            yield CallRecord(
+                methods[index], start, duration, tuple(args), kwargs, response, error, stream=kind == STREAM_RECORD
+            )
+
+
+def _capture_stream(result: Iterator, record: CallRecord, start: float, writer: CaptureWriter) -> Iterator:
+    """Pass a streamed response through, and capture the call once the stream ends.
+
+    `record` is the call with an empty response; `start` is its `time.perf_counter()` start.
+    """
+    try:
+        for item in result:
+            record.response.append(item)
+            yield item
+    except Exception as e:
+        record.error = repr(e)
+        raise
+    finally:
+        # Also runs when the caller stops reading early; the call then holds the items read so far.
+        record.duration = time.perf_counter() - start
+        writer.write(record)
+
+
+class CapturingService:
+    """Wraps a KOS service so that every method call is captured."""
+
+    def __init__(self, service: Any, name: str, writer: CaptureWriter) -> None:  # noqa: ANN401
+        self._service = service
+        self._name = name
+        self._writer = writer
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        value = getattr(self._service, attr)
+        if not callable(value):
+            return value
+
+        method = f"{self._name}.{attr}"
+        writer = self._writer
+
+        def captured(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            # Streamed arguments are kept as the service consumes them.
+            args = tuple(RecordedStream(arg) if isinstance(arg, Iterator) else arg for arg in args)
+            start = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except Exception as e:
+                writer.write(
+                    CallRecord(method, start - writer.start, time.perf_counter() - start, args, kwargs, None, repr(e))
+                )
+                raise
+            if isinstance(result, Iterator):
+                record = CallRecord(method, start - writer.start, 0.0, args, kwargs, [], None, stream=True)
+                return _capture_stream(result, record, start, writer)
+            writer.write(
+                CallRecord(method, start - writer.start, time.perf_counter() - start, args, kwargs, result, None)
+            )
+            return result
+
+        # Cache the wrapper so later lookups skip `__getattr__`.
+        setattr(self, attr, captured)
+        return captured
+
+
+class CapturingKOS:
+    """Drop-in wrapper around a `pykos.KOS` client that captures its calls to a log."""
+
+    def __init__(self, kos: pykos.KOS, path: str | Path) -> None:
+        self._kos = kos
+        self.writer = CaptureWriter(path)
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        value = getattr(self._kos, attr)
+        if attr not in CAPTURED_SERVICES:
+            return value
+        service = CapturingService(value, attr, self.writer)
+        setattr(self, attr, service)
+        return service
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ReplayService:
+    """Answers the calls of one service from a capture log."""
+
+    def __init__(self, name: str, client: "ReplayKOS") -> None:
+        self._name = name
+        self._client = client
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        method = f"{self._name}.{attr}"
+        client = self._client
+
+        def replayed(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            return client.call(method, args, kwargs)
+
+        setattr(self, attr, replayed)
+        return replayed
+
+
+def _replay_stream(items: list, method: str, error: str | None) -> Iterator:
+    """Yield the captured items of a stream, failing where the captured stream failed."""
+    yield from items
+    if error is not None:
+        raise RuntimeError(f"Captured stream of {method} failed: {error}")
+
+
+class ReplayKOS:
+    """Stands in for a `pykos.KOS` client by serving the responses of a capture log.
+
+    Each method returns its captured responses in order. With `realtime`, every
+    call takes as long as the captured one did; otherwise calls return at once.
+    Calls whose arguments differ from the capture are counted in `mismatches`.
+    """
+
+    def __init__(self, path: str | Path, realtime: bool = True) -> None:
+        self.realtime = realtime
+        self.queues: dict[str, deque[CallRecord]] = defaultdict(deque)
+        for record in read_capture(path):
+            self.queues[record.method].append(record)
+        self.mismatches = 0
+        self._lock = threading.Lock()
+        logger.info("Replaying %d calls from %s", sum(len(queue) for queue in self.queues.values()), path)
+
+    def __getattr__(self, attr: str) -> ReplayService:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        service = ReplayService(attr, self)
+        setattr(self, attr, service)
+        return service
+
+    def call(self, method: str, args: tuple, kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+        """Serve the next captured response of a method.
+
+        Streamed arguments are read to the end, as the service would, before they are compared.
+
+        Raises:
+            ReplayExhaustedError: If the method has no captured calls left.
+            RuntimeError: If the captured call failed, or for a stream, once its captured items are read.
+        """
+        args = tuple(list(arg) if isinstance(arg, Iterator) else arg for arg in args)
+        with self._lock:
+            queue = self.queues.get(method)
+            if not queue:
+                raise ReplayExhaustedError(f"No captured calls of {method} left")
+            record = queue.popleft()
+            if to_plain(args) != list(record.args) or to_plain(kwargs) != record.kwargs:
+                self.mismatches += 1
+                logger.debug("%s called with different arguments than captured", method)
+        if self.realtime:
+            time.sleep(record.duration)
+        if record.stream:
+            return _replay_stream(to_namespace(record.response), method, record.error)
+        if record.error is not None:
+            raise RuntimeError(f"Captured call of {method} failed: {record.error}")
+        return to_namespace(record.response)
@@ -0,0 +1,240 @@
+"""Command line entry point for skillet.
+
+Each subcommand imports its dependencies only when it runs, so `skillet --help`
+and other quick commands do not pay for pykos, NumPy, Tk or the agent stack.
+"""
+
+# Standard library imports
+import argparse
+import logging
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable, Sequence
+
+# Third-party imports
+import colorlogging
+
+if TYPE_CHECKING:
+    from skillet.connection import Robot
+
+DEFAULT_IP = "192.168.42.1"  # Mirrors `skillet.connection.DEFAULT_IP`, which is not imported eagerly.
+DEFAULT_SAFE_STOP = "hold"  # For commands that move the robot; the others are not guarded unless asked to be.
+
+
+def _connect(args: argparse.Namespace) -> "Robot":
+    from skillet.connection import connect
+
+    return connect(args.ip, args.robot_id, safe_stop=_safe_stop(args))
+
+
+def _safe_stop(args: argparse.Namespace) -> str | None:
+    safe_stop = args.safe_stop or (DEFAULT_SAFE_STOP if args.moves else "off")
+    return None if safe_stop == "off" else safe_stop
+
+
+def run_zero(args: argparse.Namespace) -> int:
+    from skillet.setup.maps import ACTUATOR_ID_TO_NAME
+    from skillet.setup.setup_zeroing import zero_actuators
+
+    failed_ids = zero_actuators(_connect(args).kos, tolerance=args.tolerance, max_attempts=args.attempts)
+    if failed_ids:
+        failed_joints = [ACTUATOR_ID_TO_NAME.get(actuator_id, str(actuator_id)) for actuator_id in failed_ids]
+        logging.error("Failed to zero %d joints: %s", len(failed_joints), ", ".join(failed_joints))
+        return 1
+    logging.info("All joints successfully zeroed")
+    return 0
+
+
+def run_play(args: argparse.Namespace) -> int:
+    from skillet.examples.squat import PlaybackOptions, play_motion, play_retimed
+
+    robot = _connect(args)
+    streamed = args.speed is not None or args.fastest or args.balance or args.record_telemetry or args.from_nearest
+    if not streamed:
+        play_motion(robot, args.file, args.interval)
+        return 0
+
+    from skillet.motion.pose_index import PoseIndex
+
+    options = PlaybackOptions(
+        interval=None if args.fastest else args.interval,
+        speed=args.speed or 1.0,
+        telemetry_path=args.record_telemetry,
+        from_nearest=args.from_nearest,
+        index=PoseIndex.from_library(args.library, robot.profile) if args.from_nearest else None,
+    )
+    if not args.balance:
+        return 0 if play_retimed(robot, args.file, options) else 1
+
+    from skillet.sensors.imu import ImuReader, KosImuSource
+
+    with ImuReader(KosImuSource(robot.kos)) as imu:
+        return 0 if play_retimed(robot, args.file, replace(options, imu=imu)) else 1
+
+
+def run_squat(args: argparse.Namespace) -> int:
+    from skillet.examples.squat import play_squat
+
+    return 0 if play_squat(_connect(args), args.depth, args.duration) else 1
+
+
+def run_walk(args: argparse.Namespace) -> int:
+    from skillet.examples.walk import walk_forward
+
+    return 0 if walk_forward(_connect(args), args.steps, args.speed) else 1
+
+
+def run_grip(args: argparse.Namespace) -> int:
+    from skillet.motion.gripper import Gripper
+
+    robot = _connect(args)
+    gripper = Gripper(robot.kos, robot.profile, contact_torque=args.contact_torque, watchdog=robot.watchdog)
+    if not gripper.configure():
+        return 1
+    if args.release:
+        gripper.open()
+        return 0
+    return 0 if gripper.close().grasped else 1
+
+
+def run_analyze(args: argparse.Namespace) -> int:
+    from skillet.motion.tracking import analyze_run
+
+    try:
+        results = analyze_run(args.file)
+    except ValueError as e:
+        logging.error("Cannot analyze %s: %s", args.file, str(e))
+        return 1
+    for result in results:
+        print(result)
+    return 1 if any(result.flags for result in results) else 0
+
+
+def run_states(args: argparse.Namespace) -> int:
+    from skillet.examples.print_joint_states import print_all_joint_states
+
+    print_all_joint_states(_connect(args).kos)
+    return 0
+
+
+def run_record(args: argparse.Namespace) -> int:
+    from skillet.examples.print_joint_states import record_keyframes
+
+    record_keyframes(_connect(args).kos, args.file)
+    return 0
+
+
+def run_imu(args: argparse.Namespace) -> int:
+    from skillet.examples.imu import stream_orientation
+    from skillet.sensors.imu import ImuSource, KosImuSource, ReplayImuSource
+
+    source: ImuSource = ReplayImuSource(args.replay) if args.replay else KosImuSource(_connect(args).kos)
+    stream_orientation(source, args.duration, args.record)
+    return 0
+
+
+def run_led(args: argparse.Namespace) -> int:
+    from skillet.examples.led import main as led_main
+
+    led_main(_connect(args).kos)
+    return 0
+
+
+def run_agent(args: argparse.Namespace) -> int:
+    from skillet.agent import DEFAULT_TASK, main as agent_main
+
+    agent_main(
+        args.ip, args.task or DEFAULT_TASK, safe_stop=_safe_stop(args), robot_id=args.robot_id, library=args.library
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="skillet", description="Toolkit for the Zeroth robot.")
+    parser.add_argument("--ip", default=DEFAULT_IP, help=f"Robot IP address (default: {DEFAULT_IP})")
+    parser.add_argument("--robot-id", default=None, help="Robot profile ID (default: $SKILLET_ROBOT_ID)")
+    parser.add_argument(
+        "--safe-stop",
+        choices=["hold", "limp", "zero", "off"],
+        default=None,
+        help=(
+            "What to do with the actuators when a call or the control loop stalls "
+            f"(default: {DEFAULT_SAFE_STOP} for commands that move the robot, off otherwise)"
+        ),
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add(
+        name: str, handler: Callable[[argparse.Namespace], int], summary: str, moves: bool = False
+    ) -> argparse.ArgumentParser:
+        subparser = subparsers.add_parser(name, help=summary)
+        subparser.set_defaults(handler=handler, moves=moves)
+        return subparser
+
+    zero = add("zero", run_zero, "Zero all actuators and verify the result")
+    zero.add_argument("--tolerance", type=float, default=1.0, help="Degrees from zero that count as zeroed")
+    zero.add_argument("--attempts", type=int, default=3, help="Zero-and-verify rounds before giving up")
+
+    play = add("play", run_play, "Play a keyframe file", moves=True)
+    play.add_argument("file", help="Keyframe file, e.g. squat_positions.json")
+    play.add_argument("--interval", type=float, default=2.0, help="Seconds between keyframes")
+    play.add_argument("--speed", type=float, default=None, help="Stream a smooth trajectory at this speed factor")
+    play.add_argument("--fastest", action="store_true", help="Stream as fast as the joint limits allow")
+    play.add_argument("--balance", action="store_true", help="Stream with IMU balance correction of the legs")
+    play.add_argument("--record-telemetry", default=None, help="Save commanded and measured trajectories to this file")
+    play.add_argument(
+        "--from-nearest", action="store_true", help="Blend in from the current pose to the closest keyframe"
+    )
+    play.add_argument(
+        "--library",
+        default=None,
+        help="Directory of keyframe files to index for --from-nearest, defaults to $SKILLET_MOTION_LIBRARY",
+    )
+
+    squat = add("squat", run_squat, "Squat to a given depth using the leg kinematics", moves=True)
+    squat.add_argument("--depth", type=float, default=0.06, help="Meters the pelvis drops")
+    squat.add_argument("--duration", type=float, default=4.0, help="Seconds to go down and back up")
+
+    walk = add("walk", run_walk, "Walk forward with the procedural gait", moves=True)
+    walk.add_argument("--steps", type=int, default=4, help="Number of steps")
+    walk.add_argument("--speed", type=float, default=1.0, help="Cadence relative to the default step period")
+
+    grip = add("grip", run_grip, "Close the gripper until it touches an object", moves=True)
+    grip.add_argument("--release", action="store_true", help="Open the gripper instead")
+    grip.add_argument("--contact-torque", type=float, default=1.5, help="Torque that counts as touching an object")
+
+    analyze = add("analyze", run_analyze, "Report tracking error of a run saved with play --record-telemetry")
+    analyze.add_argument("file", help="Telemetry file (.npz)")
+
+    add("states", run_states, "Print the states of all joints as JSON")
+
+    record = add("record", run_record, "Record keyframes by moving the limp robot by hand")
+    record.add_argument("file", help="Keyframe file to write")
+
+    imu = add("imu", run_imu, "Stream the IMU and print the estimated orientation")
+    imu.add_argument("--duration", type=float, default=10.0, help="Seconds to stream for")
+    imu.add_argument("--record", default=None, help="Save the raw samples to this .npy file")
+    imu.add_argument("--replay", default=None, help="Replay a recorded .npy file instead of the robot")
+
+    add("led", run_led, "Draw on the LED matrix")
+
+    agent = add("agent", run_agent, "Run the pickup and delivery agent", moves=True)
+    agent.add_argument("--task", default=None, help="Task for the agent (default: pick up and deliver an item)")
+    agent.add_argument(
+        "--library",
+        default=None,
+        help="Directory of keyframe files the agent can play, defaults to $SKILLET_MOTION_LIBRARY",
+    )
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    colorlogging.configure()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
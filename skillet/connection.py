@@ -0,0 +1,103 @@
+"""Connects to a robot and loads its calibration profile."""
+
+# Standard library imports
+import atexit
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import cast
+
+# Third-party imports
+import pykos  # type: ignore[import-untyped]
+
+# Local imports
+from skillet.capture import CAPTURE_FILE_ENV, REPLAY_FILE_ENV, REPLAY_REALTIME_ENV, CapturingKOS, ReplayKOS
+from skillet.instrumentation import InstrumentedKOS, Metrics
+from skillet.motion.keyframes import Motion, compile_motion, load_keyframes
+from skillet.setup.setup_id import RobotProfile, load_profile
+from skillet.watchdog import SafeStop, Watchdog
+
+DEFAULT_IP = "192.168.42.1"
+METRICS_FILE_ENV = "SKILLET_METRICS_FILE"
+
+
+@dataclass
+class Robot:
+    """A KOS client paired with the calibration profile of the robot behind it.
+
+    The client may be wrapped for instrumentation, deadlines or capture. The
+    wrappers are drop-in replacements, so it is typed as a plain `pykos.KOS`.
+    """
+
+    kos: pykos.KOS
+    profile: RobotProfile
+    watchdog: Watchdog | None = None
+    metrics: Metrics = field(default_factory=Metrics)  # Call metrics of the KOS client
+
+    def load_motion(self, path: str | Path) -> Motion:
+        """Load a keyframe file compiled for this robot."""
+        return compile_motion(load_keyframes(path), self.profile)
+
+
+def process_file(path: str, name: str | None) -> str:
+    """Add the name of a process to a file name, so `calls.skcap` becomes `calls.skillet-imu.skcap`."""
+    if name is None:
+        return path
+    file = Path(path)
+    return str(file.with_name(f"{file.stem}.{name}{file.suffix}"))
+
+
+def connect(
+    ip: str = DEFAULT_IP,
+    robot_id: str | None = None,
+    safe_stop: SafeStop | str | None = None,
+    name: str | None = None,
+) -> Robot:
+    """Connect to a robot and look up its profile.
+
+    The client is instrumented, and if `$SKILLET_METRICS_FILE` is set its metrics
+    are written there in the Prometheus text format when the process exits. If
+    `$SKILLET_CAPTURE_FILE` is set, every call is captured to that log, and if
+    `$SKILLET_REPLAY_FILE` is set, calls are answered from a captured log instead
+    of the robot, in real time unless `$SKILLET_REPLAY_REALTIME` is `0`.
+
+    Args:
+        ip (str): IP address of the robot.
+        robot_id (str | None): ID of the robot, defaults to `$SKILLET_ROBOT_ID`.
+        safe_stop (SafeStop | str | None): Guard all calls with a watchdog that stops the robot this way
+            when a call or the control loop stalls. No watchdog if None.
+        name (str | None): Name of the connecting process, when several processes share the environment.
+            It is added to the metrics, capture and replay file names, so each process has files of its own.
+
+    Returns:
+        Robot: The connected robot.
+    """
+    profile = load_profile(robot_id)
+    replay_file = os.environ.get(REPLAY_FILE_ENV)
+    capture_file = os.environ.get(CAPTURE_FILE_ENV)
+    replay_file = process_file(replay_file, name) if replay_file else None
+    capture_file = process_file(capture_file, name) if capture_file else None
+    kos: pykos.KOS
+    if replay_file:
+        kos = cast(pykos.KOS, ReplayKOS(replay_file, realtime=os.environ.get(REPLAY_REALTIME_ENV, "1") != "0"))
+    elif capture_file:
+        capturing = CapturingKOS(pykos.KOS(ip=ip), capture_file)
+        atexit.register(capturing.close)
+        kos = cast(pykos.KOS, capturing)
+    else:
+        kos = pykos.KOS(ip=ip)
+
+    watchdog = None
+    if safe_stop is not None:
+        # The safe stop gets its own client, so a hung channel cannot block it.
+        safe_stop_kos = kos if replay_file else pykos.KOS(ip=ip)
+        watchdog = Watchdog(safe_stop_kos, list(profile.actuator_ids.values()), mode=SafeStop(safe_stop))
+        watchdog.start()
+        atexit.register(watchdog.stop)
+        kos = cast(pykos.KOS, watchdog.guard(kos))
+    instrumented = InstrumentedKOS(kos)
+    robot = Robot(kos=cast(pykos.KOS, instrumented), profile=profile, watchdog=watchdog, metrics=instrumented.metrics)
+    metrics_file = os.environ.get(METRICS_FILE_ENV)
+    if metrics_file:
+        atexit.register(robot.metrics.write_prometheus, process_file(metrics_file, name))
+    return robot
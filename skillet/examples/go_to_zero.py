@@ -13,6 +13,7 @@ import colorlogging
 import pykos  # type: ignore[import-untyped]
 
 # Local imports
+from skillet.connection import connect
 from skillet.setup.maps import ACTUATOR_NAME_TO_ID
 
 logger = logging.getLogger(__name__)
@@ -67,7 +68,7 @@ def main() -> None:
     colorlogging.configure()
     
     try:
-        kos = pykos.KOS(ip="192.168.42.1")
+        kos = connect().kos
         
         logger.info("Starting to zero all joints...")
         failed_joints = move_to_zero(kos)
@@ -1 +1,65 @@
-"""Placeholder module for IMU examples (to be implemented)."""
+"""Example script to stream the IMU and print the estimated orientation.
+
+Pass `--record` to save the raw samples, and `--replay` to run the same filter
+on a previous recording without a robot.
+"""
+
+# Standard library imports
+import argparse
+import logging
+import time
+
+# Third-party imports
+import colorlogging
+
+# Local imports
+from skillet.connection import connect
+from skillet.sensors.imu import ImuReader, ImuSource, KosImuSource, ReplayImuSource
+
+# Constants
+PRINT_INTERVAL = 0.1  # Seconds between printed estimates
+
+logger = logging.getLogger(__name__)
+
+
+def stream_orientation(source: ImuSource, duration: float, record: str | None = None) -> None:
+    """Stream an IMU source and log its orientation until the duration elapses.
+
+    Args:
+        source (ImuSource): Source of IMU samples.
+        duration (float): Seconds to stream for.
+        record (str | None): File to save the raw samples to.
+    """
+    with ImuReader(source) as imu:
+        end = time.monotonic() + duration
+        while time.monotonic() < end and not getattr(source, "exhausted", False):
+            orientation = imu.latest
+            if orientation is not None:
+                logger.info("roll %7.2f  pitch %7.2f", orientation.roll, orientation.pitch)
+            time.sleep(PRINT_INTERVAL)
+
+    if record:
+        imu.save(record)
+        logger.info("Saved %d samples to %s", min(imu.count, len(imu.buffer)), record)
+
+
+def main() -> None:
+    """Main function to stream the IMU."""
+    logging.basicConfig(level=logging.INFO)
+    colorlogging.configure()
+
+    parser = argparse.ArgumentParser(description="Stream the IMU orientation.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to stream for")
+    parser.add_argument("--record", default=None, help="Save the raw samples to this .npy file")
+    parser.add_argument("--replay", default=None, help="Replay a recorded .npy file instead of the robot")
+    args = parser.parse_args()
+
+    if args.replay:
+        source: ImuSource = ReplayImuSource(args.replay)
+    else:
+        source = KosImuSource(connect().kos)
+    stream_orientation(source, args.duration, args.record)
+
+
+if __name__ == "__main__":
+    main()
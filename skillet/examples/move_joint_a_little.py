@@ -12,6 +12,7 @@ import colorlogging
 import pykos  # type: ignore[import-untyped]
 
 # Local imports
+from skillet.connection import connect
 from skillet.setup.maps import ACTUATOR_NAME_TO_ID
 
 # Constants
@@ -78,7 +79,7 @@ def move_joint_a_little(joint_name: str, move_degrees: float) -> None:
     colorlogging.configure()
 
     # Instantiate the KOS client
-    kos = pykos.KOS(ip="192.168.42.1")
+    kos = connect().kos
 
     # Configure and log initial state
     configure_joint(kos, joint_name)
@@ -9,9 +9,8 @@ import json  # Add this import at the top of the file
 import colorlogging
 import pykos  # type: ignore[import-untyped]
 
-import move_joint_a_little
-
 # Local imports
+from skillet.connection import connect
 from skillet.setup.maps import ACTUATOR_NAME_TO_ID
 
 logger = logging.getLogger(__name__)
@@ -32,20 +31,8 @@ def configure_joint_for_tracking(kos: pykos.KOS, joint_name: str) -> None:
     if not result.success:
         logger.warning("Failed to configure joint %s: %s", joint_name, result.error)
 
-def print_all_joint_states() -> None:
-    """Get and print the states of all joints in JSON format."""
-
-    # Configure logging
-    logging.basicConfig(level=logging.INFO)
-    colorlogging.configure()
-
-    # Instantiate the KOS client
-    kos = pykos.KOS(ip="192.168.42.1")
-
-    # Initialize dictionary to store joint states
-    joint_states = {}
-
-    # First configure all joints for tracking
+def configure_all_for_tracking(kos: pykos.KOS) -> None:
+    """Configure every joint for position tracking and let the configuration settle."""
     logger.info("Configuring joints for position tracking...")
     for joint_name in ACTUATOR_NAME_TO_ID:
         try:
@@ -56,6 +43,11 @@ def print_all_joint_states() -> None:
     # Small delay to allow configurations to take effect
     time.sleep(0.5)
 
+def read_joint_states(kos: pykos.KOS) -> dict:
+    """Read the states of all joints in the keyframe file format."""
+    # Initialize dictionary to store joint states
+    joint_states = {}
+
     # Get and store state for each joint
     for joint_name, actuator_id in ACTUATOR_NAME_TO_ID.items():
         try:
@@ -77,10 +69,51 @@ def print_all_joint_states() -> None:
                 "error": str(e)
             }
 
+    return joint_states
+
+def print_all_joint_states(kos: pykos.KOS | None = None) -> None:
+    """Get and print the states of all joints in JSON format."""
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO)
+    colorlogging.configure()
+
+    # Instantiate the KOS client
+    kos = kos or connect().kos
+
+    configure_all_for_tracking(kos)
+    joint_states = read_joint_states(kos)
+
     # Print the JSON output
     logger.info("Joint States:")
     print(json.dumps(joint_states, indent=2))
 
+def record_keyframes(kos: pykos.KOS, path: str) -> None:
+    """Record keyframes by moving the limp robot by hand.
+
+    Press Enter to capture the current pose as a keyframe, and `q` then Enter to
+    write all captured keyframes to `path`.
+
+    Args:
+        kos (pykos.KOS): Instance of the KOS object to communicate with actuators.
+        path (str): Keyframe file to write.
+    """
+    configure_all_for_tracking(kos)
+
+    keyframes: list[dict] = []
+    while input(f"[{len(keyframes)} keyframes] Enter to capture, q to finish: ").strip().lower() != "q":
+        joint_states = read_joint_states(kos)
+        failed = [joint_name for joint_name, state in joint_states.items() if "error" in state]
+        if failed:
+            # The keyframe file format has no way to express a missing reading, so retake the keyframe instead.
+            logger.error("Not captured, failed to read %s", ", ".join(failed))
+            continue
+        keyframes.append(joint_states)
+
+    with open(path, "w") as f:
+        json.dump(keyframes, f, indent=2)
+    logger.info("Wrote %d keyframes to %s", len(keyframes), path)
+
 def main() -> None:
     """Main function to print all joint states."""
     print_all_joint_states()
@@ -8,13 +8,30 @@ import json
 import logging
 import time
 import traceback
+from dataclasses import dataclass, replace
 import pykos  # type: ignore[import-untyped]
 
 # Third-party imports
 import colorlogging
+import numpy as np
 
 # Local imports
-from skillet.setup.maps import ACTUATOR_NAME_TO_ID
+from skillet.connection import Robot, connect
+from skillet.motion.balance import BalanceController
+from skillet.motion.cache import SetpointCache, cache_key
+from skillet.motion.kinematics import leg_motion, squat_trajectory
+from skillet.motion.player import CONTROL_RATE_HZ, Player
+from skillet.motion.pose_index import PoseIndex, blend_in, enter_at, read_pose
+from skillet.motion.retime import retime
+from skillet.motion.tracking import TelemetryRecorder, save_run
+from skillet.motion.validate import JointLimits, validate_motion
+from skillet.sensors.imu import ImuReader
+from skillet.watchdog import SafeStop, WatchdogTrippedError
+
+# Constants
+POSITION_INTERVAL = 2.0  # Seconds between positions
+SQUAT_DEPTH = 0.06  # Meters the pelvis drops
+SQUAT_DURATION = 4.0  # Seconds down and back up
 
 logger = logging.getLogger(__name__)
 
@@ -86,19 +103,22 @@ def move_to_position(kos: pykos.KOS, position_dict: dict) -> list[str]:
             
     return failed_joints
 
-def main() -> None:
-    """
-    Execute the squat sequence using positions from squat_positions.json.
-    ASSUMES THE ROBOT WAS CALIBRATED
+def play_motion(robot: Robot, path: str, interval: float = POSITION_INTERVAL) -> None:
+    """Play a keyframe file on the robot, one position every `interval` seconds.
+
+    Args:
+        robot (Robot): The connected robot.
+        path (str): Path of the keyframe file to play.
+        interval (float): Seconds to wait between positions.
     """
-    logging.basicConfig(level=logging.INFO)
-    colorlogging.configure()
+    kos = robot.kos
     try:
-        # Load squat positions
-        with open("burpee.json", "r") as f:
-            squat_sequence = json.load(f)
-            
-        kos = pykos.KOS(ip="192.168.42.1")
+        # Load positions, calibrated for this robot
+        sequence = robot.load_motion(path)
+        violation = validate_motion(sequence, interval, robot.profile)
+        if violation is not None:
+            logger.error("Refusing to play %s: %s", path, violation)
+            return
         
         # Play audio file properly
         # with open("some_file.wav", "rb") as audio_file:
@@ -118,10 +138,10 @@ def main() -> None:
         #         logger.error(f"Failed to play audio: {response.error}")
 
         # Execute each position in sequence
-        for i, position in enumerate(squat_sequence):
-            logger.info(f"\nMoving to position {i+1}/{len(squat_sequence)}")
+        for i in range(len(sequence)):
+            logger.info(f"\nMoving to position {i+1}/{len(sequence)}")
             
-            failed_joints = move_to_position(kos, position)
+            failed_joints = move_to_position(kos, sequence.position_dict(i))
             
             if failed_joints:
                 logger.error("=== Failed Joints for Position %d ===", i+1)
@@ -131,17 +151,191 @@ def main() -> None:
                 logger.info("All joints moved successfully for position %d", i+1)
             
             # Wait between positions
-            if i < len(squat_sequence) - 1:  # Don't wait after last position
-                logger.info("Waiting 2 seconds before next position...")
-                time.sleep(2)
+            if i < len(sequence) - 1:  # Don't wait after last position
+                logger.info("Waiting %.1f seconds before next position...", interval)
+                time.sleep(interval)
 
     except FileNotFoundError:
-        logger.error("squat_positions.json not found!")
+        logger.error("%s not found!", path)
     except json.JSONDecodeError:
-        logger.error("Invalid JSON format in squat_positions.json!")
+        logger.error("Invalid JSON format in %s!", path)
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         logger.error(f"Traceback:\n{traceback.format_exc()}")
 
+@dataclass(frozen=True)
+class PlaybackOptions:
+    """How `play_retimed` plays a keyframe file.
+
+    Attributes:
+        interval: Nominal seconds between positions, or None to play as fast as the limits allow.
+        speed: Speed factor relative to the nominal interval, or to the limits if there is none.
+        rate: Control rate in Hz.
+        imu: Running IMU reader, enables balance correction of the leg pitch joints.
+        telemetry_path: File to save the commanded and measured trajectories to.
+        from_nearest: Blend in from the current pose to the closest keyframe instead of the first one.
+        index: Motion library compiled for this robot, built once and reused to find the keyframe to enter at.
+            Files it does not hold are compiled and indexed on their own.
+    """
+
+    interval: float | None = POSITION_INTERVAL
+    speed: float = 1.0
+    rate: float = CONTROL_RATE_HZ
+    imu: ImuReader | None = None
+    telemetry_path: str | None = None
+    from_nearest: bool = False
+    index: PoseIndex | None = None
+
+
+def play_retimed(robot: Robot, path: str, options: PlaybackOptions = PlaybackOptions()) -> bool:
+    """Play a keyframe file as a smooth trajectory retimed to the joint limits.
+
+    Args:
+        robot (Robot): The connected robot.
+        path (str): Path of the keyframe file to play.
+        options (PlaybackOptions): Timing, balance, telemetry and entry options.
+
+    Returns:
+        bool: Whether the file was played without errors.
+    """
+    interval, speed, rate = options.interval, options.speed, options.rate
+    imu, telemetry_path, from_nearest = options.imu, options.telemetry_path, options.from_nearest
+    cache = SetpointCache()
+    key = cache_key(path, robot.profile, interval=interval, speed=speed, rate=rate, interpolation="trapezoidal")
+    # Blending in depends on the current pose, so those setpoints are never cached.
+    sequence = None if from_nearest else cache.get(key)
+    if sequence is None:
+        name = options.index.motion_name(path) if options.index is not None else None
+        if options.index is not None and name is not None:
+            index, keyframes = options.index, options.index.motions[name]
+        else:
+            # Files outside the library are compiled, and for entering, indexed on their own.
+            name, keyframes = path, robot.load_motion(path)
+            index = PoseIndex({path: keyframes}) if from_nearest else None
+        if index is not None and from_nearest:
+            pose = read_pose(robot.kos, keyframes)
+            match = index.entry(pose, name)
+            logger.info(
+                "Entering %s at keyframe %d, %.1f degrees from the current pose", path, match.frame, match.distance
+            )
+            keyframes = enter_at(keyframes, pose, match.frame)
+        limits = JointLimits.for_joints(keyframes.joint_names, robot.profile)
+        schedule = retime(keyframes.positions, limits, interval, speed)
+        violation = validate_motion(keyframes, schedule.durations, robot.profile)
+        if violation is not None:
+            logger.error("Refusing to play %s: %s", path, violation)
+            return False
+        sequence = replace(keyframes, positions=schedule.sample(keyframes.positions, rate))
+        if not from_nearest:
+            cache.put(key, sequence)
+
+    for actuator_id in sequence.actuator_ids.tolist():
+        if not configure_actuator(robot.kos, actuator_id):
+            logger.error("Failed to configure actuator %d, aborting", actuator_id)
+            return False
+
+    balance = None
+    if imu is not None:
+        # Hold the pitch the robot starts at, which also absorbs the IMU mounting offset.
+        reference_pitch = imu.latest.pitch if imu.latest is not None else 0.0
+        balance = BalanceController(imu, sequence.joint_names, reference_pitch=reference_pitch)
+
+    logger.info("Playing %s in %.2f seconds", path, (len(sequence) - 1) / rate)
+    player = Player(
+        robot.kos,
+        sequence.actuator_ids,
+        rate,
+        filters=[balance] if balance else [],
+        watchdog=robot.watchdog,
+        # Balance corrections are added after validation, so they are clamped to the limits on every tick.
+        limits=JointLimits.for_joints(sequence.joint_names, robot.profile),
+    )
+    setpoints = sequence.positions
+    try:
+        if telemetry_path is None:
+            stats = player.play(setpoints)
+        else:
+            with TelemetryRecorder(robot.kos, sequence.actuator_ids.tolist()) as recorder:
+                stats = player.play(setpoints)
+    except WatchdogTrippedError as e:
+        logger.error("Stopped playing %s: %s", path, str(e))
+        return False
+    if telemetry_path is not None:
+        save_run(
+            telemetry_path,
+            sequence.joint_names,
+            command_times=stats.command_times,
+            commanded=stats.commanded,
+            telemetry_times=recorder.times,
+            measured=recorder.positions,
+        )
+        logger.info("Saved telemetry to %s, inspect it with `skillet analyze`", telemetry_path)
+    if stats.failed_commands:
+        logger.error("%d actuator commands failed", stats.failed_commands)
+    if balance is not None:
+        logger.info(
+            "Balance correction: %.3f ms mean, %.3f ms max, %d budget overruns",
+            balance.stats.mean_seconds * 1000,
+            balance.stats.max_seconds * 1000,
+            balance.stats.overruns,
+        )
+    return not stats.failed_commands
+
+def play_squat(
+    robot: Robot, depth: float = SQUAT_DEPTH, duration: float = SQUAT_DURATION, rate: float = CONTROL_RATE_HZ
+) -> bool:
+    """Squat to a given depth with a trajectory solved from the leg kinematics.
+
+    Args:
+        robot (Robot): The connected robot.
+        depth (float): Meters the pelvis drops below standing height.
+        duration (float): Seconds to go down and back up.
+        rate (float): Control rate in Hz.
+
+    Returns:
+        bool: Whether the squat was played without errors.
+    """
+    try:
+        squat = leg_motion(squat_trajectory(depth, duration, rate), robot.profile)
+    except ValueError as e:
+        logger.error("Cannot squat %.3f m deep: %s", depth, str(e))
+        return False
+    # Start from wherever the legs are, instead of snapping them to the solved standing pose on the first tick.
+    limits = JointLimits.for_joints(squat.joint_names, robot.profile)
+    sequence = blend_in(squat, read_pose(robot.kos, squat), limits, rate)
+    violation = validate_motion(sequence, np.full(len(sequence) - 1, 1.0 / rate), robot.profile)
+    if violation is not None:
+        logger.error("Refusing to squat %.3f m deep: %s", depth, violation)
+        return False
+
+    for actuator_id in sequence.actuator_ids.tolist():
+        if not configure_actuator(robot.kos, actuator_id):
+            logger.error("Failed to configure actuator %d, aborting", actuator_id)
+            return False
+
+    logger.info(
+        "Squatting %.3f m deep in %.2f seconds, after %.2f seconds moving to the standing pose",
+        depth,
+        duration,
+        (len(sequence) - len(squat)) / rate,
+    )
+    try:
+        stats = Player(robot.kos, sequence.actuator_ids, rate, watchdog=robot.watchdog).play(sequence.positions)
+    except WatchdogTrippedError as e:
+        logger.error("Stopped squatting: %s", str(e))
+        return False
+    if stats.failed_commands:
+        logger.error("%d actuator commands failed", stats.failed_commands)
+    return not stats.failed_commands
+
+def main() -> None:
+    """
+    Execute the squat sequence using positions from burpee.json.
+    ASSUMES THE ROBOT WAS CALIBRATED
+    """
+    logging.basicConfig(level=logging.INFO)
+    colorlogging.configure()
+    play_motion(connect(safe_stop=SafeStop.HOLD), "burpee.json")
+
 if __name__ == "__main__":
     main()
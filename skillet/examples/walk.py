@@ -0,0 +1,72 @@
+"""Example script to walk forward with the procedural gait.
+
+Make sure you have configured and zeroed the joints before running this script.
+"""
+
+# Standard library imports
+import argparse
+import logging
+
+# Third-party imports
+import colorlogging
+
+# Local imports
+from skillet.connection import Robot, connect
+from skillet.examples.squat import configure_actuator
+from skillet.motion.gait import GaitParameters, Walker
+from skillet.watchdog import SafeStop, WatchdogTrippedError
+
+logger = logging.getLogger(__name__)
+
+
+def walk_forward(robot: Robot, steps: int, speed: float = 1.0, params: GaitParameters = GaitParameters()) -> bool:
+    """Walk a number of steps forward.
+
+    Args:
+        robot (Robot): The connected robot.
+        steps (int): Number of steps, alternating between the legs.
+        speed (float): Cadence relative to the gait's step period.
+        params (GaitParameters): Shape of the gait.
+
+    Returns:
+        bool: Whether the walk completed without errors.
+    """
+    walker = Walker(robot.kos, robot.profile, params=params, watchdog=robot.watchdog)
+    violation = walker.validate(walker.read_pose(), speed)
+    if violation is not None:
+        logger.error("Refusing to walk at speed %.2f: %s", speed, violation)
+        return False
+
+    for actuator_id in walker.actuator_ids.tolist():
+        if not configure_actuator(robot.kos, actuator_id):
+            logger.error("Failed to configure actuator %d, aborting", actuator_id)
+            return False
+
+    try:
+        stats = walker.walk(steps, speed)
+    except ValueError as e:
+        logger.error(str(e))
+        return False
+    except WatchdogTrippedError as e:
+        logger.error("Stopped walking: %s", str(e))
+        return False
+    if stats.failed_commands:
+        logger.error("%d actuator commands failed", stats.failed_commands)
+    return not stats.failed_commands
+
+
+def main() -> None:
+    """Main function to walk forward."""
+    logging.basicConfig(level=logging.INFO)
+    colorlogging.configure()
+
+    parser = argparse.ArgumentParser(description="Walk forward with the procedural gait.")
+    parser.add_argument("--steps", type=int, default=4, help="Number of steps")
+    parser.add_argument("--speed", type=float, default=1.0, help="Cadence relative to the default step period")
+    args = parser.parse_args()
+
+    walk_forward(connect(safe_stop=SafeStop.HOLD), args.steps, args.speed)
+
+
+if __name__ == "__main__":
+    main()
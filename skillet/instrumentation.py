@@ -0,0 +1,172 @@
+"""Transparent instrumentation of KOS client calls.
+
+Wrapping a `pykos.KOS` client in `InstrumentedKOS` records the call count, error
+count and a latency histogram of every service method, e.g.
+`actuator.command_actuators`, without changing how the client is used.
+"""
+
+# Standard library imports
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+# Third-party imports
+import pykos  # type: ignore[import-untyped]
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+METRIC_PREFIX = "skillet_kos"
+
+
+@dataclass
+class MethodStats:
+    """Counters and latency histogram of a single method."""
+
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def record(self, seconds: float, error: bool) -> None:
+        self.calls += 1
+        self.errors += error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a latency quantile from the histogram, in seconds."""
+        if not self.calls:
+            return 0.0
+        target = q * self.calls
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.max_seconds
+
+
+class Metrics:
+    """Thread-safe registry of per-method statistics."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, MethodStats] = {}
+
+    def record(self, method: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.get(method)
+            if stats is None:
+                stats = self._stats[method] = MethodStats()
+            stats.record(seconds, error)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return a copy of the statistics of every method called so far."""
+        with self._lock:
+            return {
+                method: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "mean_seconds": stats.total_seconds / stats.calls if stats.calls else 0.0,
+                    "p50_seconds": stats.quantile(0.5),
+                    "p99_seconds": stats.quantile(0.99),
+                    "max_seconds": stats.max_seconds,
+                    "buckets": dict(zip(LATENCY_BUCKETS + (float("inf"),), stats.buckets)),
+                }
+                for method, stats in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self) -> str:
+        """Render the statistics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(
+                (method, replace(stats, buckets=list(stats.buckets))) for method, stats in self._stats.items()
+            )
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_calls_total Number of KOS calls.",
+            f"# TYPE {METRIC_PREFIX}_calls_total counter",
+        ]
+        lines += [f'{METRIC_PREFIX}_calls_total{{method="{method}"}} {stats.calls}' for method, stats in items]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_errors_total Number of KOS calls that raised.",
+            f"# TYPE {METRIC_PREFIX}_errors_total counter",
+        ]
+        lines += [f'{METRIC_PREFIX}_errors_total{{method="{method}"}} {stats.errors}' for method, stats in items]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_latency_seconds Latency of KOS calls.",
+            f"# TYPE {METRIC_PREFIX}_latency_seconds histogram",
+        ]
+        for method, stats in items:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), stats.buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{METRIC_PREFIX}_latency_seconds_bucket{{method="{method}",le="{le}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_latency_seconds_sum{{method="{method}"}} {stats.total_seconds}')
+            lines.append(f'{METRIC_PREFIX}_latency_seconds_count{{method="{method}"}} {stats.calls}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        """Write the statistics atomically, e.g. for the node exporter textfile collector."""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp_path.replace(path)
+
+
+class InstrumentedService:
+    """Wraps a KOS service so that every method call is timed."""
+
+    def __init__(self, service: Any, name: str, metrics: Metrics) -> None:  # noqa: ANN401
+        self._service = service
+        self._name = name
+        self._metrics = metrics
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        value = getattr(self._service, attr)
+        if not callable(value):
+            return value
+
+        method = f"{self._name}.{attr}"
+        metrics = self._metrics
+
+        def timed(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            start = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except BaseException:
+                metrics.record(method, time.perf_counter() - start, error=True)
+                raise
+            metrics.record(method, time.perf_counter() - start)
+            return result
+
+        # Cache the wrapper so later lookups skip `__getattr__`.
+        setattr(self, attr, timed)
+        return timed
+
+
+class InstrumentedKOS:
+    """Drop-in wrapper around a `pykos.KOS` client that records call metrics."""
+
+    def __init__(self, kos: pykos.KOS, metrics: Metrics | None = None) -> None:
+        self._kos = kos
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        value = getattr(self._kos, attr)
+        if callable(value) or isinstance(value, (int, float, str, bytes, bool)) or value is None:
+            return value
+        service = InstrumentedService(value, attr, self.metrics)
+        setattr(self, attr, service)
+        return service
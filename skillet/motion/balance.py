@@ -0,0 +1,125 @@
+"""IMU feedback that corrects leg pitch setpoints during keyframe playback.
+
+`BalanceController` is a setpoint filter for `Player`: on every tick it reads the
+latest IMU orientation and shifts the ankle and hip pitch targets against the
+measured body pitch, within a bounded correction. Its own compute time is
+measured on every tick, and it bypasses itself if it keeps exceeding its budget,
+so feedback can never hold up the command stream.
+"""
+
+# Standard library imports
+import logging
+import time
+from dataclasses import dataclass
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.sensors.imu import ImuReader
+
+# Constants
+PITCH_GAIN = 0.5  # Degrees of joint correction per degree of body pitch error
+MAX_CORRECTION = 8.0  # Degrees
+MAX_CORRECTION_STEP = 1.0  # Degrees per tick
+MAX_ORIENTATION_AGE = 0.05  # Seconds before an IMU estimate is considered stale
+TICK_BUDGET = 0.0005  # Seconds of compute allowed per tick
+MAX_OVERRUNS = 5  # Consecutive budget overruns before the controller bypasses itself
+
+# Share of the correction applied to each joint. The legs are mirrored, so the
+# right side moves in the opposite direction for the same body motion.
+PITCH_JOINT_WEIGHTS = {
+    "left_ankle_pitch": 1.0,
+    "right_ankle_pitch": -1.0,
+    "left_hip_pitch": 0.5,
+    "right_hip_pitch": -0.5,
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BudgetStats:
+    """Per-tick compute time of a setpoint filter."""
+
+    ticks: int = 0
+    overruns: int = 0
+    consecutive_overruns: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.ticks if self.ticks else 0.0
+
+
+class BalanceController:
+    """Bounded proportional pitch correction applied to leg setpoints."""
+
+    def __init__(
+        self,
+        imu: ImuReader,
+        joint_names: tuple[str, ...],
+        *,
+        reference_pitch: float = 0.0,
+        gain: float = PITCH_GAIN,
+        max_correction: float = MAX_CORRECTION,
+        max_step: float = MAX_CORRECTION_STEP,
+        max_age: float = MAX_ORIENTATION_AGE,
+        budget: float = TICK_BUDGET,
+        max_overruns: int = MAX_OVERRUNS,
+    ) -> None:
+        self.imu = imu
+        self.reference_pitch = reference_pitch
+        self.gain = gain
+        self.max_correction = max_correction
+        self.max_step = max_step
+        self.max_age = max_age
+        self.budget = budget
+        self.max_overruns = max_overruns
+
+        # Resolve the corrected joints once, so each tick is a single vector update.
+        self.indices = np.array([i for i, name in enumerate(joint_names) if name in PITCH_JOINT_WEIGHTS], dtype=int)
+        self.weights = np.array([PITCH_JOINT_WEIGHTS[joint_names[i]] for i in self.indices])
+        if not len(self.indices):
+            logger.warning("Motion drives none of %s, balance correction disabled", ", ".join(PITCH_JOINT_WEIGHTS))
+
+        self.correction = 0.0
+        self.bypassed = False
+        self.stats = BudgetStats()
+
+    def __call__(self, setpoint: np.ndarray) -> np.ndarray:
+        if self.bypassed or not len(self.indices):
+            return setpoint
+
+        start = time.perf_counter()
+        orientation = self.imu.latest
+        if orientation is not None and time.monotonic() - orientation.timestamp <= self.max_age:
+            target = -self.gain * (orientation.pitch - self.reference_pitch)
+        else:
+            target = 0.0  # Ease out of any correction without fresh feedback.
+        target = min(max(target, -self.max_correction), self.max_correction)
+        self.correction += min(max(target - self.correction, -self.max_step), self.max_step)
+
+        corrected = setpoint.copy()
+        corrected[self.indices] += self.weights * self.correction
+        self._account(time.perf_counter() - start)
+        return corrected
+
+    def _account(self, seconds: float) -> None:
+        stats = self.stats
+        stats.ticks += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        if seconds <= self.budget:
+            stats.consecutive_overruns = 0
+            return
+        stats.overruns += 1
+        stats.consecutive_overruns += 1
+        if stats.consecutive_overruns >= self.max_overruns:
+            self.bypassed = True
+            logger.error(
+                "Balance correction exceeded its %.2f ms budget %d times in a row, bypassing it",
+                self.budget * 1000,
+                stats.consecutive_overruns,
+            )
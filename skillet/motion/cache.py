@@ -0,0 +1,146 @@
+"""Content-addressed on-disk cache of ready-to-stream setpoint arrays.
+
+Entries are keyed by a hash of the keyframe file's contents, the robot profile,
+the playback parameters and the limits and validator the setpoints passed, so an
+edited file, a recalibrated robot, a new speed or stricter validation simply
+misses the cache instead of needing invalidation. Only validated setpoints may be
+stored. Entries are written to a temporary file and renamed into place, so
+readers only ever see complete entries, and the least recently used entries are
+evicted once the cache grows beyond its size limit.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.motion.keyframes import Motion
+from skillet.motion.validate import DEFAULT_MAX_ACCELERATION, DEFAULT_MAX_VELOCITY, VALIDATOR_VERSION
+from skillet.setup.setup_id import RobotProfile
+
+# Constants
+CACHE_DIR_ENV = "SKILLET_CACHE_DIR"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_VERSION = 1  # Bump when compiling, retiming or sampling changes its output
+ENTRY_SUFFIX = ".npz"
+TEMP_SUFFIX = ".tmp"
+STALE_TEMP_SECONDS = 3600.0  # Temporary files this old were left behind by a writer that died
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir() -> Path:
+    """Directory holding the cached setpoints."""
+    return Path(os.environ.get(CACHE_DIR_ENV, "~/.skillet/cache")).expanduser()
+
+
+def cache_key(path: str | Path, profile: RobotProfile, **params: Any) -> str:  # noqa: ANN401
+    """Hash a keyframe file, the profile it is compiled for, the playback parameters and the validation limits.
+
+    Args:
+        path (str | Path): Keyframe file.
+        profile (RobotProfile): Calibration the motion is compiled for.
+        **params (Any): JSON-serializable playback parameters, e.g. rate, speed and interpolation mode.
+
+    Returns:
+        str: Hex digest identifying the compiled setpoints.
+    """
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(Path(path).read_bytes()).digest())
+    digest.update(json.dumps(profile.to_dict(), sort_keys=True).encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    digest.update(str(CACHE_VERSION).encode())
+    # Position limits come with the profile; the velocity and acceleration limits and the validator are global.
+    digest.update(json.dumps([DEFAULT_MAX_VELOCITY, DEFAULT_MAX_ACCELERATION, VALIDATOR_VERSION]).encode())
+    return digest.hexdigest()
+
+
+class SetpointCache:
+    """Size-bounded LRU cache of compiled setpoints, safe for concurrent readers and writers."""
+
+    def __init__(self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory) if directory is not None else cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Motion | None:
+        """Load an entry, marking it as recently used, or return None on a miss."""
+        entry = self._entry(key)
+        try:
+            with np.load(entry) as data:
+                motion = Motion(
+                    joint_names=tuple(data["joint_names"].tolist()),
+                    actuator_ids=data["actuator_ids"],
+                    positions=data["positions"],
+                )
+            os.utime(entry)
+        except (OSError, KeyError, ValueError):
+            # Missing, evicted while loading or unreadable: all count as a miss.
+            return None
+        return motion
+
+    def put(self, key: str, motion: Motion) -> None:
+        """Store an entry atomically and evict old entries beyond the size limit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=TEMP_SUFFIX, delete=False) as f:
+            try:
+                np.savez(
+                    f,
+                    joint_names=np.array(motion.joint_names),
+                    actuator_ids=motion.actuator_ids,
+                    positions=motion.positions,
+                )
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, self._entry(key))
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete the least recently used entries until the cache fits its size limit.
+
+        Temporary files left behind by writers that died are deleted too, once they are stale.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        stale = time.time() - STALE_TEMP_SECONDS
+        for temp in self.directory.glob(f"*{TEMP_SUFFIX}"):
+            try:
+                if temp.stat().st_mtime < stale:
+                    temp.unlink()
+            except FileNotFoundError:
+                continue
+
+        entries = []
+        for entry in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # Readers that already opened the entry keep reading it after the unlink.
+            entry.unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        if deleted:
+            logger.debug("Evicted %d cached setpoint arrays", deleted)
+        return deleted
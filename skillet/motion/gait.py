@@ -0,0 +1,225 @@
+"""Procedural walking gait over the ten leg actuators.
+
+One gait cycle (a step with each leg) is solved once with the leg kinematics and
+kept as a lookup table. A walk is one continuous stream through `Player`: a
+transition from the measured pose into the gait, rows of the table, and a
+transition back to standing, so the control rate never restarts between steps and
+a step tick costs one table index. The table is split into two steps, and the
+number of remaining steps and the walking speed are read again before each step,
+so both can change while the robot walks.
+"""
+
+# Standard library imports
+import logging
+from dataclasses import dataclass
+from typing import Iterator
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Local imports
+from skillet.motion.keyframes import Motion
+from skillet.motion.kinematics import ANKLE, HIP, KNEE, LegGeometry, inverse_kinematics
+from skillet.motion.player import CONTROL_RATE_HZ, PlaybackStats, Player
+from skillet.motion.pose_index import enter_at, read_pose
+from skillet.motion.validate import JointLimits, Violation, validate_trajectory
+from skillet.setup.setup_id import RobotProfile
+from skillet.watchdog import Watchdog
+
+# Constants
+STEP_LENGTH = 0.04  # Meters a foot travels per step
+STEP_HEIGHT = 0.015  # Meters a swinging foot is lifted
+STEP_PERIOD = 0.6  # Seconds per step, a gait cycle is two steps
+CROUCH = 0.01  # Meters below standing height the pelvis walks at
+HIP_SWAY = 4.0  # Degrees of hip roll that shift the weight onto the stance leg
+TRANSITION_TIME = 1.0  # Seconds to move between standing and the gait
+
+LEG_JOINTS = (
+    "left_hip_yaw",
+    "left_hip_roll",
+    "left_hip_pitch",
+    "left_knee_pitch",
+    "left_ankle_pitch",
+    "right_hip_yaw",
+    "right_hip_roll",
+    "right_hip_pitch",
+    "right_knee_pitch",
+    "right_ankle_pitch",
+)
+YAW, ROLL, PITCH = 0, 1, 2
+LEG_WIDTH = 5
+
+# Sign that maps hip roll towards the left and hip, knee and ankle flexion to each
+# joint. The legs are mirrored, so the right side moves in the opposite direction.
+LEFT_SIGNS = np.array([1.0, 1.0, -1.0, 1.0, 1.0])
+RIGHT_SIGNS = -LEFT_SIGNS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GaitParameters:
+    """Shape of the gait."""
+
+    step_length: float = STEP_LENGTH
+    step_height: float = STEP_HEIGHT
+    step_period: float = STEP_PERIOD
+    crouch: float = CROUCH
+    hip_sway: float = HIP_SWAY
+    transition_time: float = TRANSITION_TIME
+
+
+def _leg_flexion(phase: np.ndarray, params: GaitParameters, geometry: LegGeometry) -> np.ndarray:
+    """Hip, knee and ankle flexion of a leg that swings during the first half of the cycle."""
+    swing = phase < 0.5
+    s = np.where(swing, phase * 2, phase * 2 - 1)
+    length = params.step_length
+
+    # The swinging foot moves forward along a cycloid, so it lifts off and touches down
+    # without velocity. The stance foot moves back under the pelvis at constant speed.
+    foot_x = np.where(swing, -length / 2 + length * (s - np.sin(2 * np.pi * s) / (2 * np.pi)), length / 2 - length * s)
+    foot_z = np.where(swing, params.step_height * (1 - np.cos(2 * np.pi * s)) / 2, 0.0)
+
+    height = geometry.standing_height - params.crouch
+    return inverse_kinematics(np.stack([-foot_x, height - foot_z], axis=-1), geometry=geometry)
+
+
+def _leg_joints(flexion: np.ndarray, roll: np.ndarray, signs: np.ndarray) -> np.ndarray:
+    joints = np.zeros((len(flexion), LEG_WIDTH))
+    joints[:, ROLL] = roll
+    joints[:, PITCH], joints[:, PITCH + 1], joints[:, PITCH + 2] = flexion[:, HIP], flexion[:, KNEE], flexion[:, ANKLE]
+    return joints * signs
+
+
+def gait_cycle(
+    params: GaitParameters = GaitParameters(), rate: float = CONTROL_RATE_HZ, geometry: LegGeometry = LegGeometry()
+) -> np.ndarray:
+    """Solve one gait cycle, starting with the left leg's swing.
+
+    Args:
+        params (GaitParameters): Shape of the gait.
+        rate (float): Samples per second at normal speed.
+        geometry (LegGeometry): Link lengths of the legs.
+
+    Returns:
+        np.ndarray: Joint positions in degrees in `LEG_JOINTS` order, shape `(N, 10)` with an even `N`.
+    """
+    samples = 2 * max(int(round(params.step_period * rate)), 1)
+    phase = np.arange(samples) / samples
+    # Lean away from the swinging leg.
+    roll = -params.hip_sway * np.sin(2 * np.pi * phase)
+    left = _leg_joints(_leg_flexion(phase, params, geometry), roll, LEFT_SIGNS)
+    right = _leg_joints(_leg_flexion((phase + 0.5) % 1.0, params, geometry), roll, RIGHT_SIGNS)
+    return np.concatenate([left, right], axis=1)
+
+
+def standing_pose(params: GaitParameters = GaitParameters(), geometry: LegGeometry = LegGeometry()) -> np.ndarray:
+    """Both feet under the pelvis at the gait's height, in `LEG_JOINTS` order, shape `(10,)`."""
+    flexion = inverse_kinematics(np.array([[0.0, geometry.standing_height - params.crouch]]), geometry=geometry)
+    roll = np.zeros(1)
+    return np.concatenate([_leg_joints(flexion, roll, LEFT_SIGNS), _leg_joints(flexion, roll, RIGHT_SIGNS)], axis=1)[0]
+
+
+class Walker:
+    """Streams a precomputed gait to the leg actuators.
+
+    `steps` and `speed` may be changed from another thread while walking; they take
+    effect at the next step.
+    """
+
+    def __init__(
+        self,
+        kos: pykos.KOS,
+        profile: RobotProfile | None = None,
+        *,
+        params: GaitParameters = GaitParameters(),
+        rate: float = CONTROL_RATE_HZ,
+        geometry: LegGeometry = LegGeometry(),
+        watchdog: Watchdog | None = None,
+    ) -> None:
+        profile = profile or RobotProfile()
+        offsets = np.array([profile.zero_offsets.get(name, 0.0) for name in LEG_JOINTS])
+        self.kos = kos
+        self.actuator_ids = np.array([profile.actuator_ids[name] for name in LEG_JOINTS], dtype=np.int64)
+        self.table = gait_cycle(params, rate, geometry) + offsets
+        self.standing = standing_pose(params, geometry) + offsets
+        self.rate = rate
+        self.params = params
+        self.limits = JointLimits.for_joints(LEG_JOINTS, profile)
+        self.player = Player(kos, self.actuator_ids, rate, watchdog=watchdog)
+        # A walk ends after either step, so both ways back to standing are solved up front.
+        half = len(self.table) // 2
+        self.exits = (self.transition(self.table[0], self.standing), self.transition(self.table[half], self.standing))
+        self.steps = 0
+        self.speed = 1.0
+        self.walked = 0
+
+    def transition(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """Minimum-jerk setpoints from one pose to another."""
+        ticks = max(int(round(self.params.transition_time * self.rate)), 1)
+        tau = np.linspace(0.0, 1.0, ticks + 1)[1:, None]
+        return start + (end - start) * (10 * tau**3 - 15 * tau**4 + 6 * tau**5)
+
+    def read_pose(self) -> np.ndarray:
+        """Current leg positions in `LEG_JOINTS` order, the standing pose for joints that do not report."""
+        legs = Motion(joint_names=LEG_JOINTS, actuator_ids=self.actuator_ids, positions=self.standing[None])
+        return enter_at(legs, read_pose(self.kos, legs), 0).positions[0]
+
+    def validate(self, start: np.ndarray, speed: float) -> Violation | None:
+        """Check the way in from `start`, the gait cycle at a speed, and both ways out against the limits."""
+        period = 1.0 / self.rate
+        half = len(self.table) // 2
+        trajectories = (
+            (np.concatenate([start[None], self.transition(start, self.table[0])]), period),
+            (np.concatenate([self.table, self.table[:1]]), period / speed),
+            (np.concatenate([self.table[:1], self.exits[0]]), period),
+            (np.concatenate([self.table[half : half + 1], self.exits[1]]), period),
+        )
+        for positions, duration in trajectories:
+            violation = validate_trajectory(positions, duration, self.limits, LEG_JOINTS)
+            if violation is not None:
+                return violation
+        return None
+
+    def setpoints(self, entry: np.ndarray) -> Iterator[np.ndarray]:
+        """Yield the setpoints of a walk, deciding on each step just before it starts."""
+        yield from entry
+        half = len(self.table) // 2
+        step = 0
+        while step < self.steps:
+            base = step % 2 * half
+            ticks = max(int(round(half / self.speed)), 1)
+            for tick in range(ticks):
+                yield self.table[base + tick * half // ticks]
+            step += 1
+            self.walked = step
+        # Come back to standing from the row where the next step would begin.
+        yield from self.exits[step % 2]
+
+    def walk(self, steps: int, speed: float = 1.0) -> PlaybackStats:
+        """Walk a number of steps from the current pose and come back to standing.
+
+        Args:
+            steps (int): Number of steps, alternating between the legs.
+            speed (float): Cadence relative to the gait's step period.
+
+        Returns:
+            PlaybackStats: Counters of the walk.
+
+        Raises:
+            ValueError: If the transitions or the gait at this speed exceed the joint limits.
+        """
+        start = self.read_pose()
+        violation = self.validate(start, speed)
+        if violation is not None:
+            raise ValueError(f"Refusing to walk at speed {speed:.2f}: {violation}")
+
+        self.steps, self.speed, self.walked = steps, speed, 0
+        stats = self.player.play(self.setpoints(self.transition(start, self.table[0])))
+        logger.info("Walked %d steps", self.walked)
+        return stats
+
+    def stop(self) -> None:
+        """End the walk after the current step."""
+        self.steps = 0
@@ -0,0 +1,160 @@
+"""Closes and opens the grippers while sensing contact through actuator torque.
+
+The gripper target advances at a fixed rate, and every tick reads the state of
+all grippers in one batched call. A gripper stops as soon as its torque crosses
+the contact threshold and then holds a little past the contact position, so the
+time to grasp depends on the size of the object rather than a worst-case move.
+"""
+
+# Standard library imports
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Local imports
+from skillet.setup.setup_id import RobotProfile
+from skillet.watchdog import Watchdog
+
+# Constants
+OPEN_POSITION = 0.0  # Degrees
+CLOSED_POSITION = 35.0  # Degrees, fully closed without an object
+CLOSE_RATE = 30.0  # Degrees per second
+CONTROL_RATE_HZ = 50.0
+CONTACT_TORQUE = 1.5  # Torque magnitude that counts as touching an object
+SQUEEZE = 2.0  # Degrees past the contact position held to keep the grip
+GRIPPER_KP = 32.0
+GRIPPER_MAX_TORQUE = 40.0  # Limits the force on the object
+
+GRIPPER_JOINTS = ("right_gripper",)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GraspResult:
+    """Outcome of closing or opening the grippers."""
+
+    grasped: bool
+    positions: np.ndarray  # Final target of each gripper in degrees
+    torques: np.ndarray  # Last measured torque of each gripper
+    elapsed: float  # Seconds
+
+    def __str__(self) -> str:
+        state = "grasped" if self.grasped else "no contact"
+        return f"{state} after {self.elapsed:.2f} s at {np.round(self.positions, 1).tolist()} degrees"
+
+
+class Gripper:
+    """Torque-sensing control of one or more grippers."""
+
+    def __init__(
+        self,
+        kos: pykos.KOS,
+        profile: RobotProfile | None = None,
+        *,
+        joints: tuple[str, ...] = GRIPPER_JOINTS,
+        open_position: float = OPEN_POSITION,
+        closed_position: float = CLOSED_POSITION,
+        rate: float = CLOSE_RATE,
+        contact_torque: float = CONTACT_TORQUE,
+        control_rate: float = CONTROL_RATE_HZ,
+        watchdog: Watchdog | None = None,
+    ) -> None:
+        profile = profile or RobotProfile()
+        self.kos = kos
+        self.joints = joints
+        self.actuator_ids = [profile.actuator_ids[joint] for joint in joints]
+        self.offsets = np.array([profile.zero_offsets.get(joint, 0.0) for joint in joints])
+        self.open_position = open_position
+        self.closed_position = closed_position
+        self.rate = rate
+        self.contact_torque = contact_torque
+        self.control_rate = control_rate
+        self.watchdog = watchdog
+
+    def configure(self) -> bool:
+        """Enable torque on the grippers with a limited maximum torque."""
+        success = True
+        for actuator_id in self.actuator_ids:
+            result = self.kos.actuator.configure_actuator(
+                actuator_id=actuator_id,
+                kp=GRIPPER_KP,
+                kd=32.0,
+                ki=0.0,
+                max_torque=GRIPPER_MAX_TORQUE,
+                torque_enabled=True,
+            )
+            if not result.success:
+                logger.error("Failed to configure gripper %d: %s", actuator_id, result.error)
+                success = False
+        return success
+
+    def close(self) -> GraspResult:
+        """Close until contact or until fully closed, and report whether an object was grasped."""
+        result = self._move(self.closed_position, stop_on_contact=True)
+        logger.info("Gripper closed: %s", result)
+        return result
+
+    def open(self) -> GraspResult:
+        """Open fully, releasing any object."""
+        result = self._move(self.open_position, stop_on_contact=False)
+        logger.info("Gripper opened after %.2f s", result.elapsed)
+        return result
+
+    def _read(self) -> tuple[np.ndarray, np.ndarray]:
+        response = self.kos.actuator.get_actuators_state(self.actuator_ids)
+        states = {state.actuator_id: state for state in response.states}
+        positions = np.array([states[actuator_id].position for actuator_id in self.actuator_ids]) - self.offsets
+        torques = np.array([states[actuator_id].torque for actuator_id in self.actuator_ids])
+        return positions, torques
+
+    def _command(self, targets: np.ndarray) -> None:
+        self.kos.actuator.command_actuators(
+            [
+                {"actuator_id": actuator_id, "position": position}
+                for actuator_id, position in zip(self.actuator_ids, (targets + self.offsets).tolist())
+            ]
+        )
+
+    def _move(self, goal: float, stop_on_contact: bool) -> GraspResult:
+        start = time.perf_counter()
+        targets, torques = self._read()
+        direction = np.sign(goal - targets)
+        step = self.rate / self.control_rate
+        period = 1.0 / self.control_rate
+        moving = direction != 0
+        contact = np.zeros(len(targets), dtype=bool)
+
+        with self.watchdog.armed() if self.watchdog is not None else nullcontext():
+            tick = 0
+            while moving.any():
+                targets = np.where(moving, targets + direction * step, targets)
+                reached = moving & (direction * (goal - targets) <= 0)
+                targets[reached] = goal
+                self._command(targets)
+
+                tick += 1
+                delay = start + tick * period - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                positions, torques = self._read()
+                if self.watchdog is not None:
+                    self.watchdog.heartbeat()
+
+                if stop_on_contact:
+                    touching = moving & (np.abs(torques) >= self.contact_torque)
+                    if touching.any():
+                        # Hold slightly past where contact was sensed, to keep squeezing the object.
+                        targets[touching] = positions[touching] + direction[touching] * SQUEEZE
+                        self._command(targets)
+                        contact |= touching
+                moving &= ~(reached | contact)
+
+        return GraspResult(
+            grasped=bool(contact.any()), positions=targets, torques=torques, elapsed=time.perf_counter() - start
+        )
@@ -0,0 +1,100 @@
+"""Loads keyframe files and compiles them into calibrated motions."""
+
+# Standard library imports
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.setup.setup_id import RobotProfile
+
+Keyframe = dict[str, dict[str, float]]
+
+
+@dataclass(frozen=True)
+class Motion:
+    """A keyframe sequence with a robot's calibration already applied.
+
+    Attributes:
+        joint_names: Names of the joints driven by the motion.
+        actuator_ids: Actuator ID of each joint, shape `(J,)`.
+        positions: Calibrated target positions in degrees, shape `(F, J)`.
+    """
+
+    joint_names: tuple[str, ...]
+    actuator_ids: np.ndarray
+    positions: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def commands(self, frame: int) -> list[dict[str, float]]:
+        """Batched actuator commands for a single frame."""
+        return [
+            {"actuator_id": actuator_id, "position": position}
+            for actuator_id, position in zip(self.actuator_ids.tolist(), self.positions[frame].tolist())
+        ]
+
+    def position_dict(self, frame: int) -> Keyframe:
+        """A single frame in the keyframe file format."""
+        return {
+            name: {"id": actuator_id, "position": position}
+            for name, actuator_id, position in zip(
+                self.joint_names, self.actuator_ids.tolist(), self.positions[frame].tolist()
+            )
+        }
+
+
+def load_keyframes(path: str | Path) -> list[Keyframe]:
+    """Read a keyframe file as written by `print_joint_states`."""
+    with open(path, "r", encoding="utf-8") as f:
+        keyframes = json.load(f)
+    return [keyframes] if isinstance(keyframes, dict) else keyframes
+
+
+def compile_motion(keyframes: list[Keyframe], profile: RobotProfile | None = None) -> Motion:
+    """Compile keyframes into a motion for a specific robot.
+
+    Actuator IDs come from the profile rather than the file, the profile's zero
+    offsets are added to every target, and joints missing from a frame hold their
+    previous position.
+
+    Args:
+        keyframes (list[Keyframe]): Frames mapping joint names to their targets.
+        profile (RobotProfile | None): Calibration of the target robot.
+
+    Returns:
+        Motion: The compiled motion.
+
+    Raises:
+        ValueError: If a joint is unknown or has no position in the first frame.
+    """
+    profile = profile or RobotProfile()
+    actuator_map = profile.actuator_ids
+
+    joint_names = list(dict.fromkeys(name for frame in keyframes for name in frame))
+    unknown = [name for name in joint_names if name not in actuator_map]
+    if unknown:
+        raise ValueError(f"Unknown joints in motion: {', '.join(unknown)}")
+
+    columns = {name: i for i, name in enumerate(joint_names)}
+    positions = np.full((len(keyframes), len(joint_names)), np.nan)
+    for row, frame in enumerate(keyframes):
+        for name, data in frame.items():
+            positions[row, columns[name]] = data["position"]
+
+    if len(keyframes) and np.isnan(positions[0]).any():
+        missing = [name for name, value in zip(joint_names, positions[0]) if np.isnan(value)]
+        raise ValueError(f"Joints missing from the first frame: {', '.join(missing)}")
+
+    # Forward-fill joints that are absent from later frames.
+    valid = ~np.isnan(positions)
+    source_rows = np.maximum.accumulate(np.where(valid, np.arange(len(keyframes))[:, None], 0), axis=0)
+    positions = positions[source_rows, np.arange(len(joint_names))]
+
+    positions += np.array([profile.zero_offsets.get(name, 0.0) for name in joint_names])
+    actuator_ids = np.array([actuator_map[name] for name in joint_names], dtype=np.int64)
+    return Motion(joint_names=tuple(joint_names), actuator_ids=actuator_ids, positions=positions)
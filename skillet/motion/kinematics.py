@@ -0,0 +1,192 @@
+"""Planar kinematics of the hip, knee and ankle pitch chain of the legs.
+
+With the foot flat on the ground, each leg is a two-link chain from the ankle to
+the hip. Angles are flexions in degrees: the hip flexes the thigh forward of the
+torso, the knee bends the shank back from the thigh and the ankle tilts the
+shank forward over the foot. The pelvis position is `(x, z)` in meters relative
+to the ankle, with `x` pointing forward. Both directions are vectorized over any
+number of leading dimensions, so whole trajectories are solved at once.
+"""
+
+# Standard library imports
+import logging
+from dataclasses import dataclass
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.motion.keyframes import Motion
+from skillet.motion.player import CONTROL_RATE_HZ
+from skillet.setup.setup_id import RobotProfile
+
+# Constants
+THIGH_LENGTH = 0.11  # Meters from hip to knee pitch axis
+SHANK_LENGTH = 0.11  # Meters from knee to ankle pitch axis
+MAX_KNEE_FLEXION = 160.0  # Degrees, deepest recorded squat
+STANDING_KNEE_FLEXION = 20.0  # Degrees, knees slightly bent to stay away from the singularity
+
+HIP, KNEE, ANKLE = 0, 1, 2
+
+# Joint order of `to_joint_positions`, and the sign that maps flexion to each joint.
+# The legs are mirrored, so the right side moves in the opposite direction.
+LEG_PITCH_JOINTS = (
+    "left_hip_pitch",
+    "left_knee_pitch",
+    "left_ankle_pitch",
+    "right_hip_pitch",
+    "right_knee_pitch",
+    "right_ankle_pitch",
+)
+LEG_PITCH_SIGNS = np.array([-1.0, 1.0, 1.0, 1.0, -1.0, -1.0])
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LegGeometry:
+    """Link lengths and knee range of a leg."""
+
+    thigh: float = THIGH_LENGTH
+    shank: float = SHANK_LENGTH
+    max_knee_flexion: float = MAX_KNEE_FLEXION
+
+    @property
+    def standing_height(self) -> float:
+        """Pelvis height above the ankle when standing upright."""
+        knee = np.radians(STANDING_KNEE_FLEXION)
+        return float(np.sqrt(self.thigh**2 + self.shank**2 + 2 * self.thigh * self.shank * np.cos(knee)))
+
+
+def forward_kinematics(flexion: np.ndarray, geometry: LegGeometry = LegGeometry()) -> np.ndarray:
+    """Compute the pelvis pose of a leg from its joint flexions.
+
+    Args:
+        flexion (np.ndarray): Hip, knee and ankle flexion in degrees, shape `(..., 3)`.
+        geometry (LegGeometry): Link lengths of the leg.
+
+    Returns:
+        np.ndarray: Pelvis `x` and `z` in meters and torso pitch in degrees, shape `(..., 3)`.
+    """
+    flexion = np.asarray(flexion, dtype=float)
+    ankle = np.radians(flexion[..., ANKLE])
+    thigh = ankle - np.radians(flexion[..., KNEE])
+    x = geometry.shank * np.sin(ankle) + geometry.thigh * np.sin(thigh)
+    z = geometry.shank * np.cos(ankle) + geometry.thigh * np.cos(thigh)
+    torso_pitch = flexion[..., HIP] + np.degrees(thigh)
+    return np.stack([x, z, torso_pitch], axis=-1)
+
+
+def inverse_kinematics(
+    pelvis: np.ndarray, torso_pitch: float | np.ndarray = 0.0, geometry: LegGeometry = LegGeometry()
+) -> np.ndarray:
+    """Compute the joint flexions that put the pelvis at the given positions.
+
+    Args:
+        pelvis (np.ndarray): Pelvis `x` and `z` in meters relative to the ankle, shape `(..., 2)`.
+        torso_pitch (float | np.ndarray): Forward lean of the torso in degrees, broadcast against the targets.
+        geometry (LegGeometry): Link lengths of the leg.
+
+    Returns:
+        np.ndarray: Hip, knee and ankle flexion in degrees, shape `(..., 3)`.
+
+    Raises:
+        ValueError: If any target is out of reach or needs more knee flexion than allowed.
+    """
+    pelvis = np.asarray(pelvis, dtype=float)
+    x, z = pelvis[..., 0], pelvis[..., 1]
+    thigh, shank = geometry.thigh, geometry.shank
+    distance_squared = x**2 + z**2
+    distance = np.sqrt(distance_squared)
+
+    cos_inner = (thigh**2 + shank**2 - distance_squared) / (2 * thigh * shank)
+    knee = 180.0 - np.degrees(np.arccos(np.clip(cos_inner, -1.0, 1.0)))
+    unreachable = (np.abs(cos_inner) > 1.0) | (knee > geometry.max_knee_flexion)
+    if unreachable.any():
+        raise ValueError(f"{int(unreachable.sum())} of {unreachable.size} pelvis targets are out of reach")
+
+    # The knee sits in front of the ankle-to-hip line.
+    cos_ankle = (shank**2 + distance_squared - thigh**2) / (2 * shank * np.maximum(distance, 1e-12))
+    ankle = np.degrees(np.arctan2(x, z) + np.arccos(np.clip(cos_ankle, -1.0, 1.0)))
+    hip = torso_pitch + knee - ankle
+    return np.stack(np.broadcast_arrays(hip, knee, ankle), axis=-1)
+
+
+def to_joint_positions(flexion: np.ndarray) -> np.ndarray:
+    """Map the flexions of a leg to positions of both legs' pitch joints in `LEG_PITCH_JOINTS` order.
+
+    Args:
+        flexion (np.ndarray): Hip, knee and ankle flexion in degrees, shape `(..., 3)`.
+
+    Returns:
+        np.ndarray: Joint positions in degrees, shape `(..., 6)`.
+    """
+    flexion = np.asarray(flexion, dtype=float)
+    return np.concatenate([flexion, flexion], axis=-1) * LEG_PITCH_SIGNS
+
+
+def from_joint_positions(positions: np.ndarray) -> np.ndarray:
+    """Map pitch joint positions in `LEG_PITCH_JOINTS` order to the flexions of each leg.
+
+    Args:
+        positions (np.ndarray): Joint positions in degrees, shape `(..., 6)`.
+
+    Returns:
+        np.ndarray: Hip, knee and ankle flexion of the left and right leg, shape `(..., 2, 3)`.
+    """
+    flexion = np.asarray(positions, dtype=float) * LEG_PITCH_SIGNS
+    return flexion.reshape(*flexion.shape[:-1], 2, 3)
+
+
+def squat_trajectory(
+    depth: float,
+    duration: float,
+    rate: float = CONTROL_RATE_HZ,
+    *,
+    hold: float = 0.0,
+    torso_pitch: float = 0.0,
+    geometry: LegGeometry = LegGeometry(),
+) -> np.ndarray:
+    """Sample a squat that lowers the pelvis straight down and back up.
+
+    The pelvis height follows a minimum-jerk profile down and up, so velocity and
+    acceleration are zero at the top and at the bottom.
+
+    Args:
+        depth (float): How far the pelvis drops below standing height, in meters.
+        duration (float): Seconds to go down and back up, excluding the hold.
+        rate (float): Sample rate in Hz.
+        hold (float): Seconds to stay at the bottom.
+        torso_pitch (float): Forward lean of the torso in degrees.
+        geometry (LegGeometry): Link lengths of the legs.
+
+    Returns:
+        np.ndarray: Hip, knee and ankle flexion in degrees, shape `(N, 3)`.
+
+    Raises:
+        ValueError: If the squat is deeper than the legs can reach.
+    """
+    half = int(round(duration / 2 * rate))
+    tau = np.linspace(0.0, 1.0, half + 1)
+    down = 10 * tau**3 - 15 * tau**4 + 6 * tau**5
+    progress = np.concatenate([down, np.ones(int(round(hold * rate))), down[::-1]])
+    height = geometry.standing_height - depth * progress
+    return inverse_kinematics(np.stack([np.zeros_like(height), height], axis=-1), torso_pitch, geometry)
+
+
+def leg_motion(flexion: np.ndarray, profile: RobotProfile | None = None) -> Motion:
+    """Turn sampled leg flexions into a motion of both legs' pitch joints for a specific robot.
+
+    Args:
+        flexion (np.ndarray): Hip, knee and ankle flexion in degrees, shape `(N, 3)`.
+        profile (RobotProfile | None): Calibration of the target robot.
+
+    Returns:
+        Motion: One frame per sample, ready to stream with `Player`.
+    """
+    profile = profile or RobotProfile()
+    offsets = np.array([profile.zero_offsets.get(name, 0.0) for name in LEG_PITCH_JOINTS])
+    actuator_ids = np.array([profile.actuator_ids[name] for name in LEG_PITCH_JOINTS], dtype=np.int64)
+    return Motion(
+        joint_names=LEG_PITCH_JOINTS, actuator_ids=actuator_ids, positions=to_joint_positions(flexion) + offsets
+    )
@@ -0,0 +1,140 @@
+"""Streams setpoints to the actuators at a fixed control rate."""
+
+# Standard library imports
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Sequence
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Local imports
+from skillet.motion.validate import JointLimits
+from skillet.watchdog import Watchdog
+
+# Constants
+CONTROL_RATE_HZ = 50.0
+CLAMP_TOLERANCE = 1e-6  # Degrees; smaller adjustments are rounding, not clamping
+
+logger = logging.getLogger(__name__)
+
+# Adjusts a setpoint of shape `(J,)` just before it is commanded.
+SetpointFilter = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class PlaybackStats:
+    """Timing and error counters of a playback run."""
+
+    ticks: int = 0
+    late_ticks: int = 0
+    max_lateness: float = 0.0
+    failed_commands: int = 0
+    skipped_filters: int = 0
+    clamped_ticks: int = 0
+    command_times: np.ndarray = field(default_factory=lambda: np.empty(0))
+    commanded: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+
+
+class Player:
+    """Sends one batched `command_actuators` call per control tick.
+
+    Ticks are scheduled against absolute deadlines, so a slow call delays the next
+    tick but does not shift the rest of the motion. Setpoint filters run on every
+    tick before the command, except on ticks that are already running late. With
+    joint limits, every command is clamped to the position limits and to the
+    velocity limits relative to the previous command, so filters cannot push the
+    robot past limits the unfiltered setpoints were validated against. With a
+    watchdog, every tick is a heartbeat and a stalled loop trips it.
+    """
+
+    def __init__(
+        self,
+        kos: pykos.KOS,
+        actuator_ids: np.ndarray,
+        rate: float = CONTROL_RATE_HZ,
+        *,
+        filters: Sequence[SetpointFilter] = (),
+        watchdog: Watchdog | None = None,
+        limits: JointLimits | None = None,
+    ) -> None:
+        self.kos = kos
+        self.actuator_ids = [int(actuator_id) for actuator_id in actuator_ids]
+        self.rate = rate
+        self.filters = list(filters)
+        self.watchdog = watchdog
+        self.limits = limits
+
+    def command(self, setpoint: np.ndarray) -> int:
+        """Send a single setpoint, returning the number of actuators that rejected it."""
+        commands = [
+            {"actuator_id": actuator_id, "position": position}
+            for actuator_id, position in zip(self.actuator_ids, setpoint.tolist())
+        ]
+        result = self.kos.actuator.command_actuators(commands)
+        return sum(not command_result.success for command_result in result.results)
+
+    def clamp(self, setpoint: np.ndarray, previous: np.ndarray | None) -> np.ndarray:
+        """Limit a setpoint to the joint limits and, after the first tick, to the velocity limits."""
+        if self.limits is None:
+            return setpoint
+        if previous is not None:
+            max_step = self.limits.max_velocity / self.rate
+            setpoint = np.clip(setpoint, previous - max_step, previous + max_step)
+        return np.clip(setpoint, self.limits.lower, self.limits.upper)
+
+    def play(self, setpoints: Iterable[np.ndarray]) -> PlaybackStats:
+        """Stream setpoints, one row per control tick.
+
+        Args:
+            setpoints (Iterable[np.ndarray]): Positions in degrees, an array of shape `(N, J)` or
+                any iterable of `(J,)` rows, such as a generator that produces them while playing.
+
+        Returns:
+            PlaybackStats: Timing and error counters of the run, and the `time.perf_counter()`
+            send time and value of every command.
+        """
+        stats = PlaybackStats()
+        command_times: list[float] = []
+        commanded: list[np.ndarray] = []
+        period = 1.0 / self.rate
+        start = time.perf_counter()
+
+        with self.watchdog.armed() if self.watchdog is not None else nullcontext():
+            for tick, setpoint in enumerate(setpoints):
+                lateness = time.perf_counter() - (start + tick * period)
+                if lateness < 0:
+                    time.sleep(-lateness)
+                elif lateness > period:
+                    stats.late_ticks += 1
+                stats.max_lateness = max(stats.max_lateness, lateness)
+
+                if self.filters and lateness > period / 2:
+                    stats.skipped_filters += 1
+                else:
+                    for setpoint_filter in self.filters:
+                        setpoint = setpoint_filter(setpoint)
+                if self.limits is not None:
+                    clamped = self.clamp(setpoint, commanded[-1] if commanded else None)
+                    stats.clamped_ticks += not np.allclose(clamped, setpoint, rtol=0.0, atol=CLAMP_TOLERANCE)
+                    setpoint = clamped
+
+                command_times.append(time.perf_counter())
+                commanded.append(setpoint)
+                stats.failed_commands += self.command(setpoint)
+                stats.ticks += 1
+                if self.watchdog is not None:
+                    self.watchdog.heartbeat()
+
+        stats.command_times = np.array(command_times)
+        stats.commanded = np.array(commanded) if commanded else np.empty((0, len(self.actuator_ids)))
+        if stats.clamped_ticks:
+            logger.warning("Clamped %d of %d setpoints to the joint limits", stats.clamped_ticks, stats.ticks)
+        if stats.late_ticks:
+            logger.warning(
+                "%d of %d ticks ran late (max %.1f ms)", stats.late_ticks, stats.ticks, stats.max_lateness * 1000
+            )
+        return stats
@@ -0,0 +1,144 @@
+"""Retimes keyframe paths under per-joint velocity and acceleration limits.
+
+Each segment between two keyframes is played with a synchronized trapezoidal
+velocity profile: every joint follows the same normalized profile, scaled by its
+own displacement, and the profile is the shortest one that keeps the most
+constrained joint within its limits. The robot comes to rest at every keyframe,
+so the path between keyframes is exactly the straight line the keyframes imply.
+"""
+
+# Standard library imports
+import logging
+from dataclasses import dataclass
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.motion.validate import JointLimits
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """Timing of a keyframe path.
+
+    Attributes:
+        durations: Duration of each segment in seconds, shape `(F - 1,)`.
+        blends: Acceleration time at either end of each segment, shape `(F - 1,)`.
+    """
+
+    durations: np.ndarray
+    blends: np.ndarray
+
+    @property
+    def times(self) -> np.ndarray:
+        """Time at which each keyframe is reached, shape `(F,)`."""
+        return np.concatenate(([0.0], np.cumsum(self.durations)))
+
+    @property
+    def total_time(self) -> float:
+        return float(self.durations.sum())
+
+    def progress(self, t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Map times to segment indices and normalized progress along each segment.
+
+        Args:
+            t (np.ndarray): Times in seconds since the start of the path.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Segment index and progress in `[0, 1]` of each time.
+        """
+        times = self.times
+        segment = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(self.durations) - 1)
+        duration = self.durations[segment]
+        blend = self.blends[segment]
+        tau = np.clip(t - times[segment], 0.0, duration)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            peak_velocity = 1.0 / (duration - blend)
+            acceleration = peak_velocity / blend
+            s = np.where(
+                tau < blend,
+                0.5 * acceleration * tau**2,
+                np.where(
+                    tau <= duration - blend,
+                    peak_velocity * (tau - blend / 2),
+                    1.0 - 0.5 * acceleration * (duration - tau) ** 2,
+                ),
+            )
+        return segment, np.where(duration > 0, s, 1.0)
+
+    def sample(self, positions: np.ndarray, rate: float) -> np.ndarray:
+        """Sample setpoints along the path at a fixed rate.
+
+        Args:
+            positions (np.ndarray): Keyframe positions, shape `(F, J)`.
+            rate (float): Sample rate in Hz.
+
+        Returns:
+            np.ndarray: Setpoints, shape `(N, J)`, ending exactly on the last keyframe.
+        """
+        if len(positions) < 2:
+            return positions.copy()
+        t = np.append(np.arange(0.0, self.total_time, 1.0 / rate), self.total_time)
+        segment, s = self.progress(t)
+        return positions[segment] + s[:, None] * (positions[segment + 1] - positions[segment])
+
+
+def retime(
+    positions: np.ndarray,
+    limits: JointLimits,
+    nominal_durations: float | np.ndarray | None = None,
+    speed: float = 1.0,
+) -> Schedule:
+    """Compute the fastest schedule for a keyframe path that respects joint limits.
+
+    Without nominal durations the path runs as fast as the limits allow, with the
+    limits scaled down by `speed` if it is below one. With nominal durations, e.g.
+    the fixed interval the keyframes were recorded for, the path runs `speed` times
+    faster than nominal, but no segment is shortened beyond what the limits allow.
+
+    Args:
+        positions (np.ndarray): Keyframe positions in degrees, shape `(F, J)`.
+        limits (JointLimits): Velocity and acceleration limits of each joint.
+        nominal_durations (float | np.ndarray | None): Nominal seconds per segment, scalar or shape `(F - 1,)`.
+        speed (float): Speed factor relative to nominal, or to the limits if there is no nominal timing.
+
+    Returns:
+        Schedule: Duration and blend time of every segment.
+
+    Raises:
+        ValueError: If `speed` is not positive.
+    """
+    if speed <= 0:
+        raise ValueError(f"Speed factor must be positive, got {speed}")
+
+    max_velocity, max_acceleration = limits.max_velocity, limits.max_acceleration
+    if nominal_durations is None and speed != 1.0:
+        if speed > 1.0:
+            logger.warning("Speed factor %.2f exceeds joint limits, clamping to 1.0", speed)
+        scale = min(speed, 1.0)
+        max_velocity, max_acceleration = max_velocity * scale, max_acceleration * scale**2
+
+    # Per segment, the time the most constrained joint needs at full velocity and acceleration.
+    displacement = np.abs(np.diff(positions, axis=0))
+    velocity_time = (displacement / max_velocity).max(axis=1, initial=0.0)
+    acceleration_time = (displacement / max_acceleration).max(axis=1, initial=0.0)
+
+    # Triangular profile if the velocity limit is never reached, trapezoidal otherwise.
+    triangular = np.sqrt(acceleration_time) >= velocity_time
+    with np.errstate(divide="ignore", invalid="ignore"):
+        durations = np.where(
+            triangular, 2 * np.sqrt(acceleration_time), velocity_time + acceleration_time / velocity_time
+        )
+
+    if nominal_durations is not None:
+        nominal = np.broadcast_to(np.asarray(nominal_durations, dtype=float), durations.shape) / speed
+        durations = np.maximum(durations, nominal)
+
+    # The acceleration limit requires b (T - b) >= acceleration_time for blend time b. Its
+    # smallest solution gives the longest cruise and so the lowest peak velocity.
+    blends = (durations - np.sqrt(np.maximum(durations**2 - 4 * acceleration_time, 0.0))) / 2
+    return Schedule(durations=durations, blends=blends)
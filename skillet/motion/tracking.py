@@ -0,0 +1,386 @@
+"""Compares commanded and measured joint trajectories.
+
+Both trajectories are resampled onto a common uniform grid (commands as a
+zero-order hold, telemetry linearly), after which every metric is computed with
+whole-array NumPy operations, so hour-long recordings take seconds.
+
+Step responses are analyzed per move of the command: a run over which a joint's
+command keeps moving in one direction. Retimed trajectories come to rest at
+every keyframe, so each keyframe ends a move even though no setpoint is ever
+held. The response to a move is measured from its arrival until the next one,
+against the command delayed by the joint's lag.
+"""
+
+# Standard library imports
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Constants
+ANALYSIS_RATE_HZ = 100.0
+TELEMETRY_RATE_HZ = 50.0
+MAX_LAG = 0.5  # Seconds
+SETTLE_BAND = 1.0  # Degrees from the target that count as settled
+MIN_STEP = 2.0  # Degrees, smaller moves are not analyzed as steps
+MIN_SEGMENT = 0.1  # Seconds from one arrival to the next for a move to be analyzed as a step
+STILL = 1e-6  # Degrees, smaller changes between commands count as standing still
+
+# Thresholds for flagging mistuned gains.
+OVERSHOOT_LIMIT = 0.2  # Fraction of the step
+LAG_LIMIT = 0.15  # Seconds
+STEADY_STATE_LIMIT = 1.5  # Degrees
+UNSETTLED_LIMIT = 0.5  # Fraction of steps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JointTracking:
+    """Tracking metrics of a single joint."""
+
+    joint: str
+    rms_error: float
+    max_error: float
+    lag: float
+    overshoot: float
+    settling_time: float
+    steady_state_error: float
+    steps: int
+    unsettled: float
+    flags: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.joint:<20} rms {self.rms_error:6.2f}  max {self.max_error:6.2f}  lag {self.lag * 1000:5.0f} ms  "
+            f"overshoot {self.overshoot * 100:5.1f}%  settle {self.settling_time:5.2f} s  "
+            f"steady {self.steady_state_error:5.2f}  {'; '.join(self.flags)}"
+        )
+
+
+@dataclass
+class StepResponse:
+    """Step response metrics of a single joint, averaged over its steps."""
+
+    overshoot: float = 0.0
+    settling_time: float = 0.0
+    steady_state_error: float = 0.0
+    steps: int = 0
+    unsettled: float = 0.0
+
+
+def resample(times: np.ndarray, values: np.ndarray, grid: np.ndarray, hold: bool = False) -> np.ndarray:
+    """Resample a trajectory onto a time grid.
+
+    Args:
+        times (np.ndarray): Sample times, increasing, shape `(N,)`.
+        values (np.ndarray): Samples, shape `(N, J)`.
+        grid (np.ndarray): Times to resample at, shape `(K,)`.
+        hold (bool): Hold each value until the next sample instead of interpolating.
+
+    Returns:
+        np.ndarray: Resampled values, shape `(K, J)`.
+    """
+    if hold or len(times) == 1:
+        return values[np.maximum(np.searchsorted(times, grid, side="right") - 1, 0)]
+    index = np.clip(np.searchsorted(times, grid, side="right"), 1, len(times) - 1)
+    t0, t1 = times[index - 1], times[index]
+    weight = np.clip((grid - t0) / (t1 - t0), 0.0, 1.0)[:, None]
+    return values[index - 1] * (1 - weight) + values[index] * weight
+
+
+def estimate_lag(commanded: np.ndarray, measured: np.ndarray, rate: float, max_lag: float = MAX_LAG) -> np.ndarray:
+    """Estimate how far each measured joint trails its command.
+
+    Uses the FFT cross-correlation of the velocities, restricted to non-negative lags.
+
+    Args:
+        commanded (np.ndarray): Commanded positions on a uniform grid, shape `(K, J)`.
+        measured (np.ndarray): Measured positions on the same grid, shape `(K, J)`.
+        rate (float): Grid rate in Hz.
+        max_lag (float): Largest lag considered, in seconds.
+
+    Returns:
+        np.ndarray: Lag of each joint in seconds, shape `(J,)`, zero if there are too few samples to tell.
+    """
+    if len(commanded) < 2:
+        return np.zeros(commanded.shape[1])
+    command_velocity = np.diff(commanded, axis=0)
+    measured_velocity = np.diff(measured, axis=0)
+    size = 1 << int(np.ceil(np.log2(2 * len(command_velocity) + 1)))
+    spectrum = np.conj(np.fft.rfft(command_velocity, size, axis=0)) * np.fft.rfft(measured_velocity, size, axis=0)
+    correlation = np.fft.irfft(spectrum, size, axis=0)[: int(max_lag * rate) + 1]
+    return np.argmax(correlation, axis=0) / rate
+
+
+def analyze_tracking(
+    command_times: np.ndarray,
+    commanded: np.ndarray,
+    telemetry_times: np.ndarray,
+    measured: np.ndarray,
+    joint_names: tuple[str, ...],
+    *,
+    rate: float = ANALYSIS_RATE_HZ,
+) -> list[JointTracking]:
+    """Compute per-joint tracking metrics and flag joints whose gains look mistuned.
+
+    Args:
+        command_times (np.ndarray): Send time of each command, shape `(N,)`.
+        commanded (np.ndarray): Commanded positions in degrees, shape `(N, J)`.
+        telemetry_times (np.ndarray): Time of each state reading, shape `(M,)`.
+        measured (np.ndarray): Measured positions in degrees, shape `(M, J)`.
+        joint_names (tuple[str, ...]): Name of each joint.
+        rate (float): Rate of the common analysis grid in Hz.
+
+    Returns:
+        list[JointTracking]: Metrics of every joint.
+
+    Raises:
+        ValueError: If the commands and the telemetry do not overlap in time.
+    """
+    valid = ~np.isnan(measured).any(axis=1)
+    telemetry_times, measured = telemetry_times[valid], measured[valid]
+    if not len(command_times) or not len(telemetry_times):
+        raise ValueError("No commands or no valid telemetry to analyze")
+
+    start = max(command_times[0], telemetry_times[0])
+    end = min(command_times[-1], telemetry_times[-1])
+    grid = np.arange(start, end, 1.0 / rate)
+    if len(grid) < 2:
+        raise ValueError("Commands and telemetry do not overlap in time")
+    command = resample(command_times, commanded, grid, hold=True)
+    actual = resample(telemetry_times, measured, grid)
+    error = actual - command
+
+    rms_error = np.sqrt(np.mean(error**2, axis=0))
+    max_error = np.abs(error).max(axis=0)
+    lag = estimate_lag(command, actual, rate)
+
+    results = []
+    for j, joint in enumerate(joint_names):
+        arrivals, steps = _moves(command_times, commanded[:, j], grid)
+        response = _step_response(
+            command[:, j], actual[:, j], arrivals, steps, lag=int(round(lag[j] * rate)), rate=rate
+        )
+        results.append(
+            JointTracking(
+                joint=joint,
+                rms_error=float(rms_error[j]),
+                max_error=float(max_error[j]),
+                lag=float(lag[j]),
+                overshoot=response.overshoot,
+                settling_time=response.settling_time,
+                steady_state_error=response.steady_state_error,
+                steps=response.steps,
+                unsettled=response.unsettled,
+            )
+        )
+    for result in results:
+        result.flags = _flag_gains(result)
+    return results
+
+
+def _moves(times: np.ndarray, command: np.ndarray, grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Find the moves of one joint's command.
+
+    Args:
+        times (np.ndarray): Send time of each command, shape `(N,)`.
+        command (np.ndarray): Commanded positions of the joint, shape `(N,)`.
+        grid (np.ndarray): Analysis grid times, shape `(K,)`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Grid index at which each move arrives, increasing, and the
+        signed displacement of each move.
+    """
+    delta = np.diff(command)
+    direction = np.where(np.abs(delta) > STILL, np.sign(delta), 0.0)
+    # A move is a run of commands in one direction; it ends where the direction changes or the command stops.
+    boundary = np.flatnonzero(np.diff(direction) != 0) + 1
+    run_starts = np.concatenate(([0], boundary))
+    run_ends = np.append(boundary, len(direction))
+    moving = direction[run_starts] != 0
+    run_starts, run_ends = run_starts[moving], run_ends[moving]
+    steps = command[run_ends] - command[run_starts]
+
+    arrivals = np.searchsorted(grid, times[run_ends])
+    # Moves arriving after the grid ends have no response, and of moves arriving on the same grid sample only
+    # the last one has a non-empty window.
+    keep = (arrivals < len(grid)) & (np.append(arrivals[1:], len(grid)) > arrivals)
+    return arrivals[keep], steps[keep]
+
+
+def _step_response(
+    command: np.ndarray, actual: np.ndarray, arrivals: np.ndarray, steps: np.ndarray, *, lag: int, rate: float
+) -> StepResponse:
+    """Overshoot, settling and steady-state error over every step of one joint.
+
+    Each step's window runs from its arrival to the next one. Overshoot is measured
+    over the whole window, settling and steady-state error only while the command
+    stays within the settle band of the step's target, i.e. while it is constant at
+    the trajectory level. The measured positions are shifted back by the joint's
+    lag, so each window sees the response to its own command.
+
+    Args:
+        command (np.ndarray): Commanded positions on the analysis grid, shape `(K,)`.
+        actual (np.ndarray): Measured positions on the analysis grid, shape `(K,)`.
+        arrivals (np.ndarray): Grid index at which each move arrives, increasing, shape `(S,)`.
+        steps (np.ndarray): Signed displacement of each move, shape `(S,)`.
+        lag (int): Lag of the joint in grid samples.
+        rate (float): Grid rate in Hz.
+
+    Returns:
+        StepResponse: Metrics averaged over the steps.
+    """
+    if not len(arrivals):
+        return StepResponse()
+    first = arrivals[0]
+    starts = arrivals - first
+    lengths = np.diff(np.append(starts, len(command) - first))
+    is_step = (np.abs(steps) >= MIN_STEP) & (lengths >= MIN_SEGMENT * rate)
+    if not is_step.any():
+        return StepResponse()
+
+    lag = min(max(lag, 0), len(actual) - 1)
+    response = np.concatenate((actual[lag:], np.full(lag, actual[-1])))[first:]
+    command = command[first:]
+    segment = np.repeat(np.arange(len(starts)), lengths)
+    target = command[starts][segment]
+    direction = np.sign(steps)[segment]
+    indices = np.arange(len(command))
+
+    # Excursion past both the target and the command in the direction of the move. Once the command reverses,
+    # the target is what the joint must not pass, and while the command keeps going, the command is.
+    excursion = np.maximum.reduceat(direction * response - np.maximum(direction * command, direction * target), starts)
+    overshoot = np.maximum(excursion, 0.0) / np.abs(steps)
+
+    # The hold lasts until the command leaves the settle band around the target, less the lag, so that the
+    # shifted response to the next move is not counted.
+    departed = np.minimum.reduceat(np.where(np.abs(command - target) > SETTLE_BAND, indices, len(command)), starts)
+    hold_ends = np.maximum(np.minimum(departed, starts + lengths) - lag, starts)
+    holds = hold_ends - starts
+    in_hold = indices < hold_ends[segment]
+    has_hold = is_step & (holds >= MIN_SEGMENT * rate)
+
+    # Index of the last sample of each hold outside the settle band.
+    error = response - target
+    outside = in_hold & (np.abs(error) > SETTLE_BAND)
+    last_outside = np.maximum.reduceat(np.where(outside, indices, -1), starts)
+    settled = last_outside < hold_ends - 1
+    settling_time = (np.maximum(last_outside + 1, starts) - starts + lag) / rate
+
+    # Mean absolute error over the final fifth of each hold.
+    in_tail = in_hold & (indices >= (hold_ends - np.maximum(holds // 5, 1))[segment])
+    totals = np.bincount(segment[in_tail], np.abs(error[in_tail]), len(starts))
+    steady = totals / np.maximum(np.bincount(segment[in_tail], minlength=len(starts)), 1)
+
+    settled_steps = has_hold & settled
+    return StepResponse(
+        overshoot=float(overshoot[is_step].mean()),
+        settling_time=float(np.median(settling_time[settled_steps])) if settled_steps.any() else float("nan"),
+        steady_state_error=float(steady[has_hold].mean()) if has_hold.any() else 0.0,
+        steps=int(is_step.sum()),
+        unsettled=float(1 - settled_steps.sum() / has_hold.sum()) if has_hold.any() else 0.0,
+    )
+
+
+def _flag_gains(result: JointTracking) -> list[str]:
+    flags = []
+    if result.steps and result.overshoot > OVERSHOOT_LIMIT:
+        flags.append("overshoots: lower kp or raise kd")
+    if result.steps and result.unsettled > UNSETTLED_LIMIT:
+        flags.append("does not settle: check for oscillation or too little torque")
+    if result.lag > LAG_LIMIT and result.overshoot <= OVERSHOOT_LIMIT:
+        flags.append("sluggish: raise kp")
+    if result.steps and result.steady_state_error > STEADY_STATE_LIMIT:
+        flags.append("steady-state error: raise ki or max_torque")
+    return flags
+
+
+class TelemetryRecorder:
+    """Records joint positions with one batched state read per tick on a background thread."""
+
+    def __init__(
+        self, kos: pykos.KOS, actuator_ids: list[int], rate: float = TELEMETRY_RATE_HZ, max_seconds: float = 3600.0
+    ) -> None:
+        self.kos = kos
+        self.actuator_ids = [int(actuator_id) for actuator_id in actuator_ids]
+        self.rate = rate
+        self._times = np.zeros(int(rate * max_seconds))
+        self._positions = np.zeros((len(self._times), len(self.actuator_ids)))
+        self.count = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "TelemetryRecorder":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-recorder", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[: self.count]
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[: self.count]
+
+    def _run(self) -> None:
+        columns = {actuator_id: i for i, actuator_id in enumerate(self.actuator_ids)}
+        period = 1.0 / self.rate
+        while not self._stop.is_set() and self.count < len(self._times):
+            tick_start = time.perf_counter()
+            try:
+                response = self.kos.actuator.get_actuators_state(self.actuator_ids)
+                row = self._positions[self.count]
+                row[:] = np.nan
+                for state in response.states:
+                    row[columns[state.actuator_id]] = state.position
+                self._times[self.count] = tick_start
+                self.count += 1
+            except Exception as e:
+                logger.error("Failed to read actuator states: %s", str(e))
+            self._stop.wait(max(period - (time.perf_counter() - tick_start), 0.0))
+
+
+def save_run(
+    path: str | Path,
+    joint_names: tuple[str, ...],
+    *,
+    command_times: np.ndarray,
+    commanded: np.ndarray,
+    telemetry_times: np.ndarray,
+    measured: np.ndarray,
+) -> None:
+    """Save a commanded trajectory and its telemetry for `analyze_run`."""
+    np.savez_compressed(
+        path,
+        joint_names=np.array(joint_names),
+        command_times=command_times,
+        commanded=commanded,
+        telemetry_times=telemetry_times,
+        measured=measured,
+    )
+
+
+def analyze_run(path: str | Path) -> list[JointTracking]:
+    """Analyze a run saved with `save_run`."""
+    with np.load(path) as run:
+        return analyze_tracking(
+            run["command_times"],
+            run["commanded"],
+            run["telemetry_times"],
+            run["measured"],
+            tuple(run["joint_names"].tolist()),
+        )
@@ -0,0 +1,135 @@
+"""Pre-flight validation of whole motions against joint limits."""
+
+# Standard library imports
+from dataclasses import dataclass
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.motion.keyframes import Motion
+from skillet.setup.setup_id import RobotProfile
+
+# Constants
+DEFAULT_POSITION_LIMITS = (-180.0, 180.0)  # Degrees, narrowed per robot by its profile
+DEFAULT_MAX_VELOCITY = 360.0  # Degrees per second
+DEFAULT_MAX_ACCELERATION = 1800.0  # Degrees per second squared
+VALIDATOR_VERSION = 1  # Bump when validation accepts trajectories it used to reject
+
+LIMIT_KINDS = ("position", "velocity", "acceleration")
+
+
+@dataclass(frozen=True)
+class JointLimits:
+    """Per-joint limits, each array has shape `(J,)`."""
+
+    lower: np.ndarray
+    upper: np.ndarray
+    max_velocity: np.ndarray
+    max_acceleration: np.ndarray
+
+    @classmethod
+    def for_joints(
+        cls,
+        joint_names: tuple[str, ...],
+        profile: RobotProfile | None = None,
+        max_velocity: float = DEFAULT_MAX_VELOCITY,
+        max_acceleration: float = DEFAULT_MAX_ACCELERATION,
+    ) -> "JointLimits":
+        """Build limits for a set of joints, using the profile's position limits where present."""
+        position_limits = profile.joint_limits if profile is not None else {}
+        bounds = np.array([position_limits.get(name, DEFAULT_POSITION_LIMITS) for name in joint_names], dtype=float)
+        bounds = bounds.reshape(len(joint_names), 2)
+        return cls(
+            lower=bounds[:, 0],
+            upper=bounds[:, 1],
+            max_velocity=np.full(len(joint_names), max_velocity),
+            max_acceleration=np.full(len(joint_names), max_acceleration),
+        )
+
+
+@dataclass(frozen=True)
+class Violation:
+    """The first point at which a trajectory exceeds a limit."""
+
+    frame: int
+    joint: str
+    kind: str
+    value: float
+    limit: float
+
+    def __str__(self) -> str:
+        return f"Frame {self.frame}: {self.joint} {self.kind} {self.value:.2f} exceeds limit {self.limit:.2f}"
+
+
+def validate_trajectory(
+    positions: np.ndarray,
+    durations: float | np.ndarray,
+    limits: JointLimits,
+    joint_names: tuple[str, ...],
+) -> Violation | None:
+    """Check a whole trajectory against position, velocity and acceleration limits.
+
+    Velocities are attributed to the frame they arrive at, and accelerations to the
+    frame where the velocity changes.
+
+    Args:
+        positions (np.ndarray): Target positions in degrees, shape `(F, J)`.
+        durations (float | np.ndarray): Seconds between consecutive frames, scalar or shape `(F - 1,)`.
+        limits (JointLimits): Limits of each joint.
+        joint_names (tuple[str, ...]): Name of each joint, used for reporting.
+
+    Returns:
+        Violation | None: The first violation by frame, or None if the trajectory is valid.
+    """
+    num_frames, num_joints = positions.shape
+    durations = np.broadcast_to(np.asarray(durations, dtype=float), (max(num_frames - 1, 0),))
+
+    # Signed excess over each limit, one layer per limit kind.
+    excess = np.full((len(LIMIT_KINDS), num_frames, num_joints), -np.inf)
+    values = np.zeros_like(excess)
+    values[0] = positions
+    excess[0] = np.maximum(positions - limits.upper, limits.lower - positions)
+
+    if num_frames > 1:
+        velocity = np.diff(positions, axis=0) / durations[:, None]
+        values[1, 1:] = velocity
+        excess[1, 1:] = np.abs(velocity) - limits.max_velocity
+    if num_frames > 2:
+        midpoints = (durations[1:] + durations[:-1]) / 2
+        acceleration = np.diff(velocity, axis=0) / midpoints[:, None]
+        values[2, 1:-1] = acceleration
+        excess[2, 1:-1] = np.abs(acceleration) - limits.max_acceleration
+
+    violated = excess > 0
+    violated_frames = violated.any(axis=(0, 2))
+    if not violated_frames.any():
+        return None
+
+    frame = int(np.argmax(violated_frames))
+    kind, joint = (int(i) for i in np.argwhere(violated[:, frame].T)[0][::-1])
+    value = float(values[kind, frame, joint])
+    if kind == 0:
+        limit = float(limits.upper[joint] if value > limits.upper[joint] else limits.lower[joint])
+    else:
+        limit = float((limits.max_velocity if kind == 1 else limits.max_acceleration)[joint])
+    return Violation(frame=frame, joint=joint_names[joint], kind=LIMIT_KINDS[kind], value=value, limit=limit)
+
+
+def validate_motion(
+    motion: Motion,
+    durations: float | np.ndarray,
+    profile: RobotProfile | None = None,
+) -> Violation | None:
+    """Check a compiled motion against the limits of the robot it was compiled for.
+
+    Args:
+        motion (Motion): The motion to check.
+        durations (float | np.ndarray): Seconds between consecutive frames, scalar or shape `(F - 1,)`.
+        profile (RobotProfile | None): Profile providing per-joint position limits.
+
+    Returns:
+        Violation | None: The first violation by frame, or None if the motion is valid.
+    """
+    limits = JointLimits.for_joints(motion.joint_names, profile)
+    return validate_trajectory(motion.positions, durations, limits, motion.joint_names)
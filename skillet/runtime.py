@@ -0,0 +1,497 @@
+"""Runs the control loop in its own process, connected through shared memory.
+
+The control process owns the KOS client. On every tick it takes at most one
+setpoint from a shared command ring, commands it, reads the joint states in one
+batched call and publishes them together with the latest IMU estimate to a
+shared state block. The IMU is sampled and filtered in a process of its own at a
+lower scheduling priority, which publishes its estimate to a second state block,
+so IMU work never competes with the control loop for the interpreter. Other
+processes, such as the agent or camera processing, only touch shared memory, so
+their Python work never delays a control tick.
+
+The state block is a seqlock: the single writer makes the sequence number odd
+while it writes, and readers retry until they copy a snapshot with the same
+even sequence number before and after. The command ring has a single producer
+and a single consumer, each of which only advances its own index.
+
+Neither uses a lock, so both rely on plain stores to shared memory becoming
+visible in the order they are made: data before the index or sequence number
+that publishes it, and each index an aligned 8-byte word read and written whole.
+Every store is a separate numpy call, so CPython issues them in program order,
+and x86-64 keeps both stores and loads in order across cores. Weakly ordered
+CPUs such as ARM and RISC-V give no such guarantee, so `Runtime` warns when it
+starts on one.
+"""
+
+# Standard library imports
+import functools
+import logging
+import multiprocessing
+import os
+import platform
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from multiprocessing.synchronize import Event
+from typing import Callable
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from skillet.connection import DEFAULT_IP, Robot, connect
+from skillet.motion.player import CONTROL_RATE_HZ
+from skillet.sensors.imu import SAMPLE_RATE_HZ, ImuReader, KosImuSource
+from skillet.watchdog import SafeStop, WatchdogTrippedError
+
+# Constants
+COMMAND_CAPACITY = 256  # Setpoints the ring holds, about five seconds at 50 Hz
+STARTUP_TIMEOUT = 10.0  # Seconds to wait for the first published state
+PUSH_RETRY_INTERVAL = 0.005  # Seconds between attempts to push to a full ring
+IMU_NICENESS = 10  # Added to the IMU process's niceness, so the control process wins the CPU
+ORDERED_MACHINES = ("x86_64", "amd64", "i386", "i686")  # Keep stores and loads in program order
+CONTROL_PROCESS, IMU_PROCESS = "skillet-control", "skillet-imu"
+
+# Command ring header: producer head, consumer tail, hold count and the head at the latest hold.
+HEAD, TAIL, HOLDS, HOLD_HEAD = 0, 1, 2, 3
+RING_HEADER = 4
+
+# Layout of the scalars at the start of the state block, after the sequence number.
+TIMESTAMP, TICK, ROLL, PITCH = 0, 1, 2, 3
+STATE_SCALARS = 4
+
+logger = logging.getLogger(__name__)
+
+# Connects a runtime process, given its name and the safe stop of its watchdog, if it should have one.
+RobotFactory = Callable[[str, SafeStop | None], Robot]
+
+
+@dataclass(frozen=True)
+class JointState:
+    """Snapshot of the robot published by the control process.
+
+    Attributes:
+        timestamp: `time.monotonic()` of the state read.
+        tick: Number of control ticks run so far.
+        positions: Joint positions in degrees, shape `(J,)`, NaN for joints not reported.
+        velocities: Joint velocities in degrees per second, shape `(J,)`.
+        torques: Joint torques, shape `(J,)`.
+        roll: Body roll in degrees, NaN without an IMU estimate.
+        pitch: Body pitch in degrees, NaN without an IMU estimate.
+    """
+
+    timestamp: float
+    tick: int
+    positions: np.ndarray
+    velocities: np.ndarray
+    torques: np.ndarray
+    roll: float
+    pitch: float
+
+
+class SharedState:
+    """Latest joint state and IMU estimate in shared memory, one writer and any number of readers."""
+
+    def __init__(self, num_joints: int, name: str | None = None) -> None:
+        size = 8 + 8 * (STATE_SCALARS + 3 * num_joints)
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.num_joints = num_joints
+        self._sequence = np.ndarray((1,), dtype=np.uint64, buffer=self.memory.buf)
+        self._data = np.ndarray((STATE_SCALARS + 3 * num_joints,), dtype=np.float64, buffer=self.memory.buf, offset=8)
+        if name is None:
+            self._sequence[0] = 0
+            self._data[:] = np.nan
+            self._data[TICK] = 0
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def publish(
+        self,
+        timestamp: float,
+        tick: int,
+        states: np.ndarray,
+        roll: float = np.nan,
+        pitch: float = np.nan,
+    ) -> None:
+        """Publish a state.
+
+        Args:
+            timestamp (float): `time.monotonic()` of the state read.
+            tick (int): Number of control ticks run so far.
+            states (np.ndarray): Positions, velocities and torques, shape `(3, J)`.
+            roll (float): Body roll in degrees.
+            pitch (float): Body pitch in degrees.
+        """
+        self._sequence[0] += 1
+        self._data[:STATE_SCALARS] = (timestamp, tick, roll, pitch)
+        self._data[STATE_SCALARS:] = states.ravel()
+        self._sequence[0] += 1
+
+    def read(self) -> JointState:
+        """Copy a consistent snapshot of the latest state without blocking the writer."""
+        while True:
+            before = int(self._sequence[0])
+            if before % 2:
+                continue
+            data = self._data.copy()
+            if int(self._sequence[0]) == before:
+                break
+        states = data[STATE_SCALARS:].reshape(3, self.num_joints)
+        return JointState(
+            timestamp=float(data[TIMESTAMP]),
+            tick=int(data[TICK]),
+            positions=states[0],
+            velocities=states[1],
+            torques=states[2],
+            roll=float(data[ROLL]),
+            pitch=float(data[PITCH]),
+        )
+
+    def close(self) -> None:
+        # Drop the views before the buffer they point into.
+        del self._sequence, self._data
+        self.memory.close()
+
+
+class CommandRing:
+    """Ring buffer of setpoints in shared memory with a single producer and a single consumer.
+
+    NaN values in a setpoint leave that joint's target unchanged. Besides the
+    setpoints, the producer can request a hold, which drops the setpoints pushed
+    before the request but keeps those pushed after it.
+    """
+
+    def __init__(self, num_joints: int, capacity: int = COMMAND_CAPACITY, name: str | None = None) -> None:
+        header = 8 * RING_HEADER
+        size = header + 8 * capacity * num_joints
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.capacity = capacity
+        # Head and the hold fields are written by the producer only, tail by the consumer only.
+        self._indices = np.ndarray((RING_HEADER,), dtype=np.uint64, buffer=self.memory.buf)
+        self._slots = np.ndarray((capacity, num_joints), dtype=np.float64, buffer=self.memory.buf, offset=header)
+        if name is None:
+            self._indices[:] = 0
+        self._holds_seen = int(self._indices[HOLDS])
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __len__(self) -> int:
+        return int(self._indices[HEAD] - self._indices[TAIL])
+
+    def push(self, setpoint: np.ndarray) -> bool:
+        """Append a setpoint, returning False if the ring is full."""
+        head = int(self._indices[HEAD])
+        if head - int(self._indices[TAIL]) >= self.capacity:
+            return False
+        self._slots[head % self.capacity] = setpoint
+        self._indices[HEAD] = head + 1
+        return True
+
+    def request_hold(self) -> None:
+        """Ask the consumer to drop the setpoints pushed so far; only the producer may call this."""
+        # The head is recorded before the count that announces the request.
+        self._indices[HOLD_HEAD] = self._indices[HEAD]
+        self._indices[HOLDS] += 1
+
+    def pending_hold(self) -> int | None:
+        """Head index at the latest hold requested since the last call, or None; only the consumer may call this."""
+        holds = int(self._indices[HOLDS])
+        if holds == self._holds_seen:
+            return None
+        self._holds_seen = holds
+        return int(self._indices[HOLD_HEAD])
+
+    def pop(self) -> np.ndarray | None:
+        """Take the oldest setpoint, or None if the ring is empty."""
+        tail = int(self._indices[TAIL])
+        if tail == int(self._indices[HEAD]):
+            return None
+        command = self._slots[tail % self.capacity].copy()
+        self._indices[TAIL] = tail + 1
+        return command
+
+    def clear(self, until: int) -> None:
+        """Drop the pending commands pushed before head index `until`; only the consumer may call this."""
+        self._indices[TAIL] = max(int(self._indices[TAIL]), until)
+
+    def close(self) -> None:
+        del self._indices, self._slots
+        self.memory.close()
+
+
+def connect_robot(ip: str, robot_id: str | None, name: str, safe_stop: SafeStop | None) -> Robot:
+    """Connect a runtime process to the robot, with metrics and capture files named after the process."""
+    return connect(ip, robot_id, safe_stop=safe_stop, name=name)
+
+
+def run_imu_loop(robot_factory: RobotFactory, *, orientation_name: str, rate: float, stop: Event) -> None:
+    """Body of the IMU process, which publishes the orientation estimate in a state block without joints."""
+    logging.basicConfig(level=logging.INFO)
+    os.nice(IMU_NICENESS)
+    orientation = SharedState(0, orientation_name)
+    no_joints = np.empty((3, 0))
+    try:
+        # Only the control process commands the actuators, so only it runs a watchdog.
+        with ImuReader(KosImuSource(robot_factory(IMU_PROCESS, None).kos), rate) as imu:
+            while not stop.wait(1.0 / rate):
+                latest = imu.latest
+                if latest is not None:
+                    orientation.publish(latest.timestamp, imu.count, no_joints, roll=latest.roll, pitch=latest.pitch)
+    finally:
+        orientation.close()
+
+
+def run_control_loop(
+    robot_factory: RobotFactory,
+    actuator_ids: list[int],
+    *,
+    state_name: str,
+    command_name: str,
+    orientation_name: str | None,
+    capacity: int,
+    rate: float,
+    safe_stop: SafeStop | None,
+    stop: Event,
+) -> None:
+    """Body of the control process.
+
+    With a safe stop, every tick is a heartbeat of the robot's watchdog, and the
+    loop ends once the watchdog trips, after the robot has been stopped.
+    """
+    logging.basicConfig(level=logging.INFO)
+    robot = robot_factory(CONTROL_PROCESS, safe_stop)
+    kos, watchdog = robot.kos, robot.watchdog
+    state = SharedState(len(actuator_ids), state_name)
+    commands = CommandRing(len(actuator_ids), capacity, command_name)
+    columns = {actuator_id: i for i, actuator_id in enumerate(actuator_ids)}
+    orientation = SharedState(0, orientation_name) if orientation_name is not None else None
+
+    target = np.full(len(actuator_ids), np.nan)
+    readings = np.full((3, len(actuator_ids)), np.nan)
+    period = 1.0 / rate
+    deadline = time.perf_counter()
+    tick = 0
+    try:
+        with watchdog.armed() if watchdog is not None else nullcontext():
+            while not stop.is_set():
+                # A hold is checked first, so no setpoint is taken past it, and drops only what was queued before it.
+                hold = commands.pending_hold()
+                if hold is not None:
+                    commands.clear(hold)
+                    setpoint = readings[0]
+                else:
+                    setpoint = commands.pop()
+                if setpoint is not None:
+                    target = np.where(np.isnan(setpoint), target, setpoint)
+                    try:
+                        kos.actuator.command_actuators(
+                            [
+                                {"actuator_id": actuator_id, "position": position}
+                                for actuator_id, position, valid in zip(
+                                    actuator_ids, target.tolist(), ~np.isnan(target)
+                                )
+                                if valid
+                            ]
+                        )
+                    except WatchdogTrippedError:
+                        raise
+                    except Exception as e:
+                        logger.error("Failed to command actuators: %s", str(e))
+
+                try:
+                    response = kos.actuator.get_actuators_state(actuator_ids)
+                    for reading in response.states:
+                        readings[:, columns[reading.actuator_id]] = (
+                            reading.position,
+                            reading.velocity,
+                            reading.torque,
+                        )
+                except WatchdogTrippedError:
+                    raise
+                except Exception as e:
+                    logger.error("Failed to read actuator states: %s", str(e))
+
+                tick += 1
+                estimate = orientation.read() if orientation is not None else None
+                state.publish(
+                    time.monotonic(),
+                    tick,
+                    readings,
+                    roll=estimate.roll if estimate is not None else np.nan,
+                    pitch=estimate.pitch if estimate is not None else np.nan,
+                )
+                if watchdog is not None:
+                    watchdog.heartbeat()
+
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    deadline = time.perf_counter()
+    except WatchdogTrippedError as e:
+        logger.error("Stopped the control loop: %s", str(e))
+        if watchdog is not None:
+            watchdog.join_safe_stop()
+    finally:
+        if orientation is not None:
+            orientation.close()
+        state.close()
+        commands.close()
+
+
+class Runtime:
+    """Owns the control process and its shared memory.
+
+    The process that creates the runtime is the only one that may send commands.
+    Any process can read the state by attaching to `state_name` with `SharedState`.
+    The control process guards its client with a watchdog that brings the robot
+    to `safe_stop` when a call or tick stalls. Each child process connects on its
+    own, with metrics, capture and replay files suffixed with its name.
+
+    Usage:
+        with Runtime(actuator_ids, ip=ip) as runtime:
+            runtime.play(setpoints)
+            print(runtime.state().positions)
+    """
+
+    def __init__(
+        self,
+        actuator_ids: list[int],
+        *,
+        ip: str = DEFAULT_IP,
+        robot_id: str | None = None,
+        robot_factory: RobotFactory | None = None,
+        rate: float = CONTROL_RATE_HZ,
+        use_imu: bool = True,
+        capacity: int = COMMAND_CAPACITY,
+        safe_stop: SafeStop | str | None = SafeStop.HOLD,
+    ) -> None:
+        self.actuator_ids = [int(actuator_id) for actuator_id in actuator_ids]
+        self.robot_factory = robot_factory or functools.partial(connect_robot, ip, robot_id)
+        self.safe_stop = SafeStop(safe_stop) if safe_stop is not None else None
+        self.rate = rate
+        self.use_imu = use_imu
+        self.capacity = capacity
+        self.shared_state: SharedState | None = None
+        self.commands: CommandRing | None = None
+        self.orientation: SharedState | None = None
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+
+    def __enter__(self) -> "Runtime":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    @property
+    def state_name(self) -> str:
+        if self.shared_state is None:
+            raise RuntimeError("Runtime is not running")
+        return self.shared_state.name
+
+    def start(self, timeout: float = STARTUP_TIMEOUT) -> None:
+        """Start the control process and wait for its first published state.
+
+        Raises:
+            RuntimeError: If the control process publishes nothing within `timeout`.
+        """
+        if platform.machine().lower() not in ORDERED_MACHINES:
+            logger.warning(
+                "Shared memory between the control process and its clients assumes ordered stores, which %s does "
+                "not guarantee",
+                platform.machine(),
+            )
+        self.shared_state = SharedState(len(self.actuator_ids))
+        self.commands = CommandRing(len(self.actuator_ids), self.capacity)
+        self.orientation = SharedState(0) if self.use_imu else None
+        self._stop.clear()
+        if self.orientation is not None:
+            self._processes.append(
+                self._context.Process(
+                    target=run_imu_loop,
+                    args=(self.robot_factory,),
+                    kwargs={"orientation_name": self.orientation.name, "rate": SAMPLE_RATE_HZ, "stop": self._stop},
+                    name=IMU_PROCESS,
+                    daemon=True,
+                )
+            )
+        control = self._context.Process(
+            target=run_control_loop,
+            args=(self.robot_factory, self.actuator_ids),
+            kwargs={
+                "state_name": self.shared_state.name,
+                "command_name": self.commands.name,
+                "orientation_name": self.orientation.name if self.orientation is not None else None,
+                "capacity": self.capacity,
+                "rate": self.rate,
+                "safe_stop": self.safe_stop,
+                "stop": self._stop,
+            },
+            name=CONTROL_PROCESS,
+            daemon=True,
+        )
+        self._processes.append(control)
+        for process in self._processes:
+            process.start()
+
+        end = time.monotonic() + timeout
+        while self.shared_state.read().tick == 0:
+            if time.monotonic() > end or not control.is_alive():
+                self.stop()
+                raise RuntimeError("Control process did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        """Stop the control and IMU processes and free the shared memory."""
+        self._stop.set()
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        for block in (self.shared_state, self.commands, self.orientation):
+            if block is not None:
+                memory = block.memory
+                block.close()
+                memory.unlink()
+        self.shared_state = self.commands = self.orientation = None
+
+    def state(self) -> JointState:
+        """The latest state published by the control process."""
+        if self.shared_state is None:
+            raise RuntimeError("Runtime is not running")
+        return self.shared_state.read()
+
+    def send(self, setpoint: np.ndarray) -> bool:
+        """Queue a setpoint for a later tick, returning False if the ring is full."""
+        if self.commands is None:
+            raise RuntimeError("Runtime is not running")
+        return self.commands.push(setpoint)
+
+    def hold(self) -> None:
+        """Drop the setpoints sent so far and hold the measured positions; later setpoints still play."""
+        if self.commands is None:
+            raise RuntimeError("Runtime is not running")
+        self.commands.request_hold()
+
+    def play(self, setpoints: np.ndarray, wait: bool = True) -> None:
+        """Queue setpoints to be commanded one per control tick.
+
+        Args:
+            setpoints (np.ndarray): Positions in degrees, shape `(N, J)`; NaN keeps a joint's target.
+            wait (bool): Return only once the control process has taken the last setpoint.
+        """
+        if self.commands is None:
+            raise RuntimeError("Runtime is not running")
+        for setpoint in setpoints:
+            while not self.commands.push(setpoint):
+                time.sleep(PUSH_RETRY_INTERVAL)
+        while wait and len(self.commands):
+            time.sleep(PUSH_RETRY_INTERVAL)
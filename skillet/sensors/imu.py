@@ -0,0 +1,248 @@
+"""Streams IMU samples and estimates the robot's orientation.
+
+Samples are kept in a preallocated ring buffer of rows
+`[timestamp, accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z]` and fed in
+batches through a complementary filter. The latest estimate is published as a
+single immutable object, so readers never wait on the sampling thread.
+"""
+
+# Standard library imports
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Constants
+SAMPLE_RATE_HZ = 200.0
+BUFFER_SECONDS = 60.0
+FILTER_ALPHA = 0.98  # Weight of the integrated gyro against the accelerometer
+MAX_DECAY_RANGE = 1e6  # Largest growth of `1 / alpha**n` within one closed-form filter batch
+REPLAY_CHUNK = 256  # Samples per read when replaying faster than real time
+
+TIMESTAMP, ACCEL, GYRO = 0, slice(1, 4), slice(4, 7)
+SAMPLE_WIDTH = 7
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Orientation:
+    """Roll and pitch estimate in degrees at a given `time.monotonic()` timestamp."""
+
+    timestamp: float
+    roll: float
+    pitch: float
+
+
+class ImuSource(Protocol):
+    def read(self) -> np.ndarray:
+        """Return the samples that became available since the last call, shape `(N, 7)`."""
+        ...
+
+
+class KosImuSource:
+    """Reads one sample per call from the KOS IMU service."""
+
+    def __init__(self, kos: pykos.KOS) -> None:
+        self.kos = kos
+
+    def read(self) -> np.ndarray:
+        values = self.kos.imu.get_imu_values()
+        return np.array(
+            [
+                [
+                    time.monotonic(),
+                    values.accel_x,
+                    values.accel_y,
+                    values.accel_z,
+                    values.gyro_x,
+                    values.gyro_y,
+                    values.gyro_z,
+                ]
+            ]
+        )
+
+
+class ReplayImuSource:
+    """Replays samples recorded with `ImuReader.save`.
+
+    In real time, each call returns the samples whose original timestamps have
+    elapsed, shifted onto the current clock. Otherwise samples are returned in
+    chunks as fast as they are requested.
+    """
+
+    def __init__(self, path: str | Path, realtime: bool = True, chunk: int = REPLAY_CHUNK) -> None:
+        self.samples = np.load(path)
+        self.realtime = realtime
+        self.chunk = chunk
+        self.position = 0
+        self.offset: float | None = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.position >= len(self.samples)
+
+    def read(self) -> np.ndarray:
+        if self.exhausted:
+            return np.empty((0, SAMPLE_WIDTH))
+        if self.realtime:
+            if self.offset is None:
+                self.offset = time.monotonic() - self.samples[0, TIMESTAMP]
+            end = int(np.searchsorted(self.samples[:, TIMESTAMP], time.monotonic() - self.offset, side="right"))
+        else:
+            end = self.position + self.chunk
+        batch = self.samples[self.position : end].copy()
+        self.position += len(batch)
+        if self.offset is not None:
+            batch[:, TIMESTAMP] += self.offset
+        return batch
+
+
+class ComplementaryFilter:
+    """Fuses gyro rates and accelerometer tilt into roll and pitch.
+
+    The per-sample recursion `x[k] = a x[k-1] + a w[k] dt[k] + (1 - a) z[k]` is
+    linear, so a batch is solved in closed form with cumulative sums instead of a
+    Python loop. The sums are scaled by `1 / alpha**n`, which grows faster the
+    smaller `alpha` is, so batches are split where it would exceed `MAX_DECAY_RANGE`
+    and lose too much precision.
+    """
+
+    def __init__(self, alpha: float = FILTER_ALPHA) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"Filter alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.max_batch = max(int(np.log(MAX_DECAY_RANGE) / -np.log(alpha)), 1) if alpha < 1.0 else sys.maxsize
+        self.angles: np.ndarray | None = None
+        self.timestamp: float | None = None
+
+    def update(self, samples: np.ndarray) -> np.ndarray:
+        """Filter a batch of samples.
+
+        Args:
+            samples (np.ndarray): Samples in chronological order, shape `(N, 7)`.
+
+        Returns:
+            np.ndarray: Roll and pitch in degrees after each sample, shape `(N, 2)`.
+        """
+        if len(samples) > self.max_batch:
+            return np.concatenate(
+                [self.update(samples[i : i + self.max_batch]) for i in range(0, len(samples), self.max_batch)]
+            )
+        if not len(samples):
+            return np.empty((0, 2))
+
+        accel, gyro, timestamps = samples[:, ACCEL], samples[:, GYRO], samples[:, TIMESTAMP]
+        measured = np.degrees(
+            np.stack(
+                [
+                    np.arctan2(accel[:, 1], accel[:, 2]),
+                    np.arctan2(-accel[:, 0], np.hypot(accel[:, 1], accel[:, 2])),
+                ],
+                axis=1,
+            )
+        )
+        if self.angles is None or self.timestamp is None:
+            self.angles = measured[0]
+            self.timestamp = float(timestamps[0])
+
+        dt = np.diff(timestamps, prepend=self.timestamp)[:, None]
+        inputs = self.alpha * gyro[:, :2] * dt + (1 - self.alpha) * measured
+        decay = self.alpha ** np.arange(1, len(samples) + 1)[:, None]
+        angles = decay * (self.angles + np.cumsum(inputs / decay, axis=0))
+
+        self.angles = angles[-1]
+        self.timestamp = timestamps[-1]
+        return angles
+
+
+class ImuReader:
+    """Samples an IMU source on a background thread and publishes its orientation.
+
+    Usage:
+        with ImuReader(KosImuSource(kos)) as imu:
+            orientation = imu.latest
+    """
+
+    def __init__(
+        self,
+        source: ImuSource,
+        rate: float = SAMPLE_RATE_HZ,
+        buffer_seconds: float = BUFFER_SECONDS,
+        alpha: float = FILTER_ALPHA,
+    ) -> None:
+        self.source = source
+        self.rate = rate
+        self.filter = ComplementaryFilter(alpha)
+        self.buffer = np.zeros((int(rate * buffer_seconds), SAMPLE_WIDTH))
+        self.count = 0
+        self.latest: Orientation | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "ImuReader":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="imu-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def ingest(self, samples: np.ndarray) -> None:
+        """Store a batch of samples and publish the resulting orientation."""
+        if not len(samples):
+            return
+        capacity = len(self.buffer)
+        stored = samples[-capacity:]
+        self.count += len(samples)
+        self.buffer[(self.count - len(stored) + np.arange(len(stored))) % capacity] = stored
+
+        angles = self.filter.update(samples)
+        self.latest = Orientation(
+            timestamp=float(samples[-1, TIMESTAMP]), roll=float(angles[-1, 0]), pitch=float(angles[-1, 1])
+        )
+
+    def samples(self) -> np.ndarray:
+        """Return the buffered samples in chronological order."""
+        capacity = len(self.buffer)
+        if self.count <= capacity:
+            return self.buffer[: self.count].copy()
+        return np.roll(self.buffer, -(self.count % capacity), axis=0)
+
+    def save(self, path: str | Path) -> None:
+        """Save the buffered samples for replay with `ReplayImuSource`."""
+        np.save(path, self.samples())
+
+    def _run(self) -> None:
+        period = 1.0 / self.rate
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self.ingest(self.source.read())
+            except Exception as e:
+                logger.error("Failed to read IMU: %s", str(e))
+            if getattr(self.source, "exhausted", False):
+                break
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.perf_counter()
@@ -1 +1,147 @@
-"""Placeholder module for robot ID setup functionality (to be implemented)."""
+"""Per-robot identity and calibration profiles.
+
+Every unit shares the same nominal actuator map and keyframe library. A profile
+stores what differs between units (actuator ID overrides, zero offsets and joint
+limits) so it can be folded into motions once, when they are compiled.
+"""
+
+# Standard library imports
+import argparse
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Third-party imports
+import colorlogging
+import pykos  # type: ignore[import-untyped]
+
+# Local imports
+from skillet.setup.maps import ACTUATOR_NAME_TO_ID
+
+DEFAULT_ROBOT_ID = "default"
+PROFILE_DIR_ENV = "SKILLET_PROFILE_DIR"
+ROBOT_ID_ENV = "SKILLET_ROBOT_ID"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RobotProfile:
+    """Identity and calibration data for a single robot.
+
+    Attributes:
+        robot_id: Unique name of the robot.
+        actuator_overrides: Actuator IDs that differ from `ACTUATOR_NAME_TO_ID`.
+        zero_offsets: Degrees added to every commanded position of a joint.
+        joint_limits: Allowed `(lower, upper)` position range of a joint, in degrees.
+    """
+
+    robot_id: str = DEFAULT_ROBOT_ID
+    actuator_overrides: dict[str, int] = field(default_factory=dict)
+    zero_offsets: dict[str, float] = field(default_factory=dict)
+    joint_limits: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+    @property
+    def actuator_ids(self) -> dict[str, int]:
+        """Actuator name to ID map for this robot."""
+        return {**ACTUATOR_NAME_TO_ID, **self.actuator_overrides}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RobotProfile":
+        return cls(
+            robot_id=data.get("robot_id", DEFAULT_ROBOT_ID),
+            actuator_overrides={k: int(v) for k, v in data.get("actuator_overrides", {}).items()},
+            zero_offsets={k: float(v) for k, v in data.get("zero_offsets", {}).items()},
+            joint_limits={k: (float(lo), float(hi)) for k, (lo, hi) in data.get("joint_limits", {}).items()},
+        )
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["joint_limits"] = {k: list(v) for k, v in self.joint_limits.items()}
+        return data
+
+
+def profile_dir() -> Path:
+    """Directory holding the stored robot profiles."""
+    return Path(os.environ.get(PROFILE_DIR_ENV, "~/.skillet/robots")).expanduser()
+
+
+def resolve_robot_id(robot_id: str | None = None) -> str:
+    """Pick the robot ID from the argument, the environment or the default."""
+    return robot_id or os.environ.get(ROBOT_ID_ENV) or DEFAULT_ROBOT_ID
+
+
+def load_profile(robot_id: str | None = None) -> RobotProfile:
+    """Load the stored profile of a robot.
+
+    Args:
+        robot_id (str | None): ID of the robot, see `resolve_robot_id`.
+
+    Returns:
+        RobotProfile: The stored profile, or an uncalibrated one if none exists.
+    """
+    robot_id = resolve_robot_id(robot_id)
+    path = profile_dir() / f"{robot_id}.json"
+    if not path.exists():
+        logger.warning("No profile found for robot %s at %s, using nominal calibration", robot_id, path)
+        return RobotProfile(robot_id=robot_id)
+    with open(path, "r", encoding="utf-8") as f:
+        return RobotProfile.from_dict(json.load(f))
+
+
+def save_profile(profile: RobotProfile) -> Path:
+    """Store the profile of a robot.
+
+    Args:
+        profile (RobotProfile): Profile to store.
+
+    Returns:
+        Path: Path of the written profile file.
+    """
+    path = profile_dir() / f"{profile.robot_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile.to_dict(), f, indent=2)
+    return path
+
+
+def capture_zero_offsets(kos: pykos.KOS, profile: RobotProfile) -> dict[str, float]:
+    """Read the offsets of a robot held in its nominal zero pose.
+
+    Args:
+        kos (pykos.KOS): Instance of the KOS object to communicate with actuators.
+        profile (RobotProfile): Profile providing the actuator map.
+
+    Returns:
+        dict[str, float]: Offsets that map nominal positions onto this robot.
+    """
+    id_to_name = {v: k for k, v in profile.actuator_ids.items()}
+    response = kos.actuator.get_actuators_state(list(id_to_name))
+    return {id_to_name[state.actuator_id]: round(state.position, 2) for state in response.states}
+
+
+def main() -> None:
+    """Create or update the profile of a robot."""
+    logging.basicConfig(level=logging.INFO)
+    colorlogging.configure()
+
+    parser = argparse.ArgumentParser(description="Create or update a robot profile.")
+    parser.add_argument("--robot-id", default=None, help="Robot ID (default: $SKILLET_ROBOT_ID)")
+    parser.add_argument("--ip", default="192.168.42.1", help="Robot IP address")
+    parser.add_argument("--capture-offsets", action="store_true", help="Record zero offsets from the current pose")
+    args = parser.parse_args()
+
+    profile = load_profile(args.robot_id)
+    if args.capture_offsets:
+        # `skillet.connection` loads profiles from this module, so it is imported only when needed.
+        from skillet.connection import connect  # noqa: PLC0415
+
+        profile.zero_offsets = capture_zero_offsets(connect(args.ip, args.robot_id).kos, profile)
+    path = save_profile(profile)
+    logger.info("Saved profile for robot %s to %s", profile.robot_id, path)
+
+
+if __name__ == "__main__":
+    main()
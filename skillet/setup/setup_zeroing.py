@@ -4,40 +4,140 @@
 import logging
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 
 # Third-party imports
 import colorlogging
 import pykos  # type: ignore[import-untyped]
 
 # Local imports
-from skillet.setup.maps import ACTUATOR_NAME_TO_ID
+from skillet.connection import connect
+from skillet.setup.maps import ACTUATOR_ID_TO_NAME, ACTUATOR_NAME_TO_ID
+
+# Constants
+ZERO_TOLERANCE_DEGREES = 1.0  # Maximum distance from zero for a joint to count as zeroed
+SETTLE_TIME_SECONDS = 0.1  # Time for the actuators to latch the new zero
+MAX_ATTEMPTS = 3
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+def _zero_one(kos: pykos.KOS, actuator_id: int) -> bool:
+    """Send the zero command to a single actuator.
+
+    Args:
+        kos (pykos.KOS): Instance of the KOS object to communicate with actuators.
+        actuator_id (int): ID of the actuator to zero.
+
+    Returns:
+        bool: Whether the actuator accepted the command.
+    """
+    try:
+        result = kos.actuator.configure_actuator(actuator_id=actuator_id, zero_position=True)
+        return bool(result.success)
+    except Exception as e:
+        logger.error("Error while zeroing actuator %d: %s", actuator_id, str(e))
+        logger.debug("Traceback:\n%s", traceback.format_exc())
+        return False
+
+
+def configure_zero(kos: pykos.KOS, actuator_ids: list[int]) -> list[int]:
+    """Send the zero command to all actuators concurrently.
+
+    KOS has no batched configure call, so the per-actuator requests are issued in
+    parallel and the whole batch costs roughly one round trip.
+
+    Args:
+        kos (pykos.KOS): Instance of the KOS object to communicate with actuators.
+        actuator_ids (list[int]): IDs of the actuators to zero.
+
+    Returns:
+        list[int]: IDs of the actuators that rejected the command.
+    """
+    if not actuator_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=len(actuator_ids)) as pool:
+        accepted = list(pool.map(lambda actuator_id: _zero_one(kos, actuator_id), actuator_ids))
+    return [actuator_id for actuator_id, ok in zip(actuator_ids, accepted) if not ok]
+
+
+def verify_zero(kos: pykos.KOS, actuator_ids: list[int], tolerance: float = ZERO_TOLERANCE_DEGREES) -> list[int]:
+    """Check with a single batched state read that the actuators sit at zero.
+
+    Args:
+        kos (pykos.KOS): Instance of the KOS object to communicate with actuators.
+        actuator_ids (list[int]): IDs of the actuators to check.
+        tolerance (float): Maximum absolute position, in degrees, that counts as zero.
+
+    Returns:
+        list[int]: IDs of the actuators that are not at zero or did not report a state.
+    """
+    if not actuator_ids:
+        return []
+    try:
+        response = kos.actuator.get_actuators_state(actuator_ids)
+    except Exception as e:
+        logger.error("Error while reading actuator states: %s", str(e))
+        return list(actuator_ids)
+
+    positions = {state.actuator_id: state.position for state in response.states}
+    failed = []
+    for actuator_id in actuator_ids:
+        position = positions.get(actuator_id)
+        if position is None or abs(position) > tolerance:
+            logger.warning("Actuator %d not at zero (position: %s)", actuator_id, position)
+            failed.append(actuator_id)
+    return failed
+
+
+def zero_actuators(
+    kos: pykos.KOS,
+    actuator_ids: Iterable[int] | None = None,
+    tolerance: float = ZERO_TOLERANCE_DEGREES,
+    settle_time: float = SETTLE_TIME_SECONDS,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> list[int]:
+    """Zero actuators and verify the result, retrying only the ones that failed.
+
+    Args:
+        kos (pykos.KOS): Instance of the KOS object to communicate with actuators.
+        actuator_ids (Iterable[int] | None): IDs of the actuators to zero, defaults to all of them.
+        tolerance (float): Maximum absolute position, in degrees, that counts as zero.
+        settle_time (float): Seconds to wait between zeroing and verifying.
+        max_attempts (int): Number of zero-and-verify rounds before giving up.
+
+    Returns:
+        list[int]: IDs of the actuators that could not be zeroed.
+    """
+    pending = list(ACTUATOR_NAME_TO_ID.values() if actuator_ids is None else actuator_ids)
+
+    for attempt in range(1, max_attempts + 1):
+        if not pending:
+            break
+        logger.info("Zeroing %d actuators (attempt %d/%d)", len(pending), attempt, max_attempts)
+        rejected = configure_zero(kos, pending)
+        accepted = [actuator_id for actuator_id in pending if actuator_id not in rejected]
+        time.sleep(settle_time)
+        pending = rejected + verify_zero(kos, accepted, tolerance)
+
+    return pending
+
+
 def main() -> None:
-    """Configure and zero actuators, reading their states."""
+    """Configure and zero actuators, verifying their states."""
     colorlogging.configure()
-    kos = pykos.KOS(ip="192.168.42.1")
-
-    for actuator_name, actuator_id in ACTUATOR_NAME_TO_ID.items():
-        try:
-            # Configure actuator
-            logger.info("Configuring actuator %s with id %d to zero position", actuator_name, actuator_id)
-            result = kos.actuator.configure_actuator(actuator_id=actuator_id, zero_position=True)
-            logger.info("Result for actuator %s with id %d: %s", actuator_name, actuator_id, result)
-
-            # Get and log actuator state
-            state = kos.actuator.get_actuators_state([actuator_id])
-            logger.info("Current state for actuator %s with id %d: %s", actuator_name, actuator_id, state)
-
-            time.sleep(0.1)
-        except Exception as e:
-            logger.error(
-                "Error while configuring/checking actuator %s (ID: %d): %s", actuator_name, actuator_id, str(e)
-            )
-            logger.error("Traceback:\n%s", traceback.format_exc())
+    kos = connect().kos
+
+    failed_ids = zero_actuators(kos)
+
+    if failed_ids:
+        failed_joints = [ACTUATOR_ID_TO_NAME.get(actuator_id, str(actuator_id)) for actuator_id in failed_ids]
+        logger.error("=== Failed Joints ===")
+        logger.error("Failed to zero %d joints: %s", len(failed_joints), ", ".join(failed_joints))
+    else:
+        logger.info("All joints successfully zeroed")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,311 @@
+"""Enforces deadlines on KOS calls and stops the robot safely when they are missed.
+
+Every call through a `GuardedKOS` runs on a worker thread and the caller waits at
+most the method's deadline for it, counted from when the call starts to run, so
+time spent queued behind other calls does not count against it. A background thread watches the heartbeats of
+the control loop. A missed deadline or heartbeat trips the watchdog: the robot is
+brought to a safe stop through a separate client, and every later guarded call
+fails immediately, so a stalled script unwinds instead of hanging.
+"""
+
+# Standard library imports
+import logging
+import threading
+import time
+from concurrent import futures
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Iterator
+
+# Third-party imports
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+# Constants
+DEFAULT_DEADLINE = 0.25  # Seconds
+METHOD_DEADLINES: dict[str, float | None] = {
+    "actuator.configure_actuator": 1.0,
+    "sound.play_audio": None,  # Streams for as long as the audio plays
+    "sound.record_audio": None,
+}
+HEARTBEAT_TIMEOUT = 0.25  # Seconds without a control-loop tick
+CHECK_INTERVAL = 0.01  # Seconds between heartbeat checks
+ZERO_SPEED = 15.0  # Degrees per second of the slow move to zero
+ZERO_RATE_HZ = 50.0
+MIN_CALL_WORKERS = 8  # The pool also has a worker per actuator, for concurrent per-actuator calls
+
+# Upper bounds of the fraction of its deadline a call took.
+DEADLINE_BUCKETS = (0.25, 0.5, 0.75, 0.9, 1.0)
+
+logger = logging.getLogger(__name__)
+
+
+class SafeStop(str, Enum):
+    """What the watchdog does with the actuators when it trips."""
+
+    HOLD = "hold"  # Command the measured positions, so the robot stays where it is
+    LIMP = "limp"  # Disable torque
+    ZERO = "zero"  # Move slowly to the zero pose
+
+
+class WatchdogTrippedError(RuntimeError):
+    """Raised by guarded calls once the watchdog has tripped."""
+
+
+class DeadlineExceededError(WatchdogTrippedError, TimeoutError):
+    """Raised when a guarded call does not return within its deadline."""
+
+
+@dataclass
+class DeadlineStats:
+    """How close the calls of one method came to their deadline."""
+
+    calls: int = 0
+    misses: int = 0
+    max_fraction: float = 0.0
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * (len(DEADLINE_BUCKETS) + 1))
+
+    def record(self, fraction: float) -> None:
+        self.calls += 1
+        if fraction > 1.0:
+            self.misses += 1
+        self.max_fraction = max(self.max_fraction, fraction)
+        self.bucket_counts[int(np.searchsorted(DEADLINE_BUCKETS, fraction))] += 1
+
+
+class Watchdog:
+    """Guards KOS calls with deadlines and monitors control-loop heartbeats.
+
+    The watchdog should be given its own client for the safe stop, so that a hung
+    channel of the guarded client does not also block stopping the robot.
+
+    Usage:
+        with Watchdog(pykos.KOS(ip), actuator_ids, mode=SafeStop.LIMP) as watchdog:
+            kos = watchdog.guard(pykos.KOS(ip))
+            with watchdog.armed():
+                while running:
+                    kos.actuator.command_actuators(commands)
+                    watchdog.heartbeat()
+    """
+
+    def __init__(
+        self,
+        kos: pykos.KOS,
+        actuator_ids: list[int],
+        *,
+        mode: SafeStop = SafeStop.HOLD,
+        deadline: float = DEFAULT_DEADLINE,
+        deadlines: dict[str, float | None] | None = None,
+        heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+        zero_speed: float = ZERO_SPEED,
+    ) -> None:
+        self.kos = kos
+        self.actuator_ids = [int(actuator_id) for actuator_id in actuator_ids]
+        self.mode = SafeStop(mode)
+        self.deadline = deadline
+        self.deadlines = {**METHOD_DEADLINES, **(deadlines or {})}
+        self.heartbeat_timeout = heartbeat_timeout
+        self.zero_speed = zero_speed
+        self.stats: dict[str, DeadlineStats] = {}
+        self.tripped = threading.Event()
+        self.reason: str | None = None
+        self._lock = threading.Lock()
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max(MIN_CALL_WORKERS, len(self.actuator_ids)), thread_name_prefix="kos-call"
+        )
+        self._armed = False
+        self._last_beat = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._safe_stop_thread: threading.Thread | None = None
+
+    def __enter__(self) -> "Watchdog":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop monitoring and log methods that came close to their deadline."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for method, stats in sorted(self.stats.items()):
+            if stats.max_fraction > DEADLINE_BUCKETS[-2]:
+                logger.warning(
+                    "%s used up to %.0f%% of its deadline (%d of %d calls missed)",
+                    method,
+                    stats.max_fraction * 100,
+                    stats.misses,
+                    stats.calls,
+                )
+        # Calls stuck on a hung channel cannot be interrupted, so do not wait for them.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def guard(self, kos: pykos.KOS) -> "GuardedKOS":
+        """Wrap a client so that all of its calls are subject to this watchdog."""
+        return GuardedKOS(kos, self)
+
+    def heartbeat(self) -> None:
+        """Signal that the control loop is alive, once per tick."""
+        self._last_beat = time.perf_counter()
+
+    @contextmanager
+    def armed(self) -> Iterator[None]:
+        """Expect heartbeats for the duration of the block."""
+        self.heartbeat()
+        self._armed = True
+        try:
+            yield
+        finally:
+            self._armed = False
+
+    def call(self, method: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Run a KOS call under the deadline of its method.
+
+        Args:
+            method (str): Name of the method as `service.method`.
+            function (Callable[..., Any]): The bound method of the unguarded client.
+            *args (Any): Positional arguments of the call.
+            **kwargs (Any): Keyword arguments of the call.
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            WatchdogTrippedError: If the watchdog has already tripped.
+            DeadlineExceededError: If the call does not return within its deadline.
+        """
+        if self.tripped.is_set():
+            raise WatchdogTrippedError(f"Watchdog tripped ({self.reason}), refusing {method}")
+        deadline = self.deadlines.get(method, self.deadline)
+        if deadline is None:
+            return function(*args, **kwargs)
+
+        stats = self.stats.get(method)
+        if stats is None:
+            stats = self.stats.setdefault(method, DeadlineStats())
+        running = threading.Event()
+        started = 0.0
+
+        def run() -> Any:  # noqa: ANN401
+            nonlocal started
+            started = time.perf_counter()
+            running.set()
+            return function(*args, **kwargs)
+
+        future = self._executor.submit(run)
+        # The deadline starts when the call runs, not while it waits for a free worker.
+        while not running.wait(CHECK_INTERVAL):
+            if self.tripped.is_set():
+                future.cancel()
+                raise WatchdogTrippedError(f"Watchdog tripped ({self.reason}), dropped queued {method}")
+        try:
+            result = future.result(timeout=max(started + deadline - time.perf_counter(), 0.0))
+        except futures.TimeoutError:
+            stats.record((time.perf_counter() - started) / deadline)
+            reason = f"{method} exceeded its {deadline * 1000:.0f} ms deadline"
+            self.trip(reason)
+            raise DeadlineExceededError(reason) from None
+        stats.record((time.perf_counter() - started) / deadline)
+        return result
+
+    def trip(self, reason: str) -> None:
+        """Bring the robot to a safe stop, once."""
+        with self._lock:
+            if self.tripped.is_set():
+                return
+            self.reason = reason
+            self.tripped.set()
+        logger.error("Watchdog tripped: %s, safe stop: %s", reason, self.mode.value)
+        self._safe_stop_thread = threading.Thread(target=self._safe_stop, name="watchdog-safe-stop", daemon=True)
+        self._safe_stop_thread.start()
+
+    def join_safe_stop(self, timeout: float | None = None) -> None:
+        """Wait for a running safe stop to finish."""
+        if self._safe_stop_thread is not None:
+            self._safe_stop_thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(CHECK_INTERVAL):
+            silence = time.perf_counter() - self._last_beat
+            if self._armed and silence > self.heartbeat_timeout:
+                self.trip(f"control loop missed its heartbeat for {silence * 1000:.0f} ms")
+
+    def _safe_stop(self) -> None:
+        try:
+            if self.mode is SafeStop.LIMP:
+                for actuator_id in self.actuator_ids:
+                    self.kos.actuator.configure_actuator(actuator_id=actuator_id, torque_enabled=False)
+                return
+
+            response = self.kos.actuator.get_actuators_state(self.actuator_ids)
+            positions = {state.actuator_id: state.position for state in response.states}
+            ids = [actuator_id for actuator_id in self.actuator_ids if actuator_id in positions]
+            current = np.array([positions[actuator_id] for actuator_id in ids])
+            if self.mode is SafeStop.HOLD:
+                self._command(ids, current)
+                return
+
+            steps = max(int(np.abs(current).max(initial=0.0) / self.zero_speed * ZERO_RATE_HZ), 1)
+            for scale in np.linspace(1.0, 0.0, steps + 1)[1:]:
+                self._command(ids, current * scale)
+                time.sleep(1.0 / ZERO_RATE_HZ)
+        except Exception as e:
+            logger.error("Safe stop failed: %s", str(e))
+
+    def _command(self, actuator_ids: list[int], positions: np.ndarray) -> None:
+        self.kos.actuator.command_actuators(
+            [
+                {"actuator_id": actuator_id, "position": position}
+                for actuator_id, position in zip(actuator_ids, positions.tolist())
+            ]
+        )
+
+
+class GuardedService:
+    """Wraps a KOS service so that every method call runs under a deadline."""
+
+    def __init__(self, service: Any, name: str, watchdog: Watchdog) -> None:  # noqa: ANN401
+        self._service = service
+        self._name = name
+        self._watchdog = watchdog
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        value = getattr(self._service, attr)
+        if not callable(value):
+            return value
+
+        method = f"{self._name}.{attr}"
+        watchdog = self._watchdog
+
+        def guarded(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            return watchdog.call(method, value, *args, **kwargs)
+
+        # Cache the wrapper so later lookups skip `__getattr__`.
+        setattr(self, attr, guarded)
+        return guarded
+
+
+class GuardedKOS:
+    """Drop-in wrapper around a `pykos.KOS` client that enforces call deadlines."""
+
+    def __init__(self, kos: pykos.KOS, watchdog: Watchdog) -> None:
+        self._kos = kos
+        self.watchdog = watchdog
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        value = getattr(self._kos, attr)
+        if callable(value) or isinstance(value, (int, float, str, bytes, bool)) or value is None:
+            return value
+        service = GuardedService(value, attr, self.watchdog)
+        setattr(self, attr, service)
+        return service
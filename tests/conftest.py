@@ -5,11 +5,18 @@ import random
 import pytest
 from _pytest.python import Function
 
+from tests.fakes import FakeKOS
+
 
 @pytest.fixture(autouse=True)
 def set_random_seed() -> None:
     random.seed(1337)
 
 
+@pytest.fixture
+def fake_kos() -> FakeKOS:
+    return FakeKOS()
+
+
 def pytest_collection_modifyitems(items: list[Function]) -> None:
     items.sort(key=lambda x: x.get_closest_marker("slow") is not None)
@@ -0,0 +1,61 @@
+"""In-memory stand-ins for the KOS client, shared by the tests."""
+
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pykos  # type: ignore[import-untyped]
+
+
+@dataclass
+class FakeActuatorService:
+    """In-memory stand-in for the KOS actuator service."""
+
+    positions: dict[int, float] = field(default_factory=dict)
+    torques: dict[int, float] = field(default_factory=dict)
+    rejected: set[int] = field(default_factory=set)
+    calls: list[tuple[str, Any]] = field(default_factory=list)
+
+    def configure_actuator(self, actuator_id: int, **kwargs: Any) -> SimpleNamespace:  # noqa: ANN401
+        self.calls.append(("configure_actuator", (actuator_id, kwargs)))
+        if actuator_id in self.rejected:
+            return SimpleNamespace(success=False, error="rejected")
+        if kwargs.get("zero_position"):
+            self.positions[actuator_id] = 0.0
+        return SimpleNamespace(success=True, error=None)
+
+    def command_actuators(self, commands: list[dict[str, Any]]) -> SimpleNamespace:
+        self.calls.append(("command_actuators", commands))
+        results = []
+        for command in commands:
+            actuator_id = command["actuator_id"]
+            if actuator_id not in self.rejected:
+                self.positions[actuator_id] = command["position"]
+            results.append(SimpleNamespace(actuator_id=actuator_id, success=actuator_id not in self.rejected))
+        return SimpleNamespace(results=results)
+
+    def get_actuators_state(self, actuator_ids: list[int]) -> SimpleNamespace:
+        self.calls.append(("get_actuators_state", list(actuator_ids)))
+        states = [
+            SimpleNamespace(
+                actuator_id=actuator_id,
+                position=self.positions.get(actuator_id, 0.0),
+                velocity=0.0,
+                torque=self.torques.get(actuator_id, 0.0),
+                online=True,
+            )
+            for actuator_id in actuator_ids
+        ]
+        return SimpleNamespace(states=states)
+
+
+@dataclass
+class FakeKOS:
+    """In-memory stand-in for a `pykos.KOS` client."""
+
+    actuator: FakeActuatorService = field(default_factory=FakeActuatorService)
+
+
+def as_kos(fake: object) -> pykos.KOS:
+    """Type a fake as the client it stands in for."""
+    return cast(pykos.KOS, fake)
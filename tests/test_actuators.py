@@ -1 +1,51 @@
-"""Placeholder test module for actuator functionality (to be implemented)."""
+"""Tests for actuator zeroing, calibration and keyframe recording."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from skillet.examples.print_joint_states import record_keyframes
+from skillet.motion.keyframes import compile_motion, load_keyframes
+from skillet.setup.setup_zeroing import zero_actuators
+from tests.fakes import FakeActuatorService, FakeKOS, as_kos
+
+
+def test_zero_actuators_all_succeed(fake_kos: FakeKOS) -> None:
+    fake_kos.actuator.positions = {11: 12.0, 12: -4.0, 13: 0.3}
+    failed = zero_actuators(as_kos(fake_kos), [11, 12, 13], settle_time=0.0)
+    assert failed == []
+    reads = [args for name, args in fake_kos.actuator.calls if name == "get_actuators_state"]
+    assert reads == [[11, 12, 13]]
+
+
+def test_zero_actuators_retries_only_failures(fake_kos: FakeKOS) -> None:
+    fake_kos.actuator.rejected = {12}
+    failed = zero_actuators(as_kos(fake_kos), [11, 12, 13], settle_time=0.0, max_attempts=2)
+    assert failed == [12]
+    configured = [args[0] for name, args in fake_kos.actuator.calls if name == "configure_actuator"]
+    assert sorted(configured) == [11, 12, 12, 13]
+
+
+class FlakyActuatorService(FakeActuatorService):
+    """Actuator service whose first state read fails."""
+
+    failures: int = 1
+
+    def get_actuators_state(self, actuator_ids: list[int]) -> SimpleNamespace:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("timeout")
+        return super().get_actuators_state(actuator_ids)
+
+
+def test_record_keyframes_retakes_failed_reads(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    answers = iter(["", "", "q"])
+    monkeypatch.setattr("builtins.input", lambda _: next(answers))
+    path = tmp_path / "recorded.json"
+    record_keyframes(as_kos(FakeKOS(actuator=FlakyActuatorService())), str(path))
+
+    keyframes = load_keyframes(path)
+    assert len(keyframes) == 1
+    compile_motion(keyframes)
@@ -0,0 +1,131 @@
+"""Tests for capturing and replaying KOS calls."""
+
+import gzip
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import cast
+
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+import pytest
+
+from skillet.capture import (
+    FORMAT_VERSION,
+    MAGIC,
+    VERSION,
+    CapturingKOS,
+    ReplayExhaustedError,
+    ReplayKOS,
+    read_capture,
+)
+from skillet.motion.player import Player
+from tests.fakes import FakeKOS
+
+
+def test_capture_and_replay(fake_kos: FakeKOS, tmp_path: Path) -> None:
+    path = tmp_path / "calls.skcap"
+    kos = CapturingKOS(cast(pykos.KOS, fake_kos), path)
+    fake_kos.actuator.rejected.add(12)
+    Player(cast(pykos.KOS, kos), np.array([11, 12]), rate=1000.0).play(np.array([[1.0, 2.0], [3.0, 4.0]] * 5))
+    kos.actuator.get_actuators_state([11, 12])
+    with pytest.raises(KeyError):
+        kos.actuator.command_actuators([{}])
+    kos.close()
+
+    records = list(read_capture(path))
+    assert [record.method for record in records] == ["actuator.command_actuators"] * 10 + [
+        "actuator.get_actuators_state",
+        "actuator.command_actuators",
+    ]
+    assert records[0].args == ([{"actuator_id": 11, "position": 1.0}, {"actuator_id": 12, "position": 2.0}],)
+    assert records[-1].error is not None
+    assert all(later.start >= earlier.start for earlier, later in zip(records, records[1:]))
+
+    replay = ReplayKOS(path, realtime=False)
+    stats = Player(cast(pykos.KOS, replay), np.array([11, 12]), rate=1000.0).play(
+        np.array([[1.0, 2.0], [3.0, 4.0]] * 5)
+    )
+    assert stats.failed_commands == 10
+    state = replay.actuator.get_actuators_state([11, 12])
+    assert state.states[0].position == 3.0
+    assert state.states[1].online is True
+    with pytest.raises(RuntimeError):
+        replay.actuator.command_actuators([{}])
+    with pytest.raises(ReplayExhaustedError):
+        replay.actuator.get_actuators_state([11, 12])
+    assert replay.mismatches == 0
+
+
+class SlowLedMatrix:
+    """LED matrix service whose calls take 20 ms."""
+
+    def write_buffer(self, buffer: bytes) -> SimpleNamespace:
+        time.sleep(0.02)
+        return SimpleNamespace(success=True, error=None)
+
+
+class FakeSound:
+    """Sound service that plays and records raw chunks."""
+
+    def __init__(self) -> None:
+        self.played: list[bytes] = []
+
+    def play_audio(self, audio_iterator: Iterator[bytes], **config: int) -> SimpleNamespace:
+        self.played.extend(audio_iterator)
+        return SimpleNamespace(success=True, error=None)
+
+    def record_audio(self, duration_ms: int = 0, **config: int) -> Iterator[bytes]:
+        yield from (bytes([i]) * 4 for i in range(3))
+
+
+@dataclass
+class PeripheralKOS(FakeKOS):
+    led_matrix: SlowLedMatrix = field(default_factory=SlowLedMatrix)
+    sound: FakeSound = field(default_factory=FakeSound)
+
+
+def test_replay_keeps_timing(tmp_path: Path) -> None:
+    path = tmp_path / "led.skcap"
+    kos = CapturingKOS(cast(pykos.KOS, PeripheralKOS()), path)
+    for _ in range(3):
+        kos.led_matrix.write_buffer(b"\x0f" * 16)
+    kos.close()
+    assert {record.method for record in read_capture(path)} == {"led_matrix.write_buffer"}
+
+    for realtime, fast in ((True, False), (False, True)):
+        replay = ReplayKOS(path, realtime=realtime)
+        start = time.perf_counter()
+        for _ in range(3):
+            assert replay.led_matrix.write_buffer(b"\x0f" * 16).success
+        assert (time.perf_counter() - start < 0.03) == fast
+
+
+def test_capture_streams(tmp_path: Path) -> None:
+    path = tmp_path / "sound.skcap"
+    fake = PeripheralKOS()
+    kos = CapturingKOS(cast(pykos.KOS, fake), path)
+    chunks = [b"ab", b"cd"]
+    assert kos.sound.play_audio(iter(chunks), sample_rate=8000).success
+    assert fake.sound.played == chunks
+    recorded = list(kos.sound.record_audio(duration_ms=10))
+    kos.close()
+
+    played, recording = read_capture(path)
+    assert played.args == (chunks,) and not played.stream
+    assert recording.response == recorded and recording.stream
+
+    replay = ReplayKOS(path, realtime=False)
+    assert replay.sound.play_audio(iter(chunks), sample_rate=8000).success
+    assert list(replay.sound.record_audio(duration_ms=10)) == recorded
+    assert replay.mismatches == 0
+
+
+def test_capture_format_version(tmp_path: Path) -> None:
+    path = tmp_path / "old.skcap"
+    with gzip.open(path, "wb") as f:
+        f.write(MAGIC + VERSION.pack(FORMAT_VERSION + 1))
+    with pytest.raises(ValueError, match="format"):
+        list(read_capture(path))
@@ -0,0 +1,36 @@
+"""Tests for the skillet command line entry point."""
+
+import subprocess
+import sys
+
+import pytest
+
+from skillet.cli import _safe_stop, build_parser
+
+
+def test_import_is_lightweight() -> None:
+    code = "import sys, skillet.cli; print(sorted({'pykos', 'numpy', 'tkinter', 'langchain_core'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("command", ["zero", "states", "led", "agent"])
+def test_subcommands_parse(command: str) -> None:
+    args = build_parser().parse_args(["--ip", "10.0.0.2", command])
+    assert args.ip == "10.0.0.2"
+    assert callable(args.handler)
+
+
+@pytest.mark.parametrize(
+    ("argv", "safe_stop"),
+    [
+        (["squat"], "hold"),
+        (["states"], None),
+        (["zero"], None),
+        (["--safe-stop", "limp", "walk"], "limp"),
+        (["--safe-stop", "zero", "states"], "zero"),
+        (["--safe-stop", "off", "play", "burpee.json"], None),
+    ],
+)
+def test_safe_stop_defaults_to_hold_only_for_motion(argv: list[str], safe_stop: str | None) -> None:
+    assert _safe_stop(build_parser().parse_args(argv)) == safe_stop
@@ -1 +1,131 @@
-"""Placeholder test module for connection handling (to be implemented)."""
+"""Tests for the instrumented KOS client."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from skillet.capture import REPLAY_FILE_ENV, REPLAY_REALTIME_ENV, CapturingKOS
+from skillet.connection import connect, process_file
+from skillet.instrumentation import InstrumentedKOS
+from skillet.setup.setup_id import PROFILE_DIR_ENV
+from skillet.watchdog import DeadlineExceededError, SafeStop, Watchdog, WatchdogTrippedError
+from tests.fakes import FakeActuatorService, FakeKOS, as_kos
+
+
+def test_instrumented_calls_are_counted(fake_kos: FakeKOS) -> None:
+    kos = InstrumentedKOS(as_kos(fake_kos))
+    kos.actuator.command_actuators([{"actuator_id": 11, "position": 1.0}])
+    kos.actuator.command_actuators([{"actuator_id": 11, "position": 2.0}])
+    kos.actuator.get_actuators_state([11])
+    with pytest.raises(KeyError):
+        kos.actuator.command_actuators([{}])
+
+    snapshot = kos.metrics.snapshot()
+    assert snapshot["actuator.command_actuators"]["calls"] == 3
+    assert snapshot["actuator.command_actuators"]["errors"] == 1
+    assert snapshot["actuator.get_actuators_state"]["calls"] == 1
+    assert fake_kos.actuator.positions[11] == 2.0
+
+
+def test_prometheus_export(fake_kos: FakeKOS) -> None:
+    kos = InstrumentedKOS(as_kos(fake_kos))
+    kos.actuator.get_actuators_state([11])
+    text = kos.metrics.to_prometheus()
+    assert 'skillet_kos_calls_total{method="actuator.get_actuators_state"} 1' in text
+    assert 'skillet_kos_latency_seconds_bucket{method="actuator.get_actuators_state",le="+Inf"} 1' in text
+
+
+class SlowActuatorService(FakeActuatorService):
+    """Actuator service whose state reads take `delay` seconds."""
+
+    delay: float = 0.0
+
+    def get_actuators_state(self, actuator_ids: list[int]) -> SimpleNamespace:
+        time.sleep(self.delay)
+        return super().get_actuators_state(actuator_ids)
+
+
+def test_deadline_miss_holds_pose(fake_kos: FakeKOS) -> None:
+    fake_kos.actuator.positions = {11: 5.0, 12: -3.0}
+    service = SlowActuatorService(positions={11: 5.0, 12: -3.0})
+    slow = FakeKOS(actuator=service)
+    with Watchdog(as_kos(fake_kos), [11, 12], mode=SafeStop.HOLD, deadline=0.05) as watchdog:
+        kos = watchdog.guard(as_kos(slow))
+        kos.actuator.get_actuators_state([11])
+        service.delay = 0.2
+        with pytest.raises(DeadlineExceededError):
+            kos.actuator.get_actuators_state([11])
+        with pytest.raises(WatchdogTrippedError):
+            kos.actuator.command_actuators([{"actuator_id": 11, "position": 1.0}])
+        watchdog.join_safe_stop(1.0)
+
+    assert watchdog.tripped.is_set()
+    assert fake_kos.actuator.calls[-1] == (
+        "command_actuators",
+        [{"actuator_id": 11, "position": 5.0}, {"actuator_id": 12, "position": -3.0}],
+    )
+    assert slow.actuator.positions[11] == 5.0
+    stats = watchdog.stats["actuator.get_actuators_state"]
+    assert stats.calls == 2
+    assert stats.misses == 1
+    assert stats.bucket_counts[-1] == 1
+
+
+def test_queued_calls_do_not_count_against_the_deadline(fake_kos: FakeKOS) -> None:
+    service = SlowActuatorService()
+    service.delay = 0.03
+    slow = FakeKOS(actuator=service)
+    with Watchdog(as_kos(fake_kos), [11, 12], deadline=0.05) as watchdog:
+        kos = watchdog.guard(as_kos(slow))
+        # More concurrent calls than workers, so later ones queue for longer than the deadline.
+        with ThreadPoolExecutor(max_workers=24) as pool:
+            list(pool.map(lambda actuator_id: kos.actuator.get_actuators_state([actuator_id]), range(24)))
+
+    assert not watchdog.tripped.is_set()
+    assert watchdog.stats["actuator.get_actuators_state"].misses == 0
+
+
+def test_missed_heartbeat_goes_limp(fake_kos: FakeKOS) -> None:
+    with Watchdog(as_kos(fake_kos), [11, 12], mode=SafeStop.LIMP, heartbeat_timeout=0.05) as watchdog:
+        with watchdog.armed():
+            for _ in range(10):
+                watchdog.heartbeat()
+                time.sleep(0.01)
+            assert not watchdog.tripped.is_set()
+            time.sleep(0.2)
+        watchdog.join_safe_stop(1.0)
+
+    assert watchdog.tripped.is_set()
+    assert fake_kos.actuator.calls == [
+        ("configure_actuator", (11, {"torque_enabled": False})),
+        ("configure_actuator", (12, {"torque_enabled": False})),
+    ]
+
+
+def test_safe_stop_moves_slowly_to_zero(fake_kos: FakeKOS) -> None:
+    fake_kos.actuator.positions = {11: 10.0, 12: -4.0}
+    watchdog = Watchdog(as_kos(fake_kos), [11, 12], mode=SafeStop.ZERO, zero_speed=100.0)
+    watchdog.trip("test")
+    watchdog.join_safe_stop(1.0)
+
+    commands = [args for name, args in fake_kos.actuator.calls if name == "command_actuators"]
+    assert len(commands) == 5
+    assert commands[0][0]["position"] == pytest.approx(8.0)
+    assert fake_kos.actuator.positions == {11: 0.0, 12: 0.0}
+
+
+def test_named_processes_keep_their_own_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert process_file("calls.skcap", None) == "calls.skcap"
+    assert process_file(str(tmp_path / "calls.skcap"), "skillet-imu") == str(tmp_path / "calls.skillet-imu.skcap")
+
+    capturing = CapturingKOS(as_kos(FakeKOS()), tmp_path / "calls.skillet-control.skcap")
+    capturing.actuator.get_actuators_state([11])
+    capturing.close()
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(REPLAY_FILE_ENV, str(tmp_path / "calls.skcap"))
+    monkeypatch.setenv(REPLAY_REALTIME_ENV, "0")
+    robot = connect(name="skillet-control")
+    assert robot.kos.actuator.get_actuators_state([11]).states[0].actuator_id == 11
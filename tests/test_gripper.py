@@ -0,0 +1,44 @@
+"""Tests for torque-sensing gripper control."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from skillet.motion.gripper import SQUEEZE, Gripper
+from tests.fakes import FakeActuatorService, FakeKOS, as_kos
+
+
+class ObjectInGripper(FakeActuatorService):
+    """Actuator service whose gripper meets resistance past `contact_at` degrees."""
+
+    contact_at: float = 12.0
+
+    def get_actuators_state(self, actuator_ids: list[int]) -> SimpleNamespace:
+        self.torques = {
+            actuator_id: 3.0 if self.positions.get(actuator_id, 0.0) >= self.contact_at else 0.1
+            for actuator_id in actuator_ids
+        }
+        return super().get_actuators_state(actuator_ids)
+
+
+def test_close_stops_at_contact() -> None:
+    kos = FakeKOS(actuator=ObjectInGripper())
+    gripper = Gripper(as_kos(kos), rate=300.0, control_rate=500.0)
+    assert gripper.configure()
+    result = gripper.close()
+
+    assert result.grasped
+    assert result.positions[0] == pytest.approx(12.0 + SQUEEZE, abs=0.6)
+    assert kos.actuator.positions[24] < 35.0
+    reads = [name for name, _ in kos.actuator.calls if name == "get_actuators_state"]
+    assert len(reads) < 30
+
+
+def test_close_without_object_reports_no_grasp(fake_kos: FakeKOS) -> None:
+    gripper = Gripper(as_kos(fake_kos), rate=700.0, control_rate=500.0)
+    result = gripper.close()
+    assert not result.grasped
+    assert fake_kos.actuator.positions[24] == 35.0
+
+    gripper.open()
+    assert fake_kos.actuator.positions[24] == 0.0
@@ -1 +1,101 @@
-"""Placeholder test module for IMU functionality (to be implemented)."""
+"""Tests for IMU streaming and orientation filtering."""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from skillet.motion.balance import BalanceController
+from skillet.motion.player import Player
+from skillet.motion.validate import JointLimits
+from skillet.sensors.imu import ComplementaryFilter, ImuReader, Orientation, ReplayImuSource
+from tests.fakes import FakeKOS, as_kos
+
+
+def make_samples(count: int, pitch_degrees: float, rate: float = 200.0) -> np.ndarray:
+    """Samples of a robot held still at a given pitch."""
+    pitch = np.radians(pitch_degrees)
+    samples = np.zeros((count, 7))
+    samples[:, 0] = np.arange(count) / rate
+    samples[:, 1] = -9.81 * np.sin(pitch)
+    samples[:, 3] = 9.81 * np.cos(pitch)
+    return samples
+
+
+@pytest.mark.parametrize("alpha", [0.98, 0.5])
+def test_batched_filter_matches_sample_by_sample(alpha: float) -> None:
+    samples = make_samples(600, 10.0)
+    samples[:, 5] = np.random.default_rng(0).normal(0.0, 5.0, len(samples))
+    batched = ComplementaryFilter(alpha).update(samples)
+    single = ComplementaryFilter(alpha)
+    looped = np.concatenate([single.update(samples[i : i + 1]) for i in range(len(samples))])
+    np.testing.assert_allclose(batched, looped, atol=1e-9)
+
+
+def test_filter_tracks_tilt() -> None:
+    angles = ComplementaryFilter().update(make_samples(1000, 15.0))
+    assert angles[-1, 1] == pytest.approx(15.0, abs=0.1)
+    assert angles[-1, 0] == pytest.approx(0.0, abs=0.1)
+
+
+def test_record_and_replay(tmp_path: Path) -> None:
+    reader = ImuReader(source=None, buffer_seconds=1.0)  # type: ignore[arg-type]
+    reader.ingest(make_samples(300, -5.0))
+    assert reader.samples().shape == (200, 7)
+    reader.save(tmp_path / "imu.npy")
+
+    source = ReplayImuSource(tmp_path / "imu.npy", realtime=False)
+    replayed = ImuReader(source)
+    while not source.exhausted:
+        replayed.ingest(source.read())
+    assert replayed.latest is not None
+    assert replayed.latest.pitch == pytest.approx(-5.0, abs=0.1)
+
+
+def test_balance_correction_is_bounded() -> None:
+    reader = ImuReader(source=None)  # type: ignore[arg-type]
+    joints = ("left_ankle_pitch", "right_ankle_pitch", "left_knee_pitch")
+    controller = BalanceController(reader, joints, max_correction=2.0, max_step=0.5)
+    setpoint = np.array([10.0, -10.0, 30.0])
+
+    # No orientation yet: setpoints pass through unchanged.
+    np.testing.assert_allclose(controller(setpoint), setpoint)
+
+    reader.latest = Orientation(timestamp=time.monotonic(), roll=0.0, pitch=20.0)
+    corrected = controller(setpoint)
+    np.testing.assert_allclose(corrected, [9.5, -9.5, 30.0])
+    for _ in range(10):
+        reader.latest = Orientation(timestamp=time.monotonic(), roll=0.0, pitch=20.0)
+        corrected = controller(setpoint)
+    np.testing.assert_allclose(corrected, [8.0, -8.0, 30.0])
+    assert controller.stats.ticks == 12
+
+
+def test_balance_bypasses_itself_over_budget() -> None:
+    reader = ImuReader(source=None)  # type: ignore[arg-type]
+    controller = BalanceController(reader, ("left_ankle_pitch",), budget=0.0, max_overruns=3)
+    for _ in range(5):
+        controller(np.zeros(1))
+    assert controller.bypassed
+    assert controller.stats.ticks == 3
+
+
+def test_player_clamps_corrected_setpoints_to_limits(fake_kos: FakeKOS) -> None:
+    reader = ImuReader(source=None)  # type: ignore[arg-type]
+    joints = ("left_ankle_pitch", "right_ankle_pitch")
+    controller = BalanceController(reader, joints, max_correction=8.0, max_step=8.0)
+    reader.latest = Orientation(timestamp=time.monotonic(), roll=0.0, pitch=20.0)
+    limits = JointLimits(
+        lower=np.array([-5.0, -45.0]),
+        upper=np.array([45.0, 45.0]),
+        max_velocity=np.array([100.0, 100.0]),
+        max_acceleration=np.array([1000.0, 1000.0]),
+    )
+    player = Player(as_kos(fake_kos), np.array([1, 2]), rate=1000.0, filters=[controller], limits=limits)
+    stats = player.play(np.array([[0.0, 0.0], [0.0, 0.0], [0.0, 0.0]]))
+
+    # The correction would take the left ankle to -8 and the right one to +8 at once.
+    assert stats.commanded[:, 0].min() >= -5.0
+    np.testing.assert_array_less(np.abs(np.diff(stats.commanded, axis=0)), 0.1 + 1e-9)
+    assert stats.clamped_ticks == 3
@@ -0,0 +1,363 @@
+"""Tests for keyframe loading and motion compilation."""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from skillet.connection import Robot
+from skillet.examples.squat import PlaybackOptions, play_retimed, play_squat
+from skillet.motion import cache as cache_module
+from skillet.motion.cache import SetpointCache, cache_key
+from skillet.motion.gait import LEG_JOINTS, GaitParameters, Walker, gait_cycle, standing_pose
+from skillet.motion.keyframes import compile_motion, load_keyframes
+from skillet.motion.kinematics import (
+    LEG_PITCH_JOINTS,
+    LegGeometry,
+    forward_kinematics,
+    from_joint_positions,
+    inverse_kinematics,
+    leg_motion,
+    squat_trajectory,
+)
+from skillet.motion.pose_index import PoseIndex, enter_at, read_pose
+from skillet.motion.retime import retime
+from skillet.motion.validate import JointLimits, validate_motion, validate_trajectory
+from skillet.setup.setup_id import RobotProfile, load_profile, save_profile
+from tests.fakes import FakeKOS, as_kos
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_compile_applies_profile() -> None:
+    keyframes = [
+        {"left_hip_pitch": {"id": 33, "position": 10.0}, "left_knee_pitch": {"id": 34, "position": 20.0}},
+        {"left_hip_pitch": {"id": 33, "position": 15.0}},
+    ]
+    profile = RobotProfile(
+        robot_id="unit", actuator_overrides={"left_knee_pitch": 99}, zero_offsets={"left_hip_pitch": 1.5}
+    )
+    motion = compile_motion(keyframes, profile)
+    assert motion.joint_names == ("left_hip_pitch", "left_knee_pitch")
+    assert motion.actuator_ids.tolist() == [33, 99]
+    np.testing.assert_allclose(motion.positions, [[11.5, 20.0], [16.5, 20.0]])
+    assert motion.commands(1) == [{"actuator_id": 33, "position": 16.5}, {"actuator_id": 99, "position": 20.0}]
+
+
+def test_compile_rejects_unknown_joint() -> None:
+    with pytest.raises(ValueError):
+        compile_motion([{"tail": {"id": 99, "position": 0.0}}])
+
+
+@pytest.mark.parametrize("name", ["burpee.json", "pushup.json", "squat_positions.json", "single.json"])
+def test_library_compiles(name: str) -> None:
+    motion = compile_motion(load_keyframes(ROOT / name))
+    assert not np.isnan(motion.positions).any()
+
+
+def test_profile_round_trip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SKILLET_PROFILE_DIR", str(tmp_path))
+    profile = RobotProfile(
+        robot_id="unit", zero_offsets={"left_hip_pitch": -2.0}, joint_limits={"left_hip_pitch": (-90, 90)}
+    )
+    save_profile(profile)
+    assert load_profile("unit") == profile
+    assert load_profile("missing") == RobotProfile(robot_id="missing")
+
+
+def test_validate_reports_first_violation() -> None:
+    positions = np.zeros((5, 2))
+    positions[2, 1] = 50.0  # Jump of 50 degrees in 0.1 seconds
+    positions[4, 0] = 190.0  # Out of range
+    limits = JointLimits.for_joints(("a", "b"), max_acceleration=1e6)
+    violation = validate_trajectory(positions, 0.1, limits, ("a", "b"))
+    assert violation is not None
+    assert (violation.frame, violation.joint, violation.kind) == (2, "b", "velocity")
+    assert violation.value == pytest.approx(500.0)
+
+
+@pytest.mark.parametrize("name", ["burpee.json", "pushup.json", "squat_positions.json"])
+def test_library_is_valid(name: str) -> None:
+    motion = compile_motion(load_keyframes(ROOT / name))
+    assert validate_motion(motion, 2.0) is None
+
+
+def test_retime_respects_limits() -> None:
+    motion = compile_motion(load_keyframes(ROOT / "burpee.json"))
+    limits = JointLimits.for_joints(motion.joint_names)
+    schedule = retime(motion.positions, limits)
+    rate = 1000.0
+    setpoints = schedule.sample(motion.positions, rate)
+    velocity = np.diff(setpoints, axis=0) * rate
+    acceleration = np.diff(velocity, axis=0) * rate
+    assert np.abs(velocity).max() <= limits.max_velocity.max() * 1.01
+    assert np.abs(acceleration).max() <= limits.max_acceleration.max() * 1.01
+    np.testing.assert_allclose(setpoints[-1], motion.positions[-1])
+
+
+def test_retime_speed_factor() -> None:
+    positions = np.array([[0.0], [10.0], [0.0]])
+    limits = JointLimits.for_joints(("a",))
+    np.testing.assert_allclose(retime(positions, limits, 2.0, speed=2.0).durations, [1.0, 1.0])
+    fastest = retime(positions, limits).durations
+    np.testing.assert_allclose(retime(positions, limits, 0.01, speed=1.0).durations, fastest)
+
+
+def test_kinematics_round_trip() -> None:
+    geometry = LegGeometry()
+    rng = np.random.default_rng(0)
+    flexion = np.stack([rng.uniform(-30, 60, 5000), rng.uniform(5, 150, 5000), rng.uniform(-20, 90, 5000)], axis=-1)
+    pose = forward_kinematics(flexion, geometry)
+    solved = inverse_kinematics(pose[:, :2], pose[:, 2], geometry)
+    np.testing.assert_allclose(solved, flexion, atol=1e-6)
+
+
+def test_kinematics_matches_recorded_squat() -> None:
+    motion = compile_motion(load_keyframes(ROOT / "squat_positions.json"))
+    columns = [motion.joint_names.index(name) for name in LEG_PITCH_JOINTS]
+    flexion = from_joint_positions(motion.positions[:, columns])
+    # The recorded deep squat keeps the torso upright.
+    assert abs(forward_kinematics(flexion[0, 0])[2]) < 3.0
+
+
+def test_squat_trajectory() -> None:
+    geometry = LegGeometry()
+    flexion = squat_trajectory(0.08, 2.0, 50.0, hold=0.5, geometry=geometry)
+    heights = forward_kinematics(flexion, geometry)[:, 1]
+    assert len(flexion) == 127
+    assert heights[0] == pytest.approx(geometry.standing_height)
+    assert heights[-1] == pytest.approx(geometry.standing_height)
+    assert heights.min() == pytest.approx(geometry.standing_height - 0.08)
+    np.testing.assert_allclose(forward_kinematics(flexion)[:, [0, 2]], 0.0, atol=1e-9)
+
+    motion = leg_motion(flexion, RobotProfile(zero_offsets={"right_knee_pitch": 2.0}))
+    assert motion.actuator_ids.tolist() == [33, 34, 35, 43, 44, 45]
+    bottom = motion.positions[len(motion) // 2]
+    assert bottom[0] < 0 < bottom[1] and bottom[3] > 0
+    assert bottom[4] == pytest.approx(-bottom[1] + 2.0)
+
+    with pytest.raises(ValueError):
+        squat_trajectory(0.2, 2.0, geometry=geometry)
+
+
+def test_squat_blends_in_from_current_pose(fake_kos: FakeKOS) -> None:
+    robot = Robot(kos=as_kos(fake_kos), profile=RobotProfile())
+    assert play_squat(robot, depth=0.02, duration=2.0, rate=200.0)
+
+    commands = np.array(
+        [
+            [command["position"] for command in args]
+            for name, args in fake_kos.actuator.calls
+            if name == "command_actuators"
+        ]
+    )
+    limits = JointLimits.for_joints(LEG_PITCH_JOINTS)
+    # The legs start at zero, not at the standing pose, and move there within the limits.
+    assert np.abs(commands[0]).max() < 1.0
+    assert np.abs(np.diff(commands, axis=0)).max() <= limits.max_velocity[0] / 200.0 + 1e-9
+
+
+def test_gait_cycle_is_periodic_and_mirrored() -> None:
+    table = gait_cycle(GaitParameters(step_period=0.5), rate=50.0)
+    assert table.shape == (50, 10)
+    # Wrapping around the table is as smooth as any other tick.
+    step = np.abs(np.diff(np.concatenate([table, table[:1]]), axis=0)).max(axis=1)
+    assert step[-1] <= step.max()
+    # The right leg follows the left half a cycle later, mirrored, apart from the shared hip roll.
+    left, right = table[:, 2:5], table[:, 7:10]
+    np.testing.assert_allclose(np.roll(right, 25, axis=0), -left, atol=1e-9)
+    np.testing.assert_allclose(table[:, [0, 5]], 0.0)
+
+
+def test_walker_streams_steps(fake_kos: FakeKOS) -> None:
+    params = GaitParameters(step_period=0.4, transition_time=0.2)
+    walker = Walker(as_kos(fake_kos), params=params, rate=50.0)
+    # This fast a cadence is only safe on a robot that has the acceleration for it.
+    walker.limits = JointLimits.for_joints(LEG_JOINTS, max_acceleration=20000.0)
+    crouched = walker.standing + np.where(np.abs(walker.standing) > 0, 2.0 * np.sign(walker.standing), 0.0)
+    fake_kos.actuator.positions.update(zip(walker.actuator_ids.tolist(), crouched.tolist()))
+    stats = walker.walk(3, speed=2.0)
+
+    commands = [args for name, args in fake_kos.actuator.calls if name == "command_actuators"]
+    assert stats.ticks == len(commands) == 10 + 3 * 10 + 10
+    assert walker.walked == 3
+    assert [command["actuator_id"] for command in commands[0]] == walker.actuator_ids.tolist()
+    # The walk blends in from the measured pose and is one stream, without a restart between steps.
+    positions = np.array([[command["position"] for command in args] for args in commands])
+    assert np.abs(positions[0] - crouched).max() < 0.1
+    final = np.array([fake_kos.actuator.positions[actuator_id] for actuator_id in walker.actuator_ids.tolist()])
+    np.testing.assert_allclose(final, standing_pose(params))
+    assert len(LEG_JOINTS) == len(final)
+
+    # A pose too far from the gait to reach within the transition is refused before anything moves.
+    fake_kos.actuator.positions.update(dict.fromkeys(walker.actuator_ids.tolist(), 60.0))
+    with pytest.raises(ValueError, match="Refusing to walk"):
+        walker.walk(1)
+    assert len([name for name, _ in fake_kos.actuator.calls if name == "command_actuators"]) == len(commands)
+
+
+def test_setpoint_cache(tmp_path: Path) -> None:
+    source = tmp_path / "motion.json"
+    source.write_text((ROOT / "squat_positions.json").read_text())
+    profile = RobotProfile()
+    key = cache_key(source, profile, rate=50.0, speed=1.0)
+    assert key == cache_key(source, RobotProfile(), rate=50.0, speed=1.0)
+    assert key != cache_key(source, profile, rate=50.0, speed=2.0)
+    assert key != cache_key(source, RobotProfile(zero_offsets={"left_hip_pitch": 1.0}), rate=50.0, speed=1.0)
+
+    cache = SetpointCache(tmp_path / "cache")
+    assert cache.get(key) is None
+    motion = compile_motion(load_keyframes(source))
+    cache.put(key, motion)
+    cached = cache.get(key)
+    assert cached is not None
+    assert cached.joint_names == motion.joint_names
+    np.testing.assert_array_equal(cached.positions, motion.positions)
+
+    source.write_text((ROOT / "single.json").read_text())
+    assert cache_key(source, profile, rate=50.0, speed=1.0) != key
+
+
+def test_setpoint_cache_key_covers_validation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = ROOT / "squat_positions.json"
+    key = cache_key(source, RobotProfile(), rate=50.0)
+    monkeypatch.setattr(cache_module, "VALIDATOR_VERSION", cache_module.VALIDATOR_VERSION + 1)
+    assert cache_key(source, RobotProfile(), rate=50.0) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(cache_module, "DEFAULT_MAX_ACCELERATION", 900.0)
+    assert cache_key(source, RobotProfile(), rate=50.0) != key
+
+
+def test_setpoint_cache_cleans_up_temporary_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    motion = compile_motion(load_keyframes(ROOT / "burpee.json"))
+    cache = SetpointCache(tmp_path)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(np, "savez", fail)
+        with pytest.raises(OSError):
+            cache.put("a", motion)
+    assert list(tmp_path.iterdir()) == []
+
+    # A writer that died mid-write leaves its file behind until it is stale.
+    fresh, stale = tmp_path / "fresh.tmp", tmp_path / "stale.tmp"
+    fresh.touch()
+    stale.touch()
+    os.utime(stale, (0, 0))
+    cache.evict()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["fresh.tmp"]
+
+
+def test_setpoint_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    motion = compile_motion(load_keyframes(ROOT / "burpee.json"))
+    cache = SetpointCache(tmp_path, max_bytes=10**9)
+    for i, key in enumerate("abc"):
+        cache.put(key, motion)
+        os.utime(tmp_path / f"{key}.npz", (i, i))
+    assert cache.get("a") is not None  # Now the most recently used.
+
+    entry_size = (tmp_path / "a.npz").stat().st_size
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+LIBRARY = ["burpee.json", "pushup.json", "squat_positions.json", "single.json", "sub_movements/squat.json"]
+
+
+def test_pose_index_finds_library_frames() -> None:
+    index = PoseIndex.from_files(ROOT / name for name in LIBRARY)
+    burpee = str(ROOT / "burpee.json")
+    motion = index.motions[burpee]
+
+    frame = len(motion) // 2
+    pose = dict(zip(motion.joint_names, (motion.positions[frame] + 0.5).tolist()))
+    match = index.nearest(pose, motion=burpee)[0]
+    assert match.motion == burpee
+    assert match.distance == pytest.approx(0.5)
+    assert np.abs(motion.positions[match.frame] - motion.positions[frame]).max() < 1e-9
+
+    # Joints the query leaves out are ignored rather than counted as zero.
+    partial = {name: pose[name] for name in list(pose)[:4]}
+    assert index.nearest(partial, motion=burpee)[0].distance <= 0.5 + 1e-9
+
+    matches = index.nearest(pose, k=5)
+    assert len(matches) == 5
+    assert [m.distance for m in matches] == sorted(m.distance for m in matches)
+
+
+def test_pose_index_enters_at_earliest_close_frame() -> None:
+    index = PoseIndex.from_files(ROOT / name for name in LIBRARY)
+    pushup, burpee = str(ROOT / "pushup.json"), str(ROOT / "burpee.json")
+
+    # Pushups end where they start, so a pose near both ends enters at the start.
+    motion = index.motions[pushup]
+    pose = dict(zip(motion.joint_names, (motion.positions[0] + 0.3).tolist()))
+    assert index.entry(pose, pushup).frame == 0
+    # Frames within the tolerance of the closest tie, and the earliest wins.
+    motion = index.motions[burpee]
+    pose = dict(zip(motion.joint_names, motion.positions[2].tolist()))
+    assert index.entry(pose, burpee).frame == 0
+    # The last frame is never entered, even from exactly its pose.
+    pose = dict(zip(motion.joint_names, motion.positions[-1].tolist()))
+    assert index.entry(pose, burpee).frame < len(motion) - 1
+
+    single = str(ROOT / "single.json")
+    assert index.entry({}, single).frame == 0
+    with pytest.raises(KeyError):
+        index.entry(pose, "missing.json")
+    with pytest.raises(KeyError):
+        index.nearest(pose, motion="missing.json")
+
+
+def test_pose_index_from_library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "sub_movements").mkdir()
+    shutil.copy(ROOT / "pushup.json", tmp_path / "pushup.json")
+    shutil.copy(ROOT / "sub_movements" / "squat.json", tmp_path / "sub_movements" / "squat.json")
+    (tmp_path / "notes.json").write_text('{"not": "keyframes"}')
+
+    index = PoseIndex.from_library(tmp_path)
+    assert sorted(index.motions) == [str(tmp_path / "pushup.json"), str(tmp_path / "sub_movements" / "squat.json")]
+    monkeypatch.chdir(tmp_path)
+    index = PoseIndex.from_library("sub_movements")
+    assert index.motion_name("./sub_movements/squat.json") == "sub_movements/squat.json"
+    assert index.motion_name("pushup.json") is None
+
+
+def test_enter_at_blends_in_from_current_pose(fake_kos: FakeKOS) -> None:
+    motion = compile_motion(load_keyframes(ROOT / "squat_positions.json"))
+    target = motion.positions[-1]
+    fake_kos.actuator.positions = dict(zip(motion.actuator_ids.tolist(), (target + 1.0).tolist()))
+
+    pose = read_pose(as_kos(fake_kos), motion)
+    match = PoseIndex({"squat": motion}).nearest(pose)[0]
+    entered = enter_at(motion, pose, match.frame)
+    assert match.frame > 0
+    assert len(entered) == len(motion) - match.frame + 1
+    np.testing.assert_allclose(entered.positions[0], [pose[name] for name in motion.joint_names])
+    np.testing.assert_array_equal(entered.positions[1:], motion.positions[match.frame :])
+
+
+def test_play_retimed_enters_library_motion_from_current_pose(
+    fake_kos: FakeKOS, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(cache_module.CACHE_DIR_ENV, str(tmp_path))
+    index = PoseIndex.from_files([ROOT / "squat_positions.json"])
+    path = str(ROOT / "squat_positions.json")
+    motion = index.motions[path]
+    fake_kos.actuator.positions = dict(zip(motion.actuator_ids.tolist(), (motion.positions[-1] + 1.0).tolist()))
+
+    robot = Robot(kos=as_kos(fake_kos), profile=RobotProfile())
+    assert play_retimed(robot, path, PlaybackOptions(interval=None, rate=200.0, from_nearest=True, index=index))
+    commands = [
+        [command["position"] for command in args]
+        for name, args in fake_kos.actuator.calls
+        if name == "command_actuators"
+    ]
+    # The first setpoint is the measured pose, not the first keyframe of the motion.
+    np.testing.assert_allclose(commands[0], motion.positions[-1] + 1.0)
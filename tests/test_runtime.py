@@ -0,0 +1,150 @@
+"""Tests for the multi-process control runtime."""
+
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import cast
+
+import numpy as np
+import pykos  # type: ignore[import-untyped]
+
+from skillet.connection import Robot
+from skillet.runtime import CONTROL_PROCESS, IMU_PROCESS, CommandRing, Runtime, SharedState
+from skillet.setup.setup_id import RobotProfile
+from skillet.watchdog import SafeStop, Watchdog
+from tests.fakes import FakeActuatorService, FakeKOS, as_kos
+
+
+def fake_robot(name: str, safe_stop: SafeStop | None) -> Robot:
+    return Robot(kos=as_kos(FakeKOS()), profile=RobotProfile())
+
+
+def _pop(ring: CommandRing) -> list[float]:
+    setpoint = ring.pop()
+    assert setpoint is not None
+    return setpoint.tolist()
+
+
+def test_command_ring_wraps_and_fills() -> None:
+    ring = CommandRing(2, capacity=3)
+    try:
+        assert ring.pop() is None
+        for i in range(3):
+            assert ring.push(np.array([i, -i], dtype=float))
+        assert not ring.push(np.zeros(2))
+        assert _pop(ring) == [0.0, 0.0]
+        assert ring.push(np.array([3.0, -3.0]))
+        assert [_pop(ring) for _ in range(3)] == [[1.0, -1.0], [2.0, -2.0], [3.0, -3.0]]
+        assert len(ring) == 0
+    finally:
+        memory = ring.memory
+        ring.close()
+        memory.unlink()
+
+
+def test_command_ring_hold_keeps_later_setpoints() -> None:
+    producer = CommandRing(1, capacity=4)
+    consumer = CommandRing(1, capacity=4, name=producer.name)
+    try:
+        assert consumer.pending_hold() is None
+        producer.push(np.array([1.0]))
+        producer.push(np.array([2.0]))
+        producer.request_hold()
+        producer.push(np.array([3.0]))
+
+        hold = consumer.pending_hold()
+        assert hold == 2
+        consumer.clear(hold)
+        assert consumer.pending_hold() is None
+        assert _pop(consumer) == [3.0]
+        assert consumer.pop() is None
+    finally:
+        consumer.close()
+        memory = producer.memory
+        producer.close()
+        memory.unlink()
+
+
+def test_shared_state_is_visible_to_other_handles() -> None:
+    writer = SharedState(2)
+    reader = SharedState(2, writer.name)
+    try:
+        writer.publish(1.5, 7, np.array([[1.0, 2.0], [0.0, 0.0], [0.5, 0.25]]), pitch=3.0)
+        state = reader.read()
+        assert state.tick == 7
+        assert state.positions.tolist() == [1.0, 2.0]
+        assert state.torques.tolist() == [0.5, 0.25]
+        assert state.pitch == 3.0 and np.isnan(state.roll)
+    finally:
+        reader.close()
+        memory = writer.memory
+        writer.close()
+        memory.unlink()
+
+
+def test_runtime_streams_setpoints_from_another_process() -> None:
+    with Runtime([11, 12], robot_factory=fake_robot, rate=200.0, use_imu=False) as runtime:
+        setpoints = np.stack([np.linspace(0.0, 10.0, 20), np.linspace(0.0, -10.0, 20)], axis=1)
+        runtime.play(setpoints)
+        end = time.monotonic() + 2.0
+        while time.monotonic() < end and runtime.state().positions.tolist() != [10.0, -10.0]:
+            time.sleep(0.01)
+        assert runtime.state().positions.tolist() == [10.0, -10.0]
+
+        # NaN leaves a joint where it is.
+        runtime.play(np.array([[np.nan, 5.0]]))
+        time.sleep(0.05)
+        assert runtime.state().positions.tolist() == [10.0, 5.0]
+
+
+class FakeImuService:
+    """IMU service of a robot lying tilted forward."""
+
+    def get_imu_values(self) -> SimpleNamespace:
+        return SimpleNamespace(accel_x=-4.9, accel_y=0.0, accel_z=8.5, gyro_x=0.0, gyro_y=0.0, gyro_z=0.0)
+
+
+@dataclass
+class ImuKOS(FakeKOS):
+    imu: FakeImuService = field(default_factory=FakeImuService)
+
+
+def imu_robot(name: str, safe_stop: SafeStop | None) -> Robot:
+    return Robot(kos=as_kos(ImuKOS()), profile=RobotProfile())
+
+
+def test_runtime_publishes_imu_from_its_own_process() -> None:
+    with Runtime([11], robot_factory=imu_robot, rate=200.0) as runtime:
+        assert [process.name for process in runtime._processes] == [IMU_PROCESS, CONTROL_PROCESS]
+        end = time.monotonic() + 5.0
+        while time.monotonic() < end and np.isnan(runtime.state().pitch):
+            time.sleep(0.01)
+        assert not np.isnan(runtime.state().pitch)
+
+
+class StallingActuatorService(FakeActuatorService):
+    """Actuator service whose state reads hang from the tenth one on."""
+
+    def get_actuators_state(self, actuator_ids: list[int]) -> SimpleNamespace:
+        if sum(name == "get_actuators_state" for name, _ in self.calls) >= 10:
+            time.sleep(0.5)
+        return super().get_actuators_state(actuator_ids)
+
+
+def stalling_robot(name: str, safe_stop: SafeStop | None) -> Robot:
+    kos = as_kos(FakeKOS(actuator=StallingActuatorService()))
+    if safe_stop is None:
+        return Robot(kos=kos, profile=RobotProfile())
+    watchdog = Watchdog(as_kos(FakeKOS()), [11], mode=safe_stop, deadline=0.05)
+    watchdog.start()
+    return Robot(kos=cast(pykos.KOS, watchdog.guard(kos)), profile=RobotProfile(), watchdog=watchdog)
+
+
+def test_control_process_stops_when_its_watchdog_trips() -> None:
+    with Runtime([11], robot_factory=stalling_robot, rate=200.0, use_imu=False) as runtime:
+        control = runtime._processes[-1]
+        control.join(5.0)
+        assert not control.is_alive()
+        tick = runtime.state().tick
+        time.sleep(0.05)
+        assert runtime.state().tick == tick
@@ -0,0 +1,70 @@
+"""Tests for commanded-vs-actual tracking analysis."""
+
+import numpy as np
+import pytest
+
+from skillet.motion.retime import retime
+from skillet.motion.tracking import analyze_tracking
+from skillet.motion.validate import JointLimits
+
+
+def simulate(
+    kp: float, kd: float, rate: float = 200.0, seconds: float = 8.0, command: np.ndarray | None = None
+) -> tuple[np.ndarray, ...]:
+    """Commands tracked by a second-order joint with a 40 ms transport delay, steps by default."""
+    times = np.arange(0.0, seconds, 1.0 / rate)
+    if command is None:
+        command = np.where((times // 2) % 2 == 1, 30.0, 0.0)
+    else:
+        times = np.arange(len(command)) / rate
+    delay = int(0.04 * rate)
+    position, velocity = 0.0, 0.0
+    measured = np.zeros_like(times)
+    for i in range(len(times)):
+        target = command[max(i - delay, 0)]
+        velocity += (kp * (target - position) - kd * velocity) / rate
+        position += velocity / rate
+        measured[i] = position
+    return times, command[:, None], measured[:, None]
+
+
+def test_well_tuned_joint_is_not_flagged() -> None:
+    times, command, measured = simulate(kp=400.0, kd=40.0)
+    (result,) = analyze_tracking(times, command, times, measured, ("knee",))
+    assert result.steps == 3
+    assert result.overshoot < 0.05
+    assert 0.04 <= result.lag < 0.15
+    assert result.flags == []
+
+
+def test_underdamped_joint_is_flagged() -> None:
+    times, command, measured = simulate(kp=400.0, kd=4.0)
+    (result,) = analyze_tracking(times, command, times, measured, ("knee",))
+    assert result.overshoot > 0.2
+    assert any("overshoots" in flag for flag in result.flags)
+
+
+def retimed_command(rate: float) -> np.ndarray:
+    """Per-tick setpoints of a retimed keyframe path, which hold no setpoint until the final pose."""
+    keyframes = np.array([[0.0], [30.0], [-10.0], [20.0], [0.0]])
+    limits = JointLimits.for_joints(("knee",), max_velocity=360.0, max_acceleration=1800.0)
+    setpoints = retime(keyframes, limits).sample(keyframes, rate)[:, 0]
+    return np.pad(setpoints, (0, int(rate)), mode="edge")
+
+
+@pytest.mark.parametrize(("kd", "overshoots"), [(40.0, False), (4.0, True)])
+def test_retimed_trajectory_steps_are_analyzed(kd: float, overshoots: bool) -> None:
+    times, command, measured = simulate(kp=400.0, kd=kd, rate=50.0, command=retimed_command(50.0))
+    (result,) = analyze_tracking(times, command, times, measured, ("knee",))
+    assert result.steps == 4
+    assert (result.overshoot > 0.2) == overshoots
+    assert any("overshoots" in flag for flag in result.flags) == overshoots
+    if not overshoots:
+        assert result.flags == []
+        assert result.settling_time < 0.3
+
+
+def test_no_overlap_is_rejected() -> None:
+    times, command, measured = simulate(kp=400.0, kd=40.0)
+    with pytest.raises(ValueError, match="overlap"):
+        analyze_tracking(times, command, times + 100.0, measured, ("knee",))